@@ -1275,6 +1275,52 @@ class UAS_ShotManager_AddonPrefs(AddonPreferences):
         options=set(),
     )
 
+    stampInfo_useParallelRendering: BoolProperty(
+        name="Render the stamped images in parallel",
+        description="Draw the stamped images of the shots in several processes, one per CPU core by default.\n"
+        "Faster on long shots, but each process uses its own memory",
+        default=False,
+        options=set(),
+    )
+
+    stampInfo_numRenderProcesses: IntProperty(
+        name="Processes",
+        description="Number of processes used to render the stamped images in parallel.\n"
+        "0 means one process per CPU core",
+        min=0,
+        soft_max=32,
+        default=0,
+        options=set(),
+    )
+
+    stampInfo_useDirectCompositing: BoolProperty(
+        name="Composite without the VSE",
+        description="Composite the stamped images on the rendered images with NumPy and PIL instead of a temporary\n"
+        "VSE scene, and encode the videos with FFmpeg in the same pass.\n"
+        "The VSE is used when NumPy, PIL or the FFmpeg executable are not available",
+        default=False,
+        options=set(),
+    )
+
+    sequenceVideo_useStreamCopy: BoolProperty(
+        name="Assemble the sequence video without re-encoding",
+        description="Concatenate the shot videos with FFmpeg without re-encoding them when they have the same format\n"
+        "and no handles. Only the sound is encoded again.\n"
+        "The VSE is used when the formats differ or when FFmpeg and FFprobe are not available",
+        default=False,
+        options=set(),
+    )
+
+    ffmpegFilepath: StringProperty(
+        name="FFmpeg",
+        description="Path of the FFmpeg executable used to encode the videos when compositing without the VSE\n"
+        "and to assemble the sequence video without re-encoding. FFprobe is looked for in the same folder.\n"
+        "If empty, FFmpeg and FFprobe are looked for in the system path",
+        subtype="FILE_PATH",
+        default="",
+        options=set(),
+    )
+
     # -----------------------------------------------------------
     # UI user preferences - Not exposed
     # -----------------------------------------------------------
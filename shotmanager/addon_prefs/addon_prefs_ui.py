@@ -415,6 +415,17 @@ def drawStampInfo(context, prefs, layout):
         subCol = row.column(align=True)
         subCol.prop(prefs, "delete_temp_scene")
         subCol.prop(prefs, "delete_temp_images")
+        subCol.prop(prefs, "stampInfo_useParallelRendering")
+        subRow = subCol.row()
+        subRow.enabled = prefs.stampInfo_useParallelRendering
+        subRow.separator(factor=3)
+        subRow.prop(prefs, "stampInfo_numRenderProcesses")
+        subCol.prop(prefs, "stampInfo_useDirectCompositing")
+        subCol.prop(prefs, "sequenceVideo_useStreamCopy")
+        subRow = subCol.row()
+        subRow.enabled = prefs.stampInfo_useDirectCompositing or prefs.sequenceVideo_useStreamCopy
+        subRow.separator(factor=3)
+        subRow.prop(prefs, "ffmpegFilepath")
 
 
 def drawFeatures(context, prefs, layout):
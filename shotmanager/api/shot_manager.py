@@ -370,6 +370,30 @@ def get_edit_time(
     return shot_manager.getEditTime(reference_shot, frame_index_in_3D_time, referenceLevel=reference_level)
 
 
+def get_edit_times(
+    shot_manager: UAS_ShotManager_Props,
+    reference_shot: UAS_ShotManager_Shot,
+    frame_start: int,
+    frame_end: int,
+    reference_level: str = "TAKE",
+):
+    """Return the list of the edit times of the frames from frame_start to frame_end, both included
+    Frames out of the range of reference_shot get -1
+    reference_level can be "TAKE" or "GLOBAL_EDIT"
+    """
+    return shot_manager.getEditTimes(reference_shot, frame_start, frame_end, referenceLevel=reference_level)
+
+
+def get_shot_and_frame_from_edit_time(
+    shot_manager: UAS_ShotManager_Props, edit_time: int, reference_level: str = "TAKE", take_index: int = -1
+):
+    """Return the tupple (shot, frame in 3D time) corresponding to the specified edit time, (None, -1) if the
+    edit time is out of the edit
+    reference_level can be "TAKE" or "GLOBAL_EDIT"
+    """
+    return shot_manager.getShotAndFrameFromEditTime(edit_time, referenceLevel=reference_level, takeIndex=take_index)
+
+
 def get_edit_current_time(shot_manager: UAS_ShotManager_Props, reference_level: str = "TAKE"):
     """Return edit current time in frames, -1 if no shots or if current shot is disabled
     works only on current take
@@ -27,6 +27,9 @@ https://docs.python.org/3/howto/logging-cookbook.html#using-loggeradapters-to-im
 
 import os
 from pathlib import Path
+from collections import deque
+import json
+import time
 
 import logging
 
@@ -44,6 +47,16 @@ def getLevelName():
     return logging.getLevelName(_logger.level)
 
 
+# logging levels of the modes of SM_Logger._print_ext()
+_MODE_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
+
+
 class SM_Logger(logging.getLoggerClass()):
     def __init__(self, name):
         super(SM_Logger, self).__init__(name)
@@ -98,6 +111,13 @@ class SM_Logger(logging.getLoggerClass()):
 
         self.tags = config.getLoggingTags()
 
+        # formatters created by _getFormatter(), by (color, form)
+        self._formattersCache = dict()
+
+        # structured records of the last messages, see enableRingBuffer()
+        self._ringBuffer = None
+        self._ringBufferLevel = logging.DEBUG
+
     @property
     def prefix(self):
         return self._prefix
@@ -105,6 +125,7 @@ class SM_Logger(logging.getLoggerClass()):
     @prefix.setter
     def prefix(self, value):
         self._prefix = value
+        self._formattersCache.clear()
 
     @property
     def addon_name(self):
@@ -113,8 +134,17 @@ class SM_Logger(logging.getLoggerClass()):
     @addon_name.setter
     def addon_name(self, value):
         self._addon_name = value
+        self._formattersCache.clear()
 
     def _getFormatter(self, col="", form="DEFAULT"):
+        key = (col, form)
+        f = self._formattersCache.get(key, None)
+        if f is None:
+            f = self._createFormatter(col, form)
+            self._formattersCache[key] = f
+        return f
+
+    def _createFormatter(self, col="", form="DEFAULT"):
         color = self._colors[col] if col != "" else ""
         _ENDCOLOR = self._colors["DEFAULT"]
 
@@ -181,6 +211,16 @@ class SM_Logger(logging.getLoggerClass()):
         if not display:
             return
 
+        level = _MODE_LEVELS.get(mode, logging.INFO)
+
+        # the ring buffer also keeps the messages silenced by their tag or by the level of the logger
+        if self._ringBuffer is not None and self._ringBufferLevel <= level:
+            self._ringBuffer.append((time.time(), mode, tag, msg))
+
+        # the level is checked before any formatting so that the silenced messages cost almost nothing
+        if not self.isEnabledFor(level):
+            return
+
         # accept or silence message display according to tags (if return is enabled then tag is ignored)
         if tag is not None:
             if tag in self.tags:
@@ -234,6 +274,36 @@ class SM_Logger(logging.getLoggerClass()):
     def critical_ext(self, msg, extra=None, col="RED_BG", form="CRITICAL", tag=None, display=True):
         self._print_ext("CRITICAL", msg, extra=extra, col=col, form=form, tag=tag, display=display)
 
+    ##############
+    # ring buffer
+    ##############
+
+    def enableRingBuffer(self, size=5000, level=logging.DEBUG):
+        """Keep the last messages of at least the specified level in memory, whatever the level of the logger
+        and the tags are. Used for post-mortem debugging, eg. of a render session, with dumpRingBuffer()
+        """
+        self._ringBuffer = deque(self._ringBuffer or (), maxlen=size)
+        self._ringBufferLevel = level
+
+    def disableRingBuffer(self):
+        self._ringBuffer = None
+
+    def getRingBufferRecords(self):
+        """Return the list of the messages of the ring buffer, from the oldest to the newest, as dictionaries"""
+        if self._ringBuffer is None:
+            return []
+        return [{"time": t, "level": mode, "tag": tag, "message": str(msg)} for t, mode, tag, msg in self._ringBuffer]
+
+    def dumpRingBuffer(self, filepath):
+        """Write the messages of the ring buffer in a json file. Return True if the file has been written"""
+        try:
+            with open(filepath, "w") as f:
+                json.dump(self.getRingBufferRecords(), f, indent=4)
+        except Exception as e:
+            self.error_ext(f"Log ring buffer cannot be written in {filepath}: {e}")
+            return False
+        return True
+
     # custom function
     def print_ext(self, msg, col="DEFAULT", tag=None, display=True):
         """Do an unformated multiline colored print"""
@@ -0,0 +1,321 @@
+# GPLv3 License
+#
+# Copyright (C) 2021 Ubisoft
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Benchmarks of the core data operations of Shot Manager
+
+Synthetic scenes are generated with a number of takes and of shots per take, each shot having its camera,
+a marker and a grease pencil frame. The hot functions are then timed on each scene and the results are
+written in a json file, so that they can be compared between versions of the add-on.
+
+The benchmarks are run in a background instance of Blender by sm_benchmark_run.py.
+"""
+
+import os
+import json
+import time
+import tempfile
+import traceback
+from datetime import datetime
+
+import bpy
+
+from shotmanager.config import config
+from shotmanager.config import sm_logging
+
+from shotmanager.utils import utils
+from shotmanager.utils.utils_os import module_can_be_imported
+from shotmanager.utils.utils_shot_manager import getStampInfo
+
+_logger = sm_logging.getLogger(__name__)
+
+
+_BENCHMARK_VERSION = 1
+_BENCHMARK_SCENE_PREFIX = "SM_Benchmark_"
+
+# duration of the shots and gap between them in the generated scenes, in frames
+_SHOT_DURATION = 24
+_SHOT_GAP = 5
+
+
+def _timeFunction(func, numRuns=1):
+    """Run func numRuns times and return the timing statistics in seconds"""
+    times = []
+    for _i in range(numRuns):
+        startTime = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - startTime)
+    return {"runs": numRuns, "total": sum(times), "mean": sum(times) / numRuns, "min": min(times)}
+
+
+def createBenchmarkScene(numTakes, numShots, withGreasePencil=True):
+    """Create a new scene with numTakes takes of numShots shots. The shots of all the takes use the same
+    cameras, a marker is added at the start of each shot and a grease pencil frame on each shot start.
+    Must be called with the new scene as the current scene of the context
+    """
+    scene = bpy.context.scene
+    props = config.getAddonProps(scene)
+    props.initialize_shot_manager()
+
+    scene.frame_start = 0
+    scene.frame_end = numShots * (_SHOT_DURATION + _SHOT_GAP)
+
+    cameras = []
+    for i in range(numShots):
+        cam = utils.create_new_camera(f"BenchCam_{i:04d}", location=[i, 0, 0])
+        # a bit of animation so that the retimer has keys to move
+        start = i * (_SHOT_DURATION + _SHOT_GAP)
+        cam.keyframe_insert("location", frame=start)
+        cam.location.z = 1.0
+        cam.keyframe_insert("location", frame=start + _SHOT_DURATION - 1)
+        cameras.append(cam)
+
+    for t in range(numTakes):
+        take = props.getTakeByIndex(0) if 0 == t else props.addTake(name=f"Take_{t:02d}")
+        takeIndex = props.getTakeIndex(take)
+        for i in range(numShots):
+            start = i * (_SHOT_DURATION + _SHOT_GAP)
+            props.addShot(
+                takeIndex=takeIndex,
+                name=f"Sh{(i + 1) * 10:04d}",
+                start=start,
+                end=start + _SHOT_DURATION - 1,
+                camera=cameras[i],
+                # every 10th shot is disabled to exercise the enabled shot lists
+                enabled=0 != (i + 1) % 10,
+            )
+
+    for i in range(numShots):
+        scene.timeline_markers.new(f"F_{i:04d}", frame=i * (_SHOT_DURATION + _SHOT_GAP))
+
+    if withGreasePencil:
+        gpData = bpy.data.grease_pencils.new("BenchGP")
+        gpObj = bpy.data.objects.new("BenchGP", gpData)
+        scene.collection.objects.link(gpObj)
+        layer = gpData.layers.new("Lines")
+        for i in range(numShots):
+            layer.frames.new(i * (_SHOT_DURATION + _SHOT_GAP))
+
+    props.setCurrentTakeByIndex(0)
+    props.setCurrentShotByIndex(0)
+    return scene
+
+
+def removeBenchmarkScenes():
+    for scene in [s for s in bpy.data.scenes if s.name.startswith(_BENCHMARK_SCENE_PREFIX)]:
+        bpy.data.scenes.remove(scene, do_unlink=True)
+
+
+def _benchGetEditTime(scene, props, numQueries):
+    shots = props.get_shots()
+
+    def _run():
+        for q in range(numQueries):
+            shot = shots[q % len(shots)]
+            props.getEditTime(shot, shot.start + q % _SHOT_DURATION)
+
+    return _run
+
+
+def _benchGetCurrentShotIndex(scene, props, numQueries):
+    def _run():
+        for _q in range(numQueries):
+            props.getCurrentShotIndex()
+            props.getCurrentShotIndex(ignoreDisabled=True)
+
+    return _run
+
+
+def _benchGoToNextShotBoundary(scene, props):
+    def _run():
+        props.setCurrentShotByIndex(0)
+        frame = scene.frame_start
+        scene.frame_set(frame)
+        # the boundaries are visited until the end of the last shot
+        while True:
+            newFrame = props.goToNextShotBoundary(frame)
+            if () == newFrame or newFrame <= frame:
+                break
+            frame = newFrame
+
+    return _run
+
+
+def _benchRetimeScene(scene, props):
+    from shotmanager.retimer.retimer import retimeScene
+
+    retimerApplyToSettings = props.retimer.getCurrentApplyToSettings()
+    middleFrame = (scene.frame_start + scene.frame_end) // 2
+
+    def _run():
+        # time is inserted then deleted so that the scene gets back to its initial state
+        retimeScene(
+            context=bpy.context,
+            retimeMode="INSERT",
+            retimerApplyToSettings=retimerApplyToSettings,
+            objects=list(scene.objects),
+            start_incl=middleFrame,
+            duration_incl=_SHOT_GAP,
+        )
+        retimeScene(
+            context=bpy.context,
+            retimeMode="DELETE",
+            retimerApplyToSettings=retimerApplyToSettings,
+            objects=list(scene.objects),
+            start_incl=middleFrame,
+            duration_incl=_SHOT_GAP,
+        )
+
+    return _run
+
+
+def _benchExportTakeEditToOtio(scene, props, outputDir):
+    from shotmanager.otio.exports import exportTakeEditToOtio
+
+    def _run():
+        exportTakeEditToOtio(
+            scene,
+            props.getCurrentTake(),
+            outputDir,
+            output_filepath=os.path.join(outputDir, f"{scene.name}.xml"),
+            fps=utils.getSceneEffectiveFps(scene),
+        )
+
+    return _run
+
+
+def _benchConformToRefMontage(scene, props, outputDir):
+    from shotmanager.otio.montage_otio import MontageOtio
+    from shotmanager.otio.imports import conformToRefMontage
+
+    editFile = os.path.join(outputDir, f"{scene.name}.xml")
+    # the last take is conformed to the edit of the current take
+    takeIndex = len(props.getTakes()) - 1
+
+    def _run():
+        montage = MontageOtio()
+        montage.fillMontageInfoFromOtioFile(otioFile=editFile, verboseInfo=False)
+        conformToRefMontage(
+            scene,
+            montage,
+            montage.get_sequences()[0].get_name(),
+            clearVSE=False,
+            clearCameraBG=False,
+            createCameras=False,
+            takeIndex=takeIndex,
+        )
+
+    return _run
+
+
+def _benchStampInfo(scene, props, outputDir, numFrames):
+    stampInfoSettings = getStampInfo()
+    shot = props.get_shots()[0]
+
+    def _run():
+        for f in range(numFrames):
+            frame = shot.start + f % _SHOT_DURATION
+            stampInfoSettings.renderTmpImageWithStampedInfo(
+                scene, frame, renderPath=outputDir, renderFilename=f"{scene.name}_stampinfo_{f:04d}.png"
+            )
+
+    return _run
+
+
+def runBenchmarksOnScene(scene, outputDir, numQueries=1000, numRuns=3, numStampInfoFrames=10):
+    """Time the hot functions on the specified benchmark scene.
+    Return a dictionary with the timing statistics of each benchmark. The benchmarks failing are reported
+    with their error instead of their timing
+    """
+    props = config.getAddonProps(scene)
+    withOtio = module_can_be_imported("shotmanager.otio")
+
+    benchmarks = [
+        ("getEditTime", lambda: _benchGetEditTime(scene, props, numQueries), numRuns),
+        ("getCurrentShotIndex", lambda: _benchGetCurrentShotIndex(scene, props, numQueries), numRuns),
+        ("goToNextShotBoundary", lambda: _benchGoToNextShotBoundary(scene, props), numRuns),
+        ("retimeScene", lambda: _benchRetimeScene(scene, props), numRuns),
+    ]
+    if withOtio:
+        # conformToRefMontage reads the file written by exportTakeEditToOtio
+        benchmarks.append(
+            ("exportTakeEditToOtio", lambda: _benchExportTakeEditToOtio(scene, props, outputDir), numRuns)
+        )
+        benchmarks.append(("conformToRefMontage", lambda: _benchConformToRefMontage(scene, props, outputDir), 1))
+    if getStampInfo() is not None:
+        benchmarks.append(
+            ("stampInfo", lambda: _benchStampInfo(scene, props, outputDir, numStampInfoFrames), 1),
+        )
+
+    results = dict()
+    for name, benchmarkFactory, runs in benchmarks:
+        try:
+            results[name] = _timeFunction(benchmarkFactory(), numRuns=runs)
+            _logger.info_ext(f"Benchmark {name}: {results[name]['mean']:0.4f} sec.")
+        except Exception as e:
+            _logger.error_ext(f"Benchmark {name} failed: {e}")
+            results[name] = {"error": str(e), "traceback": traceback.format_exc()}
+
+    if not withOtio:
+        results["exportTakeEditToOtio"] = {"error": "OpenTimelineIO not available"}
+        results["conformToRefMontage"] = {"error": "OpenTimelineIO not available"}
+    return results
+
+
+def runBenchmarks(
+    shotCounts=(10, 100, 500), numTakes=2, numQueries=1000, numRuns=3, numStampInfoFrames=10, outputFilepath=None
+):
+    """Run the benchmarks on scenes of increasing numbers of shots and write the results in a json file.
+    Return the results
+    """
+    outputDir = tempfile.mkdtemp(prefix="ShotManager_Benchmark_")
+    versions = utils.addonVersion("Ubisoft Shot Manager")
+
+    content = {
+        "version": _BENCHMARK_VERSION,
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "addon_version": versions[0] if versions is not None else "-",
+        "blender_version": bpy.app.version_string,
+        "num_takes": numTakes,
+        "num_queries": numQueries,
+        "num_runs": numRuns,
+        "scenes": [],
+    }
+
+    removeBenchmarkScenes()
+    for numShots in shotCounts:
+        scene = bpy.data.scenes.new(f"{_BENCHMARK_SCENE_PREFIX}{numShots:05d}")
+        _logger.info_ext(f"\nBenchmark scene: {numTakes} take(s) x {numShots} shot(s)", col="CYAN")
+
+        with bpy.context.temp_override(scene=scene):
+            startTime = time.perf_counter()
+            createBenchmarkScene(numTakes, numShots)
+            creationTime = time.perf_counter() - startTime
+
+            results = runBenchmarksOnScene(
+                scene, outputDir, numQueries=numQueries, numRuns=numRuns, numStampInfoFrames=numStampInfoFrames
+            )
+
+        content["scenes"].append({"num_shots": numShots, "scene_creation_time": creationTime, "benchmarks": results})
+        bpy.data.scenes.remove(scene, do_unlink=True)
+
+    if outputFilepath is not None:
+        with open(outputFilepath, "w") as f:
+            json.dump(content, f, indent=4)
+        _logger.info_ext(f"Benchmark results written in {outputFilepath}")
+
+    return content
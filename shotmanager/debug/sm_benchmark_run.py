@@ -0,0 +1,63 @@
+# GPLv3 License
+#
+# Copyright (C) 2021 Ubisoft
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Entry point of the benchmarks of Shot Manager, run in a background instance of Blender
+
+Usage:
+    blender -b --factory-startup --python-exit-code 1 -P sm_benchmark_run.py -- --output <results.json>
+        [--shots 10 100 500] [--takes 2] [--queries 1000] [--runs 3] [--stampinfo-frames 10]
+
+The Shot Manager add-on must be installed, it is enabled if needed.
+"""
+
+import sys
+import argparse
+
+import bpy
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(prog="sm_benchmark_run", description="Run the benchmarks of Shot Manager")
+    parser.add_argument("--output", required=True, help="Path of the json file receiving the results")
+    parser.add_argument("--shots", type=int, nargs="+", default=[10, 100, 500], help="Numbers of shots per take")
+    parser.add_argument("--takes", type=int, default=2, help="Number of takes of the scenes")
+    parser.add_argument("--queries", type=int, default=1000, help="Number of queries of the time functions")
+    parser.add_argument("--runs", type=int, default=3, help="Number of runs of each benchmark")
+    parser.add_argument("--stampinfo-frames", type=int, default=10, help="Number of Stamp Info frames to render")
+    args = parser.parse_args(argv)
+
+    if "shotmanager" not in bpy.context.preferences.addons:
+        import addon_utils
+
+        addon_utils.enable("shotmanager", default_set=False)
+
+    from shotmanager.debug.sm_benchmark import runBenchmarks
+
+    runBenchmarks(
+        shotCounts=args.shots,
+        numTakes=max(1, args.takes),
+        numQueries=args.queries,
+        numRuns=max(1, args.runs),
+        numStampInfoFrames=args.stampinfo_frames,
+        outputFilepath=args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -66,6 +66,9 @@ class Mesh2D:
         #   left, top, right, bottom
         self.lineOffsetPerEdge = [0, -1, -1, 0]
 
+        # batches of the previous draw, per draw type. They are reused while the vertices don't change
+        self._batches = dict()
+
     @property
     def image(self):
         return self._image
@@ -106,6 +109,22 @@ class Mesh2D:
         # shader.uniform_float("color", color_to_sRGB(color))
         return shader
 
+    def _getBatch(self, shader, draw_types, content, indices=None):
+        """Return the batch for the specified content. Building a batch uploads its vertices to the
+        GPU so the one from the previous draw is returned if the vertices and the indices didn't change
+        """
+        key = (
+            tuple((attr, tuple(tuple(v) for v in values)) for attr, values in content.items()),
+            None if indices is None else tuple(tuple(i) for i in indices),
+        )
+        cached = self._batches.get(draw_types, None)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        batch = batch_for_shader(shader, draw_types, content, indices=indices)
+        self._batches[draw_types] = (key, batch)
+        return batch
+
     def _drawMesh(
         self, shader, region=None, draw_types="TRIS", cap_lines=False, transformed_vertices=None, vertex_indices=None
     ):
@@ -127,7 +146,7 @@ class Mesh2D:
             #     shader = gpu.shader.from_builtin("3D_UNIFORM_COLOR")
             #     transformed_vertices = [(v[0], v[1], self.z) for v in transformed_vertices]
 
-            batch = batch_for_shader(shader, draw_types, {"pos": transformed_vertices}, indices=v_indices)
+            batch = self._getBatch(shader, draw_types, {"pos": transformed_vertices}, indices=v_indices)
             batch.draw(shader)
 
         elif "LINES" == draw_types:
@@ -162,17 +181,17 @@ class Mesh2D:
                 )
             )
 
-            batch = batch_for_shader(shader, draw_types, {"pos": vertices_inner}, indices=v_indices)
+            batch = self._getBatch(shader, draw_types, {"pos": vertices_inner}, indices=v_indices)
             bgl.glLineWidth(self.lineThickness)
             batch.draw(shader)
             if cap_lines or True:
-                batch = batch_for_shader(shader, "POINTS", {"pos": vertices_inner})
+                batch = self._getBatch(shader, "POINTS", {"pos": vertices_inner})
                 bgl.glPointSize(self.lineThickness)
                 batch.draw(shader)
 
         elif "POINTS" == draw_types:
             # wkip here draw points for rounded line caps
-            batch = batch_for_shader(shader, "POINTS", {"pos": transformed_vertices})
+            batch = self._getBatch(shader, "POINTS", {"pos": transformed_vertices})
             bgl.glPointSize(self.lineThickness)
             batch.draw(shader)
 
@@ -195,7 +214,7 @@ class Mesh2D:
             bgl.glTexParameteri(bgl.GL_TEXTURE_2D, bgl.GL_TEXTURE_MAG_FILTER, bgl.GL_NEAREST)
 
             textureShader = gpu.shader.from_builtin("2D_IMAGE")
-            batch = batch_for_shader(
+            batch = self._getBatch(
                 textureShader,
                 "TRI_FAN",
                 {
@@ -25,6 +25,7 @@ from bpy.app.handlers import persistent
 from shotmanager.utils import utils_handlers
 
 from . import sm_handlers
+from shotmanager.warnings.warnings import unregisterFileSystemCheck
 
 
 # from . import sm_check_data_handlers
@@ -84,6 +85,18 @@ def register():
     bpy.app.handlers.redo_pre.append(sm_handlers.shotMngHandler_redo_pre)
     bpy.app.handlers.redo_post.append(sm_handlers.shotMngHandler_redo_post)
 
+    # depsgraph
+    utils_handlers.removeAllHandlerOccurences(
+        sm_handlers.shotMngHandler_depsgraph_update_post, handlerCateg=bpy.app.handlers.depsgraph_update_post
+    )
+    bpy.app.handlers.depsgraph_update_post.append(sm_handlers.shotMngHandler_depsgraph_update_post)
+
+    # save
+    utils_handlers.removeAllHandlerOccurences(
+        sm_handlers.shotMngHandler_save_post, handlerCateg=bpy.app.handlers.save_post
+    )
+    bpy.app.handlers.save_post.append(sm_handlers.shotMngHandler_save_post)
+
     # if config.devDebug:
     #     utils_handlers.displayHandlers(handlerCategName="load_post")
 
@@ -135,6 +148,16 @@ def unregister():
     # redo
     bpy.app.handlers.redo_pre.remove(sm_handlers.shotMngHandler_redo_pre)
     bpy.app.handlers.redo_post.remove(sm_handlers.shotMngHandler_redo_post)
+    # depsgraph
+    utils_handlers.removeAllHandlerOccurences(
+        sm_handlers.shotMngHandler_depsgraph_update_post, handlerCateg=bpy.app.handlers.depsgraph_update_post
+    )
+    # save
+    utils_handlers.removeAllHandlerOccurences(
+        sm_handlers.shotMngHandler_save_post, handlerCateg=bpy.app.handlers.save_post
+    )
+    # timer of the warnings
+    unregisterFileSystemCheck()
 
     # load
     bpy.app.handlers.load_pre.remove(sm_handlers.shotMngHandler_load_pre)
@@ -23,6 +23,9 @@ import bpy
 from bpy.app.handlers import persistent
 
 from shotmanager.config import config
+from shotmanager.properties.shots_index import invalidateShotsIndices
+from shotmanager.properties.cameras_index import invalidateCamerasIndices
+from shotmanager.warnings.warnings import invalidateWarnings
 from shotmanager.config import sm_logging
 
 _logger = sm_logging.getLogger(__name__)
@@ -33,6 +36,8 @@ def shotMngHandler_undo_pre(self, context):
     _logger.debug_ext("Handler: Undo Pre", col="GREEN_LIGHT", tag="HANDLER")
 
     config.gShotsStackInfos = None
+    invalidateShotsIndices()
+    invalidateCamerasIndices()
 
 
 #   bpy.context.window_manager.UAS_shot_manager_display_overlay_tools = False
@@ -41,6 +46,9 @@ def shotMngHandler_undo_pre(self, context):
 @persistent
 def shotMngHandler_undo_post(self, context):
     _logger.debug_ext("Handler: Undo Post", col="GREEN_LIGHT", tag="HANDLER")
+    invalidateShotsIndices()
+    invalidateCamerasIndices()
+    invalidateWarnings()
 
 
 @persistent
@@ -48,6 +56,8 @@ def shotMngHandler_redo_pre(self, context):
     _logger.debug_ext("Handler: Redo Pre", col="GREEN_LIGHT", tag="HANDLER")
 
     config.gShotsStackInfos = None
+    invalidateShotsIndices()
+    invalidateCamerasIndices()
 
 
 #   bpy.context.window_manager.UAS_shot_manager_display_overlay_tools = False
@@ -56,6 +66,27 @@ def shotMngHandler_redo_pre(self, context):
 @persistent
 def shotMngHandler_redo_post(self, context):
     _logger.debug_ext("Handler: Redo Post", col="GREEN_LIGHT", tag="HANDLER")
+    invalidateShotsIndices()
+    invalidateCamerasIndices()
+    invalidateWarnings()
+
+
+@persistent
+def shotMngHandler_depsgraph_update_post(scene, depsgraph):
+    # objects added, removed or reparented may change the cameras used by the shots and their grease pencil
+    # children. This is not called on frame changes so it stays cheap during the playback
+    if depsgraph.id_type_updated("OBJECT"):
+        invalidateCamerasIndices()
+    # render settings and Shot Manager properties are stored in the scene
+    if depsgraph.id_type_updated("SCENE"):
+        invalidateWarnings()
+
+
+@persistent
+def shotMngHandler_save_post(self, context):
+    _logger.debug_ext("Handler: Save Post", col="GREEN_LIGHT", tag="HANDLER")
+    # the file path and the read-only state of the file may have changed
+    invalidateWarnings()
 
 
 @persistent
@@ -67,6 +98,9 @@ def shotMngHandler_load_pre(self, context):
 @persistent
 def shotMngHandler_load_post(self, context):
     _logger.debug_ext("Handler: Load Post", col="GREEN_LIGHT", tag="HANDLER")
+    invalidateShotsIndices()
+    invalidateCamerasIndices()
+    invalidateWarnings()
 
     # bpy.ops.uas_shot_manager.sequence_timeline.cancel(bpy.context)
 
@@ -111,30 +111,18 @@ def shotMngHandler_frame_change_pre_jumpToShot(scene):
         return scene.frame_preview_end if scene.use_preview_range else scene.frame_end
 
     def _get_previous_shot(shots, current_shot_index):
-        index = current_shot_index
-        if index > 0:
-            previous_shots = [s for s in shots[:index] if s.enabled]
-            if len(previous_shots):
-                return previous_shots[-1]
+        index = shotsIndex.getPreviousEnabledShotIndex(current_shot_index)
+        if -1 != index:
+            return shots[index]
 
         return None
 
     def _get_next_shot(shots, current_shot_index):
         """If next shot is out of the anim range then return None"""
-        index = current_shot_index + 1
-        # if index < len(shots) - 1:
-        #     next_shots = [s for s in shots[index + 1 :] if s.enabled]
-        #     if len(next_shots):
-        #         return next_shots[0]
-
-        while index < len(shots):
-            if shots[index].enabled:
-                if shots[index].start <= _get_range_end() and shots[index].start >= _get_range_start():
-                    return shots[index]
-                else:
-                    return None
-            else:
-                index += 1
+        index = shotsIndex.getNextEnabledShotIndex(current_shot_index)
+        if -1 != index:
+            if shotsIndex.starts[index] <= _get_range_end() and shotsIndex.starts[index] >= _get_range_start():
+                return shots[index]
         return None
 
     def _get_max_start_frame(shot):
@@ -153,23 +141,24 @@ def shotMngHandler_frame_change_pre_jumpToShot(scene):
         If no such shot is found them we use current shot
         """
 
-        if shots[current_shot_index].start < _get_range_start():
+        starts = shotsIndex.starts
+        ends = shotsIndex.ends
+        if starts[current_shot_index] < _get_range_start():
             return current_shot_index
 
         lastValidShotInd = current_shot_index
-        i = current_shot_index - 1
+        i = shotsIndex.getPreviousEnabledShotIndex(current_shot_index)
         while 0 <= i:
-            if shots[i].enabled:
-                if shots[i].end > _get_range_end():
-                    break
-                if shots[i].end < _get_range_start():
-                    break
-                if shots[i].start < _get_range_start():
-                    lastValidShotInd = i
-                    break
-                if shots[i].start >= _get_range_start():
-                    lastValidShotInd = i
-            i -= 1
+            if ends[i] > _get_range_end():
+                break
+            if ends[i] < _get_range_start():
+                break
+            if starts[i] < _get_range_start():
+                lastValidShotInd = i
+                break
+            if starts[i] >= _get_range_start():
+                lastValidShotInd = i
+            i = shotsIndex.getPreviousEnabledShotIndex(i)
 
         return lastValidShotInd
 
@@ -177,6 +166,9 @@ def shotMngHandler_frame_change_pre_jumpToShot(scene):
     if len(shotList) <= 0:
         return
 
+    # sorted interval index of the shots of the current take, rebuilt only when the shots change
+    shotsIndex = props.getShotsIndex()
+
     props.restartPlay = False
 
     current_shot_index = props.current_shot_index
@@ -321,7 +313,7 @@ def shotMngHandler_frame_change_pre_jumpToShot(scene):
         ):  # While forward playing if we hit the first frame and we are playing the last shot jump to the first shot.
             # Seems that the first frame is always hit even in frame dropping playblack
             _logger.debug_ext("current_frame == _get_range_start()", col="PURPLE")
-            props.setCurrentShot([s for s in shotList if s.enabled][0], changeTime=False)
+            props.setCurrentShot(shotList[shotsIndex.getFirstEnabledShotIndex()], changeTime=False)
         elif current_frame < current_shot_start:
             _logger.debug_ext("current_frame < current_shot_start", col="ORANGE")
             disp = current_shot_start - current_frame
@@ -335,7 +327,7 @@ def shotMngHandler_frame_change_pre_jumpToShot(scene):
                 previous_shot = _get_previous_shot(shotList, current_shot_index)
             else:
                 # Scene end is farther than the first shot so loop back.
-                last_enabled = [s for s in shotList if s.enabled][-1]
+                last_enabled = shotList[shotsIndex.getLastEnabledShotIndex()]
                 props.setCurrentShot(last_enabled, changeTime=False)
                 scene.frame_current = last_enabled.end
         else:
@@ -350,14 +342,10 @@ def shotMngHandler_frame_change_pre_jumpToShot(scene):
 
         # User is scrubbing in the timeline so try to guess a shot in the range of the timeline.
         if not (current_shot.start <= current_frame <= current_shot.end):
-            candidates = list()
-            for i, shot in enumerate(shotList):
-                # wk
-                if shot.enabled and shot.start <= current_frame <= shot.end:
-                    candidates.append((i, shot))
-
-            if 0 < len(candidates):
-                props.setCurrentShot(candidates[0][1], changeTime=False)
+            candidateInd = shotsIndex.getFirstShotIndexContainingFrame(current_frame, ignoreDisabled=True)
+
+            if -1 != candidateInd:
+                props.setCurrentShot(shotList[candidateInd], changeTime=False)
                 scene.frame_current = current_frame
             else:
                 # case were the new current time is out of every shots
@@ -24,6 +24,7 @@ from bpy.types import Operator
 from bpy.props import StringProperty, BoolProperty, IntProperty
 
 from shotmanager.config import config
+from shotmanager.properties.shots_index import invalidateShotsIndices
 
 
 class UAS_ShotManager_TakeAdd(Operator):
@@ -213,6 +214,7 @@ class UAS_ShotManager_TakeRemove(Operator):
             props["current_take_name"] = currentTakeInd - 1
             props.takes.remove(currentTakeInd)
 
+        invalidateShotsIndices()
         props.setCurrentShotByIndex(0)
 
         return {"INTERFACE"}
@@ -361,6 +363,7 @@ class UAS_ShotManager_ResetTakesToDefault(Operator):
 
         for i in range(len(takes), -1, -1):
             takes.remove(i)
+        invalidateShotsIndices()
 
         props.createDefaultTake()
 
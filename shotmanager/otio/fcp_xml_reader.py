@@ -0,0 +1,116 @@
+# GPLv3 License
+#
+# Copyright (C) 2021 Ubisoft
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Single pass reader of the information the otio adapter does not provide from a Final Cut Pro XML edit file
+
+The file is read with iterparse and the elements are cleared as soon as they have been read so that large
+edit files are never entirely loaded in memory.
+"""
+
+from xml.etree.ElementTree import iterparse
+
+from ..config import sm_logging
+
+_logger = sm_logging.getLogger(__name__)
+
+
+# path of the video characteristics, relative to the sequence element
+_SAMPLE_CHARACTERISTICS_PATH = ("media", "video", "format", "samplecharacteristics")
+
+
+def readFcpXmlInfo(xmlFile, stopAfterSequence=True):
+    """Return a dictionary with the characteristics of the first sequence of the xml file and the names of
+    its clip items:
+        "video_characteristics": {"rate": {"timebase": float, "ntsc": str}, "width": int, "height": int}, or None
+                                 if the sequence has no sample characteristics
+        "clip_names": dictionary {clip item id: clip item name}
+    Args:
+        stopAfterSequence: if True the reading stops at the end of the first sequence, the rest of the file,
+                           usually other sequences of the project, is ignored
+    """
+    videoCharacteristics = dict()
+    clipNames = dict()
+
+    tagsPath = []
+    sequenceDepth = -1
+    sequenceDone = False
+    sampleCharacteristicsDone = False
+
+    # clip items being read, as [id, name] lists. A clip item takes the first name element found inside it
+    openClipItems = []
+    pendingNames = dict()
+
+    for event, elem in iterparse(xmlFile, events=("start", "end")):
+        if "start" == event:
+            tagsPath.append(elem.tag)
+
+            if "sequence" == elem.tag and -1 == sequenceDepth:
+                sequenceDepth = len(tagsPath)
+            elif "clipitem" == elem.tag:
+                openClipItems.append([elem.get("id"), None])
+            elif "name" == elem.tag:
+                clipItems = [c for c in openClipItems if c[1] is None]
+                if len(clipItems):
+                    for c in clipItems:
+                        c[1] = ""
+                    pendingNames[id(elem)] = clipItems
+            continue
+
+        # end event
+        depth = len(tagsPath)
+        if not sequenceDone and not sampleCharacteristicsDone and -1 != sequenceDepth and depth > sequenceDepth:
+            relPath = tuple(tagsPath[sequenceDepth:])
+            numCharPath = len(_SAMPLE_CHARACTERISTICS_PATH)
+            if relPath == _SAMPLE_CHARACTERISTICS_PATH:
+                sampleCharacteristicsDone = True
+            elif relPath[:numCharPath] == _SAMPLE_CHARACTERISTICS_PATH:
+                charPath = relPath[numCharPath:]
+                text = (elem.text or "").strip()
+                if ("width",) == charPath:
+                    videoCharacteristics["width"] = int(text)
+                elif ("height",) == charPath:
+                    videoCharacteristics["height"] = int(text)
+                elif ("rate", "timebase") == charPath:
+                    videoCharacteristics.setdefault("rate", dict())["timebase"] = float(text)
+                elif ("rate", "ntsc") == charPath:
+                    videoCharacteristics.setdefault("rate", dict())["ntsc"] = text
+
+        if "name" == elem.tag:
+            clipItems = pendingNames.pop(id(elem), None)
+            if clipItems is not None:
+                for c in clipItems:
+                    c[1] = elem.text or ""
+        elif "clipitem" == elem.tag:
+            clipItemId, clipItemName = openClipItems.pop()
+            if clipItemName is not None and clipItemId not in clipNames:
+                clipNames[clipItemId] = clipItemName
+
+        tagsPath.pop()
+        elem.clear()
+
+        if depth == sequenceDepth:
+            sequenceDone = True
+            if stopAfterSequence:
+                break
+
+    if -1 == sequenceDepth:
+        _logger.error(f"readFcpXmlInfo: No sequence found in {xmlFile}")
+    if not {"rate", "width", "height"}.issubset(videoCharacteristics.keys()):
+        videoCharacteristics = None
+
+    return {"video_characteristics": videoCharacteristics, "clip_names": clipNames}
@@ -32,6 +32,7 @@ import opentimelineio
 
 from ..utils import utils
 from ..utils import utils_vse
+from ..utils.utils_media_probe import probeMediaFiles
 
 from . import otio_wrapper as ow
 
@@ -42,7 +43,19 @@ from ..config import sm_logging
 _logger = sm_logging.getLogger(__name__)
 
 
-def importTrack(track, trackInd, track_type, fps, timeRange=None, offsetFrameNumber=0, alternative_media_folder=""):
+def importTrack(
+    track,
+    trackInd,
+    track_type,
+    fps,
+    timeRange=None,
+    offsetFrameNumber=0,
+    alternative_media_folder="",
+    track_index=None,
+):
+    """
+    track_index: index of the track, from otio_wrapper.get_timeline_index(), used to get the clips in the range
+    """
     verbose = False
     #   verbose = "VIDEO" == track_type
 
@@ -59,7 +72,16 @@ def importTrack(track, trackInd, track_type, fps, timeRange=None, offsetFrameNum
     if verbose:
         print(f"{trackInfo}")
 
-    for i, clip in enumerate(track.each_clip()):
+    if track_index is None:
+        clips = track.each_clip()
+    else:
+        clips = track_index.get_clips_in_range(
+            range_start=None if timeRange is None else range_start,
+            range_end=None if timeRange is None else range_end,
+            mode="OVERLAPPING",
+        )
+
+    for i, clip in enumerate(clips):
         # if 5 < i:
         #    break
         clip_start = ow.get_clip_frame_final_start(clip, fps)
@@ -298,6 +320,8 @@ def importToVSE(
     # bpy.context.scene.frame_start = -999999
     # bpy.context.scene.frame_end = 999999
 
+    timelineIndex = ow.get_timeline_index(timeline)
+
     # video
     if "ALL" == track_type or "VIDEO" == track_type:
         for trackInd, editTrack in enumerate(timeline.video_tracks()):
@@ -310,6 +334,7 @@ def importToVSE(
                     timeRange=timeRange,
                     offsetFrameNumber=offsetFrameNumber,
                     alternative_media_folder=alternative_media_folder,
+                    track_index=timelineIndex.video_tracks[trackInd],
                 )
 
     # audio
@@ -324,6 +349,7 @@ def importToVSE(
                     timeRange=timeRange,
                     offsetFrameNumber=offsetFrameNumber,
                     alternative_media_folder=alternative_media_folder,
+                    track_index=timelineIndex.audio_tracks[trackInd],
                 )
 
 
@@ -402,6 +428,20 @@ def getSequenceListFromOtioTimeline(timeline):
     return seq_list
 
 
+def _getMediaMismatches(mediaInfo, fps, duration):
+    """Return the list of the differences between the characteristics of the media probed by
+    utils_media_probe.probeMediaFiles() and the fps and duration, in frames, of the shot using it
+    """
+    mismatches = []
+    if mediaInfo is None:
+        return mismatches
+    if "fps" in mediaInfo and abs(mediaInfo["fps"] - fps) > 0.01:
+        mismatches.append(f"media fps: {mediaInfo['fps']:0.3f}, scene fps: {fps}")
+    if "duration" in mediaInfo and mediaInfo["duration"] != duration:
+        mismatches.append(f"media duration: {mediaInfo['duration']} frames, shot duration: {duration} frames")
+    return mismatches
+
+
 def createShotsFromOtioTimelineClass(
     scene,
     montageOtio,
@@ -468,6 +508,21 @@ def createShotsFromOtioTimelineClass(
 
         shot_re = re.compile(r"sh_?(\d+)", re.IGNORECASE)
         atLeastOneVideoFailed = False
+        mismatchingMedia = []
+
+        # the media are probed in worker threads before the creation of the clips so that the main thread
+        # only creates the clips of the valid media
+        mediaPaths = []
+        mediaInfos = dict()
+        if createCameras and useMediaAsCameraBG:
+            for clip in clipList:
+                media_path = Path(ow.get_clip_media_path(clip.clip))
+                if not media_path.exists():
+                    # Lets find it inside next to the xml
+                    media_path = Path(montageOtio.otioFile).parent.joinpath(media_path.name)
+                mediaPaths.append(media_path)
+            mediaInfos = probeMediaFiles(mediaPaths)
+
         # for i, clip in enumerate(track.each_clip()):
         for i, clip in enumerate(clipList):
             clipName = clip.clip.name
@@ -487,19 +542,15 @@ def createShotsFromOtioTimelineClass(
 
                 # add media as camera background
                 if useMediaAsCameraBG:
-                    media_path = ow.get_clip_media_path(clip.clip)
-                    # print("Import Otio media_path 1: ", media_path)
-                    media_path = Path(media_path)
-                    # print("Import Otio media_path 2: ", media_path)
-                    if not media_path.exists():
-                        # Lets find it inside next to the xml
-                        media_path = Path(montageOtio.otioFile).parent.joinpath(media_path.name)
-                        print("** not found, so Path(self.otioFile).parent: ", Path(montageOtio.otioFile).parent)
-                        print("   and new media_path: ", media_path)
+                    media_path = mediaPaths[i]
 
                     # start frame of the background video is not set here since it will be linked to the shot start frame
                     videoAdded = utils.add_background_video_to_cam(
-                        cam, str(media_path), 0, alpha=props.shotsGlobalSettings.backgroundAlpha
+                        cam,
+                        str(media_path),
+                        0,
+                        alpha=props.shotsGlobalSettings.backgroundAlpha,
+                        mediaInfo=mediaInfos.get(str(media_path), None),
                     )
                     if videoAdded is None:
                         atLeastOneVideoFailed = True
@@ -516,6 +567,17 @@ def createShotsFromOtioTimelineClass(
             shot.bgImages_linkToShotStart = True
             shot.bgImages_offset = -1 * handlesDuration
 
+            # the media probed in the worker threads are compared to the shot using them
+            if createCameras and useMediaAsCameraBG:
+                mismatches = _getMediaMismatches(
+                    mediaInfos.get(str(mediaPaths[i]), None),
+                    fps,
+                    shot.getDuration() + 2 * handlesDuration,
+                )
+                if len(mismatches):
+                    _logger.warning_ext(f"Media of shot {shot.name} does not match it: {', '.join(mismatches)}")
+                    mismatchingMedia.append(shot.name)
+
             # wkip maybe to remove
             scene.frame_start = offsetFrameNumber
             scene.frame_end = (
@@ -564,6 +626,14 @@ def createShotsFromOtioTimelineClass(
                 icon="WARNING",
             )
 
+        if len(mismatchingMedia):
+            utils.ShowMessageBox(
+                message=f"The fps or duration of the media of {len(mismatchingMedia)} shot(s) differ from the shots."
+                " See the console for details",
+                title="Media Mismatch",
+                icon="WARNING",
+            )
+
         # restore context
         # wkip ajouter time range original
         props.setCurrentShotByIndex(0)
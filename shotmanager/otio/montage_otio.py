@@ -24,11 +24,11 @@ from pathlib import Path
 
 # paths are relative in order to make the package not dependent on an add-on name
 from ..utils.utils import file_path_from_url
-from ..utils import utils_xml
 from ..properties.montage_interface import MontageInterface, SequenceInterface, ShotInterface
 
 # from ..otio import otio_wrapper as ow
 from . import otio_wrapper as ow
+from .fcp_xml_reader import readFcpXmlInfo
 import opentimelineio
 
 from ..config import sm_logging
@@ -113,7 +113,13 @@ class MontageOtio(MontageInterface):
 
         return seqName
 
-    def fillMontageInfoFromOtioFile(self, otioFile=None, refVideoTrackInd=0, verboseInfo=False):
+    def fillMontageInfoFromOtioFile(
+        self, otioFile=None, refVideoTrackInd=0, verboseInfo=False, stopAfterXmlSequence=True
+    ):
+        """
+        stopAfterXmlSequence: for xml files, stop reading the file at the end of the first sequence, which is
+                              the one imported by the otio adapter
+        """
 
         if otioFile is not None:
             self.initialize(otioFile)
@@ -134,102 +140,6 @@ class MontageOtio(MontageInterface):
 
             return -1
 
-        def _getVideoCharacteristicsFromXML(xmlDom):
-            #    print("_getVideoCharacteristicsFromXML")
-
-            # from xml.dom.minidom import parse
-            # xmlDom = parse(self.otioFile)
-
-            seq = xmlDom.getElementsByTagName("sequence")[0]
-
-            # seqCharacteristics = dict()
-
-            # seqDuration = utils_xml.getFirstChildWithName(seq, "duration")
-            # if seqDuration is not None:
-            #     seqCharacteristics = {"duration": int(seqDuration.childNodes[0].nodeValue)}
-            # seqRate = utils_xml.getFirstChildWithName(seq, "rate")
-            # if seqRate is not None:
-            #     seqRateDict = {
-            #         "timebase": float(utils_xml.getFirstChildWithName(seqRate, "timebase").childNodes[0].nodeValue),
-            #         "ntsc": utils_xml.getFirstChildWithName(seqRate, "ntsc").childNodes[0].nodeValue,
-            #     }
-            #     self.seqCharacteristics = {"rate": seqRateDict}
-
-            seqMedia = None
-            seqMediaVideo = None
-            seqMediaVideoFormat = None
-            videoSampleCharacteristics = None
-
-            videoCharacteristics = dict()
-
-            seqMedia = utils_xml.getFirstChildWithName(seq, "media")
-            if seqMedia is not None:
-                seqMediaVideo = utils_xml.getFirstChildWithName(seqMedia, "video")
-
-            if seqMediaVideo is not None:
-                seqMediaVideoFormat = utils_xml.getFirstChildWithName(seqMediaVideo, "format")
-
-            if seqMediaVideoFormat is not None:
-                videoSampleCharacteristics = utils_xml.getFirstChildWithName(
-                    seqMediaVideoFormat, "samplecharacteristics"
-                )
-
-            #    print(f"videoSampleCharacteristics: {videoSampleCharacteristics}")
-
-            if videoSampleCharacteristics is not None:
-                seqRate = utils_xml.getFirstChildWithName(videoSampleCharacteristics, "rate")
-
-                seqRateDict = {
-                    "timebase": float(utils_xml.getFirstChildWithName(seqRate, "timebase").childNodes[0].nodeValue),
-                    "ntsc": utils_xml.getFirstChildWithName(seqRate, "ntsc").childNodes[0].nodeValue,
-                }
-
-                videoCharacteristics["rate"] = seqRateDict
-                videoCharacteristics["width"] = int(
-                    utils_xml.getFirstChildWithName(videoSampleCharacteristics, "width").childNodes[0].nodeValue
-                )
-                videoCharacteristics["height"] = int(
-                    utils_xml.getFirstChildWithName(videoSampleCharacteristics, "height").childNodes[0].nodeValue
-                )
-                # videoCharacteristics["anamorphic"] = (
-                #     utils_xml.getFirstChildWithName(videoSampleCharacteristics, "anamorphic").childNodes[0].nodeValue
-                # )
-                # videoCharacteristics["pixelaspectratio"] = (
-                #     utils_xml.getFirstChildWithName(videoSampleCharacteristics, "pixelaspectratio").childNodes[0].nodeValue
-                # )
-                # videoCharacteristics["fielddominance"] = (
-                #     utils_xml.getFirstChildWithName(videoSampleCharacteristics, "fielddominance").childNodes[0].nodeValue
-                # )
-                # videoCharacteristics["colordepth"] = int(
-                #     utils_xml.getFirstChildWithName(videoSampleCharacteristics, "colordepth").childNodes[0].nodeValue
-                # )
-                # videoCharacteristics["width"] = elem.nodeValue
-                # print(f"width: {videoCharacteristics['width']}")
-                # print(f"videoCharacteristics: {videoCharacteristics}")
-
-                self.set_montage_characteristics(
-                    #  videoCharacteristics["rate"]["timebase"],
-                    resolution_x=videoCharacteristics["width"],
-                    resolution_y=videoCharacteristics["height"],
-                    #  duration=seqCharacteristics["duration"],
-                )
-
-            return ()
-
-        def _getXmlClipNames(xmlDom):
-
-            # from xml.dom.minidom import parse
-            # xmlDom = parse(self.parent.parent.otioFile)
-
-            xmlClipNamesArr = []
-
-            clipItems = xmlDom.getElementsByTagName("clipitem")
-            for item in clipItems:
-                nameItem = item.getElementsByTagName("name")[0]
-                xmlClipNamesArr.append((item.getAttribute("id"), nameItem.childNodes[0].nodeValue))
-
-            return xmlClipNamesArr
-
         def _get_name_from_xml_clip_name(clip, xmlClipNames):
             newName = clip.name
             if "Stack" == type(clip).__name__:
@@ -237,20 +147,22 @@ class MontageOtio(MontageInterface):
                     if "fcp_xml" in clip.metadata:
                         if "@id" in clip.metadata["fcp_xml"]:
                             clipId = clip.metadata["fcp_xml"]["@id"]
-                            for item in xmlClipNames:
-                                if item[0] == clipId:
-                                    # self.name = item[1]
-                                    newName = item[1]
-                                    break
+                            # self.name = xmlClipNames[clipId]
+                            newName = xmlClipNames.get(clipId, newName)
             return newName
 
-        xmlClipNames = []
+        # the xml file is read in a single pass, without building its DOM, to get the video characteristics
+        # of the sequence and the names of the clip items that are not provided by the otio adapter
+        xmlClipNames = dict()
         if ".xml" == (Path(self.otioFile).suffix).lower():
-            from xml.dom.minidom import parse
-
-            xmlDom = parse(self.otioFile)
-            _getVideoCharacteristicsFromXML(xmlDom)
-            xmlClipNames = _getXmlClipNames(xmlDom)
+            xmlInfo = readFcpXmlInfo(self.otioFile, stopAfterSequence=stopAfterXmlSequence)
+            videoCharacteristics = xmlInfo["video_characteristics"]
+            if videoCharacteristics is not None:
+                self.set_montage_characteristics(
+                    resolution_x=videoCharacteristics["width"],
+                    resolution_y=videoCharacteristics["height"],
+                )
+            xmlClipNames = xmlInfo["clip_names"]
 
         self.sequencesList = None
         self.sequencesList = list()
@@ -24,6 +24,7 @@ import opentimelineio
 from pathlib import Path
 from urllib.parse import unquote_plus, urlparse
 import re
+from bisect import bisect_left, bisect_right
 
 import math
 
@@ -175,69 +176,9 @@ def get_media_occurence(timeline, media_name, track_type="ALL", last_occurence=F
     media_name found in the timeline
     track_type can be "ALL", "VIDEO" or "AUDIO"
     """
-    found_clip = None
-    tab = "   "
-
-    def _get_media_first_occurence(tracks):
-        first_c = None
-        ind = -1
-        for track in tracks:
-            for i, clip in enumerate(track.each_clip()):
-                ind += 1
-
-                clip_name_l = clip.name.lower()
-                if media_name_l in clip_name_l:
-                    if first_c is None or get_clip_frame_final_start(clip) < get_clip_frame_final_start(first_c):
-                        first_c = clip
-                        print(f"\n{tab}Clip: {ind}, {clip.name}")
-                        break
-
-        return first_c
-
-    def _get_media_last_occurence(tracks):
-        last_c = None
-        ind = -1
-        for track in tracks:
-            for i, clip in enumerate(track.each_clip()):
-                ind += 1
-
-                clip_name_l = clip.name.lower()
-                if media_name_l in clip_name_l:
-                    if last_c is None or get_timeline_clip_end_inclusive(clip) > get_timeline_clip_end_inclusive(
-                        last_c
-                    ):
-                        last_c = clip
-                        print(f"\n{tab}Clip: {ind}, {clip.name}")
-                        break
-
-        return last_c
-
-    media_name_l = media_name.lower()
-
-    if "ALL" == track_type or "VIDEO" == track_type:
-        tracks = timeline.video_tracks()
-        if last_occurence:
-            found_clip = _get_media_last_occurence(tracks)
-        else:
-            found_clip = _get_media_first_occurence(tracks)
-
-    if "ALL" == track_type or "AUDIO" == track_type:
-        tracks = timeline.audio_tracks()
-        found_audio_clip = None
-        if last_occurence:
-            found_audio_clip = _get_media_last_occurence(tracks)
-        else:
-            found_audio_clip = _get_media_first_occurence(tracks)
-
-        if found_clip is None:
-            found_clip = found_audio_clip
-        elif found_audio_clip is None:
-            pass
-        else:
-            first_clip_start = get_clip_frame_final_start(found_clip)
-            first_audio_clip_start = get_clip_frame_final_start(found_audio_clip)
-            if first_audio_clip_start < first_clip_start:
-                found_clip = found_audio_clip
+    found_clip = get_timeline_index(timeline).get_media_occurence(
+        media_name, track_type=track_type, last_occurence=last_occurence
+    )
 
     # print result
     print("\n Track Type: ", track_type)
@@ -245,7 +186,7 @@ def get_media_occurence(timeline, media_name, track_type="ALL", last_occurence=F
     if found_clip is None:
         print("   No clip found")
     else:
-        start = get_clip_frame_final_start(found_clip)
+        start = get_clip_frame_final_start(found_clip, None)
         end = get_timeline_clip_end_exclusive(found_clip)
         print(f"   Found clip: {found_clip.name}, start: {start}, end: {end}")
 
@@ -363,49 +304,181 @@ def get_media_list(timeline, track_type="ALL"):
     """Return the list of the media found in the timeline
     track_type can be "ALL", "VIDEO" or "AUDIO"
     """
+    return get_timeline_index(timeline).get_media_list(track_type=track_type)
 
-    media_list = list()
 
-    # if "ALL" == track_type or "VIDEO" == track_type:
+def get_clips_in_range(timeline, track_type="ALL", mode="STRICTLY", range_start=None, range_end=None):
+    """Return the clips in the specified range, limits included, sorted by track and then by start
+    track_type can be "ALL", "VIDEO" or "AUDIO"
+    mode: "STRICTLY": start and end of clip are inside the range or equal to its boundaries
+    mode: "OVERLAPPING": start, end or frames inbetweens are in the range
+    range_start and range_end: None for no limit
+    *** Warning: track owner is not kept at the moment ***
+    """
+    return get_timeline_index(timeline).get_clips_in_range(
+        track_type=track_type, mode=mode, range_start=range_start, range_end=range_end
+    )
 
-    def _get_media_list(tracks):
-        m_list = list()
 
-        for track in tracks:
-            for clip in track:
-                if isinstance(clip, opentimelineio.schema.Clip):
-                    # print(clip.media_reference)
-                    media_path = get_clip_media_path(clip)
-                    # print(f"{media_path}")
-                    if media_path not in m_list:
-                        m_list.append(media_path)
-        return m_list
+# ----------------------------------
+# timeline index
+# ----------------------------------
 
-    tracks = timeline.tracks
-    if "VIDEO" == track_type:
-        tracks = timeline.video_tracks()
-    elif "AUDIO" == track_type:
-        tracks = timeline.audio_tracks()
+# indices of the last loaded timelines, keyed by the id of the timeline. The timeline is kept with its
+# index so that its id cannot be reused by another object
+_timelineIndices = dict()
+_TIMELINE_INDICES_MAX = 4
 
-    media_list = _get_media_list(tracks)
 
-    # for item in media_list:
-    #     print(item)
+def get_timeline_index(timeline):
+    """Return the index of the specified timeline, built at the first call.
+    The timeline must not be modified after that, use clear_timeline_indices() otherwise
+    """
+    cached = _timelineIndices.get(id(timeline), None)
+    if cached is not None and cached[0] is timeline:
+        return cached[1]
 
-    return media_list
+    if _TIMELINE_INDICES_MAX <= len(_timelineIndices):
+        del _timelineIndices[next(iter(_timelineIndices))]
 
+    index = TimelineIndex(timeline)
+    _timelineIndices[id(timeline)] = (timeline, index)
+    return index
 
-def get_clips_in_range(timeline, track_type="ALL", mode="STRICTLY"):
-    """Return the clips in the specified range
-    track_type can be "ALL", "VIDEO" or "AUDIO"
-    mode: "STRICTLY": start and end of clip are inside the range or equal to its boundaries
-    mode: "OVERLAPPING": start, end or frames inbetweens are in the range
-    *** Warning: track owner is not kept at the moment ***
+
+def clear_timeline_indices():
+    _timelineIndices.clear()
+
+
+class TrackIndex:
+    """Clips of a track sorted by start, with their start and end (inclusive) frames.
+    The clips of a track do not overlap so both the starts and the ends are sorted
     """
 
-    if "ALL" == track_type or "VIDEO" == track_type:
-        pass
-    elif "ALL" == track_type or "AUDIO" == track_type:
-        pass
+    def __init__(self, track, track_type):
+        self.track = track
+        self.track_type = track_type
+
+        clips = list(track.each_clip())
+        starts = [get_clip_frame_final_start(c, None) for c in clips]
+        order = sorted(range(len(clips)), key=lambda i: starts[i])
+        self.clips = [clips[i] for i in order]
+        self.starts = [starts[i] for i in order]
+        self.ends = [get_timeline_clip_end_inclusive(c) for c in self.clips]
+
+    def get_clips_in_range(self, range_start=None, range_end=None, mode="STRICTLY"):
+        """Return the clips in the specified range, limits included, sorted by start"""
+        if range_start is None and range_end is None:
+            return list(self.clips)
+
+        if "OVERLAPPING" == mode:
+            first = 0 if range_start is None else bisect_left(self.ends, range_start)
+            last = len(self.clips) if range_end is None else bisect_right(self.starts, range_end)
+        else:
+            first = 0 if range_start is None else bisect_left(self.starts, range_start)
+            last = len(self.clips) if range_end is None else bisect_right(self.ends, range_end)
+        return self.clips[first:last]
 
-    return
+
+class TimelineIndex:
+    """Index of the clips of an otio timeline, used to answer the repeated queries made during the imports and
+    the conformations without walking all the tracks each time.
+    It holds the clips sorted by start of each track, and the clips by name and by media path.
+    Use get_timeline_index() to get the index of a timeline
+    """
+
+    def __init__(self, timeline):
+        self.timeline = timeline
+        self.video_tracks = [TrackIndex(t, "VIDEO") for t in timeline.video_tracks()]
+        self.audio_tracks = [TrackIndex(t, "AUDIO") for t in timeline.audio_tracks()]
+
+        # lower case name => (start, end inclusive, clip) tupples, media path => clips, for each track type
+        self._clips_by_name = {"VIDEO": dict(), "AUDIO": dict()}
+        self._clips_by_media = {"VIDEO": dict(), "AUDIO": dict()}
+        for track_index in self.video_tracks + self.audio_tracks:
+            clips_by_name = self._clips_by_name[track_index.track_type]
+            clips_by_media = self._clips_by_media[track_index.track_type]
+            for i, clip in enumerate(track_index.clips):
+                clip_item = (track_index.starts[i], track_index.ends[i], clip)
+                clips_by_name.setdefault(clip.name.lower(), []).append(clip_item)
+                clips_by_media.setdefault(get_clip_media_path(clip), []).append(clip)
+
+        # results of the media name queries, they require a scan of the clip names
+        self._occurences = dict()
+
+    def _get_track_types(self, track_type):
+        if "VIDEO" == track_type or "AUDIO" == track_type:
+            return (track_type,)
+        return ("VIDEO", "AUDIO")
+
+    def get_tracks(self, track_type="ALL"):
+        """Return the track indices of the specified type
+        track_type can be "ALL", "VIDEO" or "AUDIO"
+        """
+        if "VIDEO" == track_type:
+            return self.video_tracks
+        if "AUDIO" == track_type:
+            return self.audio_tracks
+        return self.video_tracks + self.audio_tracks
+
+    def get_clips_by_name(self, clip_name, track_type="ALL"):
+        """Return the clips named clip_name, case insensitive"""
+        clip_name_l = clip_name.lower()
+        clips = []
+        for t_type in self._get_track_types(track_type):
+            clips.extend([item[2] for item in self._clips_by_name[t_type].get(clip_name_l, [])])
+        return clips
+
+    def get_clips_by_media(self, media_path, track_type="ALL"):
+        """Return the clips using the specified media path"""
+        clips = []
+        for t_type in self._get_track_types(track_type):
+            clips.extend(self._clips_by_media[t_type].get(media_path, []))
+        return clips
+
+    def get_media_list(self, track_type="ALL"):
+        """Return the list of the media found in the timeline, in the order of the tracks"""
+        media_list = []
+        for t_type in self._get_track_types(track_type):
+            for media_path in self._clips_by_media[t_type].keys():
+                if media_path not in media_list:
+                    media_list.append(media_path)
+        return media_list
+
+    def get_media_occurence(self, media_name, track_type="ALL", last_occurence=False):
+        """Return the clip with a name containing media_name, case insensitive, that starts first, or that ends
+        last if last_occurence is True. None if not found
+        """
+        media_name_l = media_name.lower()
+        key = (media_name_l, track_type)
+        occurences = self._occurences.get(key, None)
+
+        if occurences is None:
+            first_item = None
+            last_item = None
+            for t_type in self._get_track_types(track_type):
+                for clip_name_l, clip_items in self._clips_by_name[t_type].items():
+                    if media_name_l not in clip_name_l:
+                        continue
+                    for item in clip_items:
+                        if first_item is None or item[0] < first_item[0]:
+                            first_item = item
+                        if last_item is None or item[1] > last_item[1]:
+                            last_item = item
+            occurences = (
+                None if first_item is None else first_item[2],
+                None if last_item is None else last_item[2],
+            )
+            self._occurences[key] = occurences
+
+        return occurences[1] if last_occurence else occurences[0]
+
+    def get_clips_in_range(self, track_type="ALL", mode="STRICTLY", range_start=None, range_end=None):
+        """Return the clips in the specified range, limits included, sorted by track and then by start
+        mode: "STRICTLY": start and end of clip are inside the range or equal to its boundaries
+        mode: "OVERLAPPING": start, end or frames inbetweens are in the range
+        """
+        clips = []
+        for track_index in self.get_tracks(track_type):
+            clips.extend(track_index.get_clips_in_range(range_start=range_start, range_end=range_end, mode=mode))
+        return clips
@@ -19,7 +19,7 @@
 UI in BGL for the Interactive Shots Stack overlay tool
 """
 
-from collections import defaultdict
+import heapq
 
 import os
 from mathutils import Vector
@@ -30,6 +30,7 @@ import gpu
 
 from ..shots_stack_bgl import get_lane_origin_y
 
+from shotmanager.properties.shots_index import getShotsIndex
 from shotmanager.utils import utils_editors_dopesheet
 from shotmanager.utils.utils import color_to_linear
 
@@ -52,6 +53,34 @@ _logger = sm_logging.getLogger(__name__)
 UNIFORM_SHADER_2D = gpu.shader.from_builtin("2D_UNIFORM_COLOR")
 
 
+def computeCompactModeLanes(starts, ends, shotIndices, firstLane):
+    """Return a dictionary giving the lane of each of the specified shots, the shots of a lane not overlapping.
+    The shots are placed by increasing start frame in the lowest lane free at their start. The busy lanes are
+    kept in a min-heap of their end frames and the free ones in a min-heap of their numbers: O(n log n)
+    """
+    busyLanes = []
+    freeLanes = []
+    numLanes = 0
+    lanes = dict()
+
+    # the sort is stable: shots starting at the same frame keep their order in the take
+    for shotInd in sorted(shotIndices, key=lambda i: starts[i]):
+        start = starts[shotInd]
+        while len(busyLanes) and busyLanes[0][0] < start:
+            heapq.heappush(freeLanes, heapq.heappop(busyLanes)[1])
+
+        if len(freeLanes):
+            lane = heapq.heappop(freeLanes)
+        else:
+            lane = firstLane + numLanes
+            numLanes += 1
+
+        heapq.heappush(busyLanes, (ends[shotInd], lane))
+        lanes[shotInd] = lane
+
+    return lanes
+
+
 class ShotStackWidget:
     def __init__(self, target_area=None):
         prefs = config.getAddonPrefs()
@@ -65,6 +94,13 @@ class ShotStackWidget:
         self.shotComponents = []
         self.infoComponent = None
 
+        # the shots index of the take is rebuilt when the shots are added, removed, moved or
+        # when their range or enabled state change, it is used to know when to update the components
+        # and the compact mode layout
+        self._shotComponentsShotsIndex = None
+        self._compactModeLanesKey = None
+        self._compactModeLanes = dict()
+
         self.prev_mouse_x = 0
         self.prev_mouse_y = 0
         self.frame_under_mouse = -1
@@ -209,8 +245,14 @@ class ShotStackWidget:
 
         if not len(shots):
             self.shotComponents = []
+            self._shotComponentsShotsIndex = None
             return
 
+        shotsIndex = getShotsIndex(props.getCurrentTake())
+        if not forceRebuild and shotsIndex is self._shotComponentsShotsIndex:
+            return
+        self._shotComponentsShotsIndex = shotsIndex
+
         rebuildList = forceRebuild or len(self.shotComponents) != len(shots)
 
         # check if the components list matches the shots list
@@ -285,47 +327,50 @@ class ShotStackWidget:
         # draw quad for current shot over the result
         self.drawCurrentShotDecoration(shotCompoCurrent, preDrawOnly=preDrawOnly)
 
-    def drawShots_compactMode(self, preDrawOnly=False):
-        # return
+    def getCompactModeLanes(self):
+        """Return the lanes of the visible shots in compact mode, as a dictionary {shot index: lane}.
+        The layout is cached until the shots or the display settings change
+        """
         props = self.context.scene.UAS_shot_manager_props
         prefs = config.getAddonPrefs()
-        self.rebuildShotComponents()
 
-        currentShot = props.getCurrentShot()
-        selectedShot = props.getSelectedShot()
+        shotsIndex = getShotsIndex(props.getCurrentTake())
+        displayDisabledShots = props.interactShotsStack_displayDisabledShots
+        key = (shotsIndex, displayDisabledShots, prefs.shtStack_firstLineIndex)
 
-        shotComponentsSorted = sorted(self.shotComponents, key=lambda shotCompo: shotCompo.shot.start)
+        if key != self._compactModeLanesKey:
+            shotIndices = shotsIndex.allIndices if displayDisabledShots else shotsIndex.enabledIndices
+            self._compactModeLanes = computeCompactModeLanes(
+                shotsIndex.starts, shotsIndex.ends, shotIndices, 1 + prefs.shtStack_firstLineIndex
+            )
+            self._compactModeLanesKey = key
 
-        shots_from_lane = defaultdict(list)
+        return self._compactModeLanes
+
+    def drawShots_compactMode(self, preDrawOnly=False):
+        props = self.context.scene.UAS_shot_manager_props
+        self.rebuildShotComponents()
+        if not len(self.shotComponents):
+            self.drawCurrentShotDecoration(None, preDrawOnly=preDrawOnly)
+            return
+
+        currentShotInd = props.getCurrentShotIndex()
+        selectedShotInd = props.getSelectedShotIndex()
+        lanes = self.getCompactModeLanes()
 
         shotCompoCurrent = None
-        for i, shotCompo in enumerate(shotComponentsSorted):
-            if not props.interactShotsStack_displayDisabledShots and not shotCompo.shot.enabled:
+        for i, shotCompo in enumerate(self.shotComponents):
+            lane = lanes.get(i, None)
+            if lane is None:
                 shotCompo.isVisible = False
                 continue
-            lane = 1 + prefs.shtStack_firstLineIndex
-            if i > 0:
-                for ln, shots_in_lane in shots_from_lane.items():
-                    for s in shots_in_lane:
-                        if s.start <= shotCompo.shot.start <= s.end:
-                            break
-                    else:
-                        lane = ln
-                        break
-                else:
-                    if len(shots_from_lane):
-                        lane = max(shots_from_lane) + 1  # No free lane, make a new one.
-                    else:
-                        #   lane = ln
-                        pass
-            shots_from_lane[lane].append(shotCompo.shot)
-
-            shotCompo.isCurrent = shotCompo.shot == currentShot
+
+            shotCompo.isCurrent = i == currentShotInd
 
             # NOTE: we use _isSelected instead of the property isSelected in order
             # to avoid the call of the callback function _on_selected_changed, otherwise
             # the event loops and keep redrawing all the time
-            shotCompo._isSelected = shotCompo.shot == selectedShot
+            shotCompo._isSelected = i == selectedShotInd
 
             if shotCompo.isCurrent:
                 shotCompoCurrent = shotCompo
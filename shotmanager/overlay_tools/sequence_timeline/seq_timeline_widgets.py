@@ -40,6 +40,35 @@ from shotmanager.config import sm_logging
 
 _logger = sm_logging.getLogger(__name__)
 
+UNIFORM_SHADER_2D = gpu.shader.from_builtin("2D_UNIFORM_COLOR")
+FLAT_COLOR_SHADER_2D = gpu.shader.from_builtin("2D_FLAT_COLOR")
+
+# bottom left, top left, top right, bottom right
+_UNIT_QUAD_VERTICES = ((0, 0), (0, 1), (1, 1), (1, 0))
+_QUAD_INDICES = ((0, 1, 2), (0, 2, 3))
+
+
+def _build_rects_batch(rects):
+    """Return a single batch drawing all the specified rectangles, in this order.
+    Rectangles are defined by (x, y, width, height, color), from their bottom left corner
+    """
+    vertices = []
+    colors = []
+    indices = []
+    for x, y, width, height, color in rects:
+        i = len(vertices)
+        vertices.extend(((x, y), (x, y + height), (x + width, y + height), (x + width, y)))
+        colors.extend((color,) * 4)
+        indices.extend(((i, i + 1, i + 2), (i, i + 2, i + 3)))
+    return batch_for_shader(FLAT_COLOR_SHADER_2D, "TRIS", {"pos": vertices, "color": colors}, indices=indices)
+
+
+def _draw_rects_batch(batch):
+    FLAT_COLOR_SHADER_2D.bind()
+    bgl.glEnable(bgl.GL_BLEND)
+    batch.draw(FLAT_COLOR_SHADER_2D)
+    bgl.glDisable(bgl.GL_BLEND)
+
 
 class BL_UI_Cursor:
     def __init__(self, move_callback=None):
@@ -344,90 +373,41 @@ class BL_UI_Shot:
     def init(self, context):
         self.context = context
 
-    def draw(self):
+    def get_rects(self):
+        """Return the rectangles to draw for the shot, from bottom to top, as (x, y, width, height, color)"""
         area_height = self.get_area_height()
 
         self.x_screen = self.x
         self.y_screen = area_height - self.y
-
-        indices = ((0, 1, 2), (0, 2, 3))
-
         y_screen_flip = area_height - self.y_screen
-        # bottom left, top left, top right, bottom right
-        vertices = (
-            (self.x_screen, y_screen_flip),
-            (self.x_screen, y_screen_flip - self.height),
-            (self.x_screen + self.width, y_screen_flip - self.height),
-            (self.x_screen + self.width, y_screen_flip),
-        )
+        y_bottom = y_screen_flip - self.height
 
-        shader = gpu.shader.from_builtin("2D_UNIFORM_COLOR")
-        batch_panel = batch_for_shader(shader, "TRIS", {"pos": vertices}, indices=indices)
+        shot_color = self._shot_color if self.enabled else self._shot_color_disabled
+        rects = [(self.x_screen, y_bottom, self.width, self.height, shot_color)]
 
-        shader.bind()
-        shader.uniform_float("color", self._shot_color if self.enabled else self._shot_color_disabled)
-        bgl.glEnable(bgl.GL_BLEND)
-        batch_panel.draw(shader)
-        bgl.glDisable(bgl.GL_BLEND)
-
-        # draw vertical separators
-        line_thickness = 1
-        currentBboxBG = Square(
-            self.x_screen,
-            y_screen_flip - self.height + 1,
-            line_thickness,
-            self.height,
-            color=self._bg_color,
-            origin="BOTTOM_LEFT",
-        )
-        currentBboxBG.draw()
+        # vertical separator
+        rects.append((self.x_screen, y_bottom + 1, 1, self.height, self._bg_color))
 
-        # draw linebar bg
+        # linebar bg
         line_thickness = 4
-        currentBboxBG = Square(
-            self.x_screen,
-            y_screen_flip - self.height + 1,
-            self.width,
-            line_thickness,
-            color=self._bg_color,
-            origin="BOTTOM_LEFT",
-        )
-        currentBboxBG.draw()
+        rects.append((self.x_screen, y_bottom + 1, self.width, line_thickness, self._bg_color))
 
-        # draw line for current shot
+        # line for current shot
         if self.shotIsSelected:
-            currentBbox = Square(
-                self.x_screen,
-                y_screen_flip - self.height,
-                self.width,
-                line_thickness,
-                color=self.color_selectedShot_border,
-                origin="BOTTOM_LEFT",
-            )
-            currentBbox.draw()
+            rects.append((self.x_screen, y_bottom, self.width, line_thickness, self.color_selectedShot_border))
 
         if self.shotIsCurrent:
-            if self.shotIsSelected:
-                currentBbox = Square(
-                    self.x_screen,
-                    y_screen_flip - self.height,
-                    self.width,
-                    line_thickness // 2 + 1,
-                    color=self.color_currentShot_border,
-                    origin="BOTTOM_LEFT",
-                )
-                currentBbox.draw()
-            else:
-                currentBbox = Square(
-                    self.x_screen,
-                    y_screen_flip - self.height,
-                    self.width,
-                    line_thickness,
-                    color=self.color_currentShot_border,
-                    origin="BOTTOM_LEFT",
-                )
-                currentBbox.draw()
+            current_thickness = line_thickness // 2 + 1 if self.shotIsSelected else line_thickness
+            rects.append((self.x_screen, y_bottom, self.width, current_thickness, self.color_currentShot_border))
+
+        return rects
 
+    def draw(self):
+        _draw_rects_batch(_build_rects_batch(self.get_rects()))
+        self.draw_name()
+
+    def draw_name(self):
+        y_screen_flip = self.get_area_height() - self.y_screen
         blf.position(0, self.x_screen + 3, y_screen_flip - self.height * 0.5, 0)
 
         if self.enabled:
@@ -523,6 +503,15 @@ class BL_UI_Timeline:
         self._bg_color = (0.14, 0.14, 0.14, 0.85)
 
         self.ui_shots = list()
+
+        # retained drawing: the background and the shots are drawn by a single batch, rebuilt only when the
+        # shots or the area change, and the carets by a unit quad moved and scaled by the model matrix
+        self._shots_batch = None
+        self._shots_batch_key = None
+        # for each displayed shot: index, position x, width, start, end
+        self._shots_layout = list()
+        self._unit_quad_batch = None
+
         self.frame_cursor = BL_UI_Cursor(self.frame_cursor_moved)
         self.frame_cursor_forShotPlayMode = BL_UI_Cursor(self.frame_cursor_moved)
 
@@ -545,111 +534,111 @@ class BL_UI_Timeline:
         self.frame_cursor.init(context)
         self.frame_cursor_forShotPlayMode.init(context, cursor_forShotPlayMode=True)
 
-    def draw_caret(self, x, color):
-        caret_width = 3
-        area_height = self.get_area_height()
-
-        y = self.height + self.y_offset
-        x_screen = x
-
-        indices = ((0, 1, 2), (0, 2, 3))
-
-        y_screen_flip = area_height - self.y_screen
-        # bottom left, top left, top right, bottom right
-        vertices = (
-            (x_screen, y_screen_flip),
-            (x_screen, y_screen_flip - self.height),
-            (x_screen + caret_width, y_screen_flip - self.height),
-            (x_screen + caret_width, y_screen_flip),
-        )
-
-        shader = gpu.shader.from_builtin("2D_UNIFORM_COLOR")
-        batch_panel = batch_for_shader(shader, "TRIS", {"pos": vertices}, indices=indices)
+    def _draw_unit_quad(self, x, y, width, height, color):
+        """Draw a rectangle from the retained unit quad batch: only the uniforms change between draws"""
+        if self._unit_quad_batch is None:
+            self._unit_quad_batch = batch_for_shader(
+                UNIFORM_SHADER_2D, "TRIS", {"pos": _UNIT_QUAD_VERTICES}, indices=_QUAD_INDICES
+            )
 
-        shader.bind()
-        # shader.uniform_float ( "color", ( 1., .1, .1, 1 ) )
-        shader.uniform_float("color", color)
+        UNIFORM_SHADER_2D.bind()
+        UNIFORM_SHADER_2D.uniform_float("color", color)
         bgl.glEnable(bgl.GL_BLEND)
-        batch_panel.draw(shader)
+        with gpu.matrix.push_pop():
+            gpu.matrix.translate((x, y))
+            gpu.matrix.scale((width, height))
+            self._unit_quad_batch.draw(UNIFORM_SHADER_2D)
         bgl.glDisable(bgl.GL_BLEND)
 
+    def draw_caret(self, x, color):
+        caret_width = 3
+        y_screen_flip = self.get_area_height() - self.y_screen
+        self._draw_unit_quad(x, y_screen_flip - self.height, caret_width, self.height, color)
+
     def draw_frame_caret(self, x, frame_width, color):
-        caret_width = frame_width
         caret_height = self.height * 0.35
-        area_height = self.get_area_height()
-
-        y = caret_height + self.y_offset
-        x_screen = x
-
-        indices = ((0, 1, 2), (0, 2, 3))
-
-        y_screen_flip = area_height - self.y_screen
-        # bottom left, top left, top right, bottom right
-        vertices = (
-            (x_screen, y_screen_flip - self.height),
-            (x_screen, y_screen_flip - self.height + caret_height),
-            (x_screen + caret_width, y_screen_flip - self.height + caret_height),
-            (x_screen + caret_width, y_screen_flip - self.height),
-        )
-
-        shader = gpu.shader.from_builtin("2D_UNIFORM_COLOR")
-        batch_panel = batch_for_shader(shader, "TRIS", {"pos": vertices}, indices=indices)
-
-        shader.bind()
-        # shader.uniform_float("color", (1.0, 0.1, 0.1, 1))
-        shader.uniform_float("color", color)
-        bgl.glEnable(bgl.GL_BLEND)
-        batch_panel.draw(shader)
-        bgl.glDisable(bgl.GL_BLEND)
+        y_screen_flip = self.get_area_height() - self.y_screen
+        self._draw_unit_quad(x, y_screen_flip - self.height, frame_width, caret_height, color)
 
-    def draw_shots(self):
-        props = self.context.scene.UAS_shot_manager_props
+    def _rebuild_shots_batch(self, props, shotsData, currentShotIndex, selectedShotIndex):
+        area_height = self.get_area_height()
 
-        shots = props.get_shots()
-        currentShotIndex = props.getCurrentShotIndex()
-        selectedShotIndex = props.getSelectedShotIndex()
+        # we add +1 to get a thin bg line at the top of the timeline
+        y_screen_flip = area_height - self.y_screen + 1
+        rects = [(self.x_screen, y_screen_flip - self.height, self.width, self.height, self._bg_color)]
 
         self.ui_shots.clear()
+        self._shots_layout.clear()
 
         total_range = props.getEditDuration(ignoreDisabled=not props.seqTimeline_displayDisabledShots)
         offset_x = 0
-        for i, shot in enumerate(shots):
-            if not props.seqTimeline_displayDisabledShots and not shot.enabled:
+        for i, (start, end, enabled, name, color) in enumerate(shotsData):
+            if not props.seqTimeline_displayDisabledShots and not enabled:
                 continue
-            size_x = int(self.width * float(shot.end + 1 - shot.start) / total_range)
+            size_x = int(self.width * float(end + 1 - start) / total_range)
             s = BL_UI_Shot(
                 offset_x,
                 self.y,
                 size_x,
                 self.height,
-                shot.name,
-                shot.enabled,
+                name,
+                enabled,
                 i == currentShotIndex,
                 i == selectedShotIndex,
             )
             s.init(self.context)
-            s.shot_color = tuple(color_to_sRGB(shot.color))
+            s.shot_color = tuple(color_to_sRGB(color))
             self.ui_shots.append(s)
+            rects.extend(s.get_rects())
 
-            s.draw()
+            self._shots_layout.append((i, offset_x, size_x, start, end))
+            offset_x += size_x
 
-            caret_pos = offset_x + (self.context.scene.frame_current - shot.start) * size_x / float(
-                shot.end + 1 - shot.start
-            )
-            frame_width = size_x / float(shot.end + 1 - shot.start)
+        self._shots_batch = _build_rects_batch(rects)
 
-            if self.context.window_manager.UAS_shot_manager_shots_play_mode:
-                if currentShotIndex == i:
-                    caret_color = (1.0, 0.1, 0.1, 1)
-                    self.draw_frame_caret(caret_pos, frame_width, darken_color(caret_color))
-                    self.draw_caret(caret_pos, caret_color)
+    def draw_shots(self):
+        props = self.context.scene.UAS_shot_manager_props
+
+        shots = props.get_shots()
+        currentShotIndex = props.getCurrentShotIndex()
+        selectedShotIndex = props.getSelectedShotIndex()
+
+        shotsData = tuple((shot.start, shot.end, shot.enabled, shot.name, tuple(shot.color)) for shot in shots)
+        batchKey = (
+            shotsData,
+            currentShotIndex,
+            selectedShotIndex,
+            props.seqTimeline_displayDisabledShots,
+            self.width,
+            self.get_area_height(),
+            self.y,
+            self.height,
+            self._bg_color,
+        )
+        if self._shots_batch is None or batchKey != self._shots_batch_key:
+            self._rebuild_shots_batch(props, shotsData, currentShotIndex, selectedShotIndex)
+            self._shots_batch_key = batchKey
+
+        _draw_rects_batch(self._shots_batch)
+        for s in self.ui_shots:
+            s.draw_name()
+
+        current_frame = self.context.scene.frame_current
+        shots_play_mode = self.context.window_manager.UAS_shot_manager_shots_play_mode
+        for i, offset_x, size_x, start, end in self._shots_layout:
+            if shots_play_mode:
+                if currentShotIndex != i:
+                    continue
+                caret_color = (1.0, 0.1, 0.1, 1)
             else:
-                if shot.start <= self.context.scene.frame_current and self.context.scene.frame_current <= shot.end:
-                    caret_color = (0.1, 1.0, 0.1, 1)
-                    self.draw_frame_caret(caret_pos, frame_width, darken_color(caret_color))
-                    self.draw_caret(caret_pos, caret_color)
+                if not (start <= current_frame and current_frame <= end):
+                    continue
+                caret_color = (0.1, 1.0, 0.1, 1)
 
-            offset_x += int(self.width * float(shot.end + 1 - shot.start) / total_range)
+            caret_pos = offset_x + (current_frame - start) * size_x / float(end + 1 - start)
+            frame_width = size_x / float(end + 1 - start)
+            self.draw_frame_caret(caret_pos, frame_width, darken_color(caret_color))
+            self.draw_caret(caret_pos, caret_color)
 
     def draw(self):
         if self.target_area is not None and self.context.area != self.target_area:
@@ -662,27 +651,7 @@ class BL_UI_Timeline:
         self.x_screen = self.x
         self.y_screen = area_height - self.y
 
-        indices = ((0, 1, 2), (0, 2, 3))
-
-        # we add +1 to get a thin bg line at the top of the timeline
-        y_screen_flip = area_height - self.y_screen + 1
-        # bottom left, top left, top right, bottom right
-        vertices = (
-            (self.x_screen, y_screen_flip),
-            (self.x_screen, y_screen_flip - self.height),
-            (self.x_screen + self.width, y_screen_flip - self.height),
-            (self.x_screen + self.width, y_screen_flip),
-        )
-
-        shader = gpu.shader.from_builtin("2D_UNIFORM_COLOR")
-        batch_panel = batch_for_shader(shader, "TRIS", {"pos": vertices}, indices=indices)
-
-        shader.bind()
-        shader.uniform_float("color", self._bg_color)
-        bgl.glEnable(bgl.GL_BLEND)
-        batch_panel.draw(shader)
-        bgl.glDisable(bgl.GL_BLEND)
-
+        # the background is part of the shots batch
         self.draw_shots()
         if self.context.window_manager.UAS_shot_manager_shots_play_mode:
             self.frame_cursor_forShotPlayMode.draw()
@@ -38,9 +38,15 @@ def draw_shots_names(context):
     scene = context.scene
     props = config.getAddonProps(context.scene)
 
+    camerasIndex = props.getCamerasIndex()
+    if camerasIndex is None:
+        return
+
     # return
     # For all camera which have a shot draw on the ui a list of shots associated with it
-    cameras = [obj for obj in scene.objects if obj is not None and obj.type == "CAMERA"]
+    # cameras = [obj for obj in scene.objects if obj is not None and obj.type == "CAMERA"]
+    # only the cameras used by the shots of the current take can have shot names to draw
+    cameras = [cam for cam in camerasIndex.cameras if scene.objects.get(cam.name, None) == cam]
     for cam in cameras:
         if cam.type == "CAMERA":
             # print(f"cam: {cam.name}, cam.visible_get(): {cam.visible_get()}")
@@ -53,10 +59,16 @@ def draw_shots_names(context):
                     if pos_2d is not None:
                         # print("pos x:", pos_2d[0])
                         # print("pos y:", pos_2d[1])
-                        draw_all_shots_names(context, cam, pos_2d[0], pos_2d[1], vertical=True)
+                        draw_all_shots_names(
+                            context, cam, pos_2d[0], pos_2d[1], vertical=True, camerasIndex=camerasIndex
+                        )
                 else:
-                    gp_child = utils_greasepencil.get_greasepencil_child(cam, childType="GPENCIL")
-                    parentShot = props.getParentShotFromGpChild(gp_child)
+                    # gp_child = utils_greasepencil.get_greasepencil_child(cam, childType="GPENCIL")
+                    # parentShot = props.getParentShotFromGpChild(gp_child)
+                    gp_child = camerasIndex.getGreasePencilChild(cam)
+                    parentShot = None
+                    if gp_child is not None:
+                        parentShot = camerasIndex.getShotsUsingCamera(cam)[0]
                     distance = 0.5
                     if parentShot is not None:
                         gp_props = parentShot.getGreasePencilProps(mode="STORYBOARD")
@@ -102,17 +114,23 @@ def draw_shots_names(context):
                                         frame_px[0][1],
                                         vertical=True,
                                         screen_offset=[0, 4],
+                                        camerasIndex=camerasIndex,
                                     )
                             except Exception as e:
                                 print(f"{e}")
 
 
-def draw_all_shots_names(context, cam, pos_x, pos_y, vertical=False, screen_offset=None):
+def draw_all_shots_names(context, cam, pos_x, pos_y, vertical=False, screen_offset=None, camerasIndex=None):
     """
     Args:
         screen_offset: array [x, y] to offset the drawing origin
+        camerasIndex: index of the cameras of the current take, fetched from the props if None
     """
     props = config.getAddonProps(context.scene)
+    if camerasIndex is None:
+        camerasIndex = props.getCamerasIndex()
+        if camerasIndex is None:
+            return ()
     prefs = config.getAddonPrefs()
     current_shot = props.getCurrentShot()
     # hud_offset_x = 19
@@ -135,14 +153,15 @@ def draw_all_shots_names(context, cam, pos_x, pos_y, vertical=False, screen_offs
     _, font_height = blf.dimensions(0, "A")
     # font_height = font_height * 0.8
 
-    shotsList_allCams = props.getShotsUsingCamera(cam)
+    shotsList_allCams = camerasIndex.getShotsUsingCamera(cam)
     if 0 == len(shotsList_allCams):
         return ()
 
     # keep only shots with visible cameras
     shotsList = list()
     for shot in shotsList_allCams:
-        gp_child = utils_greasepencil.get_greasepencil_child(shot.camera, childType="GPENCIL")
+        # gp_child = utils_greasepencil.get_greasepencil_child(shot.camera, childType="GPENCIL")
+        gp_child = camerasIndex.getGreasePencilChild(shot.camera)
         # if shot.isCameraValid() and (shot.camera.visible_get() or shot.camera.name == cam.name):
         if shot.isCameraValid() and (
             shot.camera.visible_get()
@@ -0,0 +1,102 @@
+# GPLv3 License
+#
+# Copyright (C) 2021 Ubisoft
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Reverse index of the cameras used by the shots of a take, used by the viewport camera HUD
+
+For each camera the index gives the shots of the take using it, in the take order, and the grease pencil
+child of the camera. It is cached per take and rebuilt when the shots index of the take is rebuilt, when a
+shot camera is changed, and after a call to invalidateCamerasIndices(), which is done on depsgraph object
+updates (objects added, removed or reparented) and on undo, redo and file load.
+"""
+
+from shotmanager.utils import utils_greasepencil
+
+from .shots_index import getShotsIndex
+
+from shotmanager.config import sm_logging
+
+_logger = sm_logging.getLogger(__name__)
+
+
+# cached indices, keyed by the pointer of the take
+_camerasIndices = dict()
+
+
+def getCamerasIndex(take):
+    """Return the cameras index of the specified take, rebuilt if needed"""
+    key = take.as_pointer()
+    shotsIndex = getShotsIndex(take)
+    index = _camerasIndices.get(key, None)
+
+    # the shots index is rebuilt when shots are added, removed or moved, the shots references are then obsolete
+    if index is None or index.shotsIndex is not shotsIndex:
+        index = CamerasIndex(take.shots, shotsIndex)
+        _camerasIndices[key] = index
+    return index
+
+
+def invalidateCamerasIndices():
+    """Discard all the cached cameras indices. To call every time a shot camera is changed or when objects are
+    added, removed or reparented in the scene
+    """
+    _camerasIndices.clear()
+
+
+class CamerasIndex:
+    """Shots and grease pencil child of each camera used by the shots of a take
+
+    Do not keep a reference to an instance across operators: use getCamerasIndex(take) instead to get
+    an up to date index.
+    """
+
+    def __init__(self, shots, shotsIndex):
+        self.shotsIndex = shotsIndex
+
+        # cameras in the order of their first use in the take
+        self.cameras = []
+        self._shotsByCamera = dict()
+        self._gpChildByCamera = dict()
+        for shot in shots:
+            cam = shot.camera
+            if cam is None:
+                continue
+            key = cam.as_pointer()
+            camShots = self._shotsByCamera.get(key, None)
+            if camShots is None:
+                camShots = []
+                self._shotsByCamera[key] = camShots
+                self._gpChildByCamera[key] = utils_greasepencil.get_greasepencil_child(cam, childType="GPENCIL")
+                self.cameras.append(cam)
+            camShots.append(shot)
+
+    def getShotsUsingCamera(self, cam, ignoreDisabled=False):
+        """Return the list of the shots using the specified camera, in the take order"""
+        if cam is None:
+            return []
+        camShots = self._shotsByCamera.get(cam.as_pointer(), [])
+        if ignoreDisabled:
+            return [s for s in camShots if s.enabled]
+        return list(camShots)
+
+    def getGreasePencilChild(self, cam):
+        """Return the grease pencil child of the specified camera, None if the camera has none or is not used
+        by the shots of the take
+        """
+        if cam is None:
+            return None
+        return self._gpChildByCamera.get(cam.as_pointer(), None)
@@ -46,6 +46,8 @@ from .output_params import UAS_ShotManager_OutputParams_Resolution
 from .shot import UAS_ShotManager_Shot
 from .shots_global_settings import UAS_ShotManager_ShotsGlobalSettings
 from .take import UAS_ShotManager_Take
+from .shots_index import getShotsIndex, getShotOwner, invalidateShotsIndices
+from .cameras_index import getCamerasIndex
 from .layout_settings import UAS_ShotManager_LayoutSettings
 
 from shotmanager.warnings import warnings
@@ -2500,6 +2502,7 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
             if self.use_project_settings:
                 defaultName = self.project_default_take_name
             defaultTake.initialize(self, name=defaultName)
+            invalidateShotsIndices()
             self.setCurrentTakeByIndex(0)
             # self.setCurrentShotByIndex(-1)
             # self.setSelectedShotByIndex(-1)
@@ -2524,6 +2527,9 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
             newTake = takes.add()
             newTake.initialize(self, name="" + newTakeName)
 
+        # adding a take can reallocate the takes array and change the pointers keying the cached indices
+        invalidateShotsIndices()
+
         # self.current_take_name = newTake.name
         # print(f"new added take name: {newTake.name}")
 
@@ -2534,6 +2540,7 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
             atValidIndex = min(atValidIndex, len(takes) - 1)
             takes.move(len(takes) - 1, atValidIndex)
             newTake = takes[atValidIndex]
+            invalidateShotsIndices()
 
         # after a move newTake is different!
         # print(f"new added take name02: {newTake.name}")
@@ -2573,6 +2580,7 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
                 return -1
 
         self.takes.move(takeInd, newInd)
+        invalidateShotsIndices()
         self.setCurrentTakeByIndex(newInd)
 
         return newInd
@@ -2808,18 +2816,17 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
             if -1 == takeIndex
             else (takeIndex if 0 <= takeIndex and takeIndex < len(self.getTakes()) else -1)
         )
-        duration = -1
         if -1 == takeInd:
             return -1
 
-        shotList = self.getShotsList(ignoreDisabled=ignoreDisabled, takeIndex=takeIndex)
-
-        if 0 < len(shotList):
-            duration = 0
-            for sh in shotList:
-                duration += sh.getDuration()
+        # cumulated durations are cached in the take shots index
+        return getShotsIndex(self.takes[takeInd]).getEditDuration(ignoreDisabled=ignoreDisabled)
 
-        return duration
+    def _getEditTimeOffset(self, take, referenceLevel="TAKE"):
+        if "GLOBAL_EDIT" == referenceLevel:
+            return take.startInGlobalEdit
+        # at take level
+        return self.editStartFrame  # at project level
 
     def getEditTime(self, referenceShot, frameIndexIn3DTime, referenceLevel="TAKE", ignoreDisabled=True):
         """Return edit current time in frames, -1 if no shots or if current shot is disabled
@@ -2833,6 +2840,8 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
             return frameIndInEdit
 
         takeInd = referenceShot.getParentTakeIndex()
+        if takeInd is None:
+            return frameIndInEdit
         # ignoreDisabled = True
 
         # case where specified shot is disabled -- current shot may not be in the shot list if shotList is not the whole list
@@ -2840,30 +2849,65 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
             return -1
 
         # specified time must be in the range of the specifed shot!!!
-        # get the whole shots list
-        shotList = self.getShotsList(ignoreDisabled=ignoreDisabled, takeIndex=takeInd)
+        # the edit start of each shot is read from the cumulated durations of the take shots index
+        take = self.takes[takeInd]
+        shotsIndex = getShotsIndex(take)
+        shotInd = shotsIndex.getShotIndex(referenceShot)
+        if -1 == shotInd:
+            return frameIndInEdit
 
-        if 0 < len(shotList):
-            if referenceShot.start <= frameIndexIn3DTime and frameIndexIn3DTime <= referenceShot.end:
-                frameIndInEdit = 0
-                shotInd = 0
-                while shotInd < len(shotList) and referenceShot != shotList[shotInd]:
-                    #         print("    While: shotInd: " + str(shotInd) + ", referenceShot: " + str(referenceShot) + ", shotList[shotInd]: " + str(shots[shotInd]))
-                    #         print("    frameIndInEdit: ", frameIndInEdit)
-                    if not ignoreDisabled or shotList[shotInd].enabled:
-                        frameIndInEdit += shotList[shotInd].getDuration()
-                    shotInd += 1
-
-                frameIndInEdit += frameIndexIn3DTime - referenceShot.start
-
-                if "GLOBAL_EDIT" == referenceLevel:
-                    frameIndInEdit += referenceShot.getParentTake().startInGlobalEdit
-                else:
-                    # at take level
-                    frameIndInEdit += self.editStartFrame  # at project level
+        frameIndInEdit = shotsIndex.getEditTime(shotInd, frameIndexIn3DTime, ignoreDisabled=ignoreDisabled)
+        if -1 != frameIndInEdit:
+            frameIndInEdit += self._getEditTimeOffset(take, referenceLevel=referenceLevel)
 
         return frameIndInEdit
 
+    def getEditTimes(self, referenceShot, frameStart, frameEnd, referenceLevel="TAKE", ignoreDisabled=True):
+        """Batch version of getEditTime: return the list of the edit times of all the frames from frameStart
+        to frameEnd, both included. Frames that are out of the range of referenceShot get -1
+        referenceLevel can be "TAKE" or "GLOBAL_EDIT"
+        """
+        numFrames = max(0, frameEnd - frameStart + 1)
+        if referenceShot is None:
+            return [-1] * numFrames
+
+        takeInd = referenceShot.getParentTakeIndex()
+        if takeInd is None:
+            return [-1] * numFrames
+
+        take = self.takes[takeInd]
+        shotsIndex = getShotsIndex(take)
+        shotInd = shotsIndex.getShotIndex(referenceShot)
+        if -1 == shotInd:
+            return [-1] * numFrames
+
+        editTimes = shotsIndex.getEditTimes(shotInd, frameStart, frameEnd, ignoreDisabled=ignoreDisabled)
+        offset = self._getEditTimeOffset(take, referenceLevel=referenceLevel)
+        return [t + offset if -1 != t else -1 for t in editTimes]
+
+    def getShotAndFrameFromEditTime(self, editTime, referenceLevel="TAKE", ignoreDisabled=True, takeIndex=-1):
+        """Inverse of getEditTime: return the tupple (shot, frame in 3D time) corresponding to the specified edit time
+        in the specified take. Return (None, -1) if the edit time is out of the edit
+        referenceLevel can be "TAKE" or "GLOBAL_EDIT"
+        """
+        takeInd = (
+            self.getCurrentTakeIndex()
+            if -1 == takeIndex
+            else (takeIndex if 0 <= takeIndex and takeIndex < len(self.getTakes()) else -1)
+        )
+        if -1 == takeInd:
+            return (None, -1)
+
+        take = self.takes[takeInd]
+        editTimeInTake = editTime - self._getEditTimeOffset(take, referenceLevel=referenceLevel)
+        shotInd, frame = getShotsIndex(take).getShotIndexAndFrameAtEditTime(
+            editTimeInTake, ignoreDisabled=ignoreDisabled
+        )
+        if -1 == shotInd:
+            return (None, -1)
+
+        return (take.shots[shotInd], frame)
+
     def getEditCurrentTime(self, referenceLevel="TAKE", ignoreDisabled=True):
         """Return edit current time in frames, -1 if no shots or if current shot is disabled and ignoreDisabled is True
         works only on current take
@@ -3029,6 +3073,7 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
             shots.move(len(shots) - 1, atValidIndex)
             newShot = shots[atValidIndex]
             newShotInd = atValidIndex
+            invalidateShotsIndices()
 
         if addGreasePencilStoryboard:
             # newShot.addGreasePencil(mode=shotType)
@@ -3193,6 +3238,7 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
             if deleteCamera:
                 self.deleteShotCamera(shots[shotIndex])
             shots.remove(shotIndex)
+            invalidateShotsIndices()
 
     def removeShot(self, shot, deleteCamera=False):
         """Remove the shot from its parent take
@@ -3255,6 +3301,7 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
             # print(f"La: takeInd: {takeInd}, currentTakeInd: {currentTakeInd}, shot Ind: {shotInd}")
             self.removeShot(shot, deleteCamera=deleteCamera)
             shots.remove(shotInd)
+            invalidateShotsIndices()
 
     def moveShotToIndex(self, shot, newIndex):
         """
@@ -3285,6 +3332,7 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
         newInd = min(newInd, len(shots) - 1)
 
         shots.move(shotInd, newInd)
+        invalidateShotsIndices()
 
         # wkipwkipwkip test if shot and current shot are from the same take!!
         # if currentShotInd == shotInd:
@@ -3294,18 +3342,12 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
         return self.getShotByIndex(newInd, takeIndex=takeInd)
 
     def getShotParentTakeIndex(self, shot):
-        for i, take in enumerate(self.takes):
-            for j, sh in enumerate(take.shots):
-                if sh == shot:
-                    return i
-        return None
+        takeInd, _shotInd = getShotOwner(self, shot)
+        return takeInd if -1 != takeInd else None
 
     def getShotParentTake(self, shot):
-        for i, take in enumerate(self.takes):
-            for j, sh in enumerate(take.shots):
-                if sh == shot:
-                    return take
-        return -1
+        takeInd, _shotInd = getShotOwner(self, shot)
+        return self.takes[takeInd] if -1 != takeInd else -1
 
     def getShotIndex(self, shot):
         """Return the shot index in its parent take"""
@@ -3322,11 +3364,8 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
         #     shotInd = -1
 
         # return shotInd
-        for i, take in enumerate(self.takes):
-            for j, sh in enumerate(take.shots):
-                if sh == shot:
-                    return j
-        return -1
+        _takeInd, shotInd = getShotOwner(self, shot)
+        return shotInd
 
     def getShotByIndex(self, shotIndex, ignoreDisabled=False, takeIndex=-1):
         takeInd = (
@@ -3413,6 +3452,34 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
 
         return self.takes[takeInd].getNumShots(ignoreDisabled=ignoreDisabled)
 
+    def getShotsIndex(self, takeIndex=-1):
+        """Return the sorted interval index of the shots of the specified take, None if the take is not valid
+        The index is cached and rebuilt only when a shot range, enabled state or order has changed
+        """
+        takeInd = (
+            self.getCurrentTakeIndex()
+            if -1 == takeIndex
+            else (takeIndex if 0 <= takeIndex and takeIndex < len(self.getTakes()) else -1)
+        )
+        if -1 == takeInd:
+            return None
+
+        return getShotsIndex(self.takes[takeInd])
+
+    def getCamerasIndex(self, takeIndex=-1):
+        """Return the index of the cameras used by the shots of the specified take, None if the take is not valid
+        The index is cached and rebuilt only when the shots, their cameras or the scene objects have changed
+        """
+        takeInd = (
+            self.getCurrentTakeIndex()
+            if -1 == takeIndex
+            else (takeIndex if 0 <= takeIndex and takeIndex < len(self.getTakes()) else -1)
+        )
+        if -1 == takeInd:
+            return None
+
+        return getCamerasIndex(self.takes[takeInd])
+
     def getCurrentShotIndex(self, ignoreDisabled=False, takeIndex=-1):
         """Return the index of the current shot in the enabled shot list of the current take
         Use this function instead of a direct call to self.current_shot_index
@@ -3704,15 +3771,7 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
         if -1 == takeInd:
             return previousShotInd
 
-        shotList = self.getShotsList(takeIndex=takeIndex)
-
-        previousShotInd = currentShotIndex - 1
-        isPreviousFound = shotList[previousShotInd].enabled
-        while 0 <= previousShotInd and not isPreviousFound:
-            previousShotInd -= 1
-            isPreviousFound = shotList[previousShotInd].enabled
-
-        return previousShotInd
+        return getShotsIndex(self.takes[takeInd]).getPreviousEnabledShotIndex(currentShotIndex)
 
     # currentShotIndex is given in the WHOLE list of shots (including disabled)
     # returns the index of the next enabled shot in the WHOLE list, -1 if none
@@ -3726,43 +3785,17 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
         if -1 == takeInd:
             return nextShotInd
 
-        shotList = self.getShotsList(takeIndex=takeIndex)
-
-        nextShotInd = currentShotIndex + 1
-        if len(shotList) > nextShotInd:
-            isNextFound = shotList[nextShotInd].enabled
-            while len(shotList) > nextShotInd and not isNextFound:
-                nextShotInd += 1
-                if len(shotList) > nextShotInd:
-                    isNextFound = shotList[nextShotInd].enabled
-
-        if len(shotList) <= nextShotInd:
-            nextShotInd = -1
-
-        return nextShotInd
+        return getShotsIndex(self.takes[takeInd]).getNextEnabledShotIndex(currentShotIndex)
 
     # works only on current take
     # TODO make this function work for any take
     def getFirstShotIndexContainingFrame(self, frameIndex, ignoreDisabled=False):
         """Return the first shot containing the specifed frame, -1 if not found"""
-        firstShotInd = -1
-
-        shotList = self.get_shots()
-        shotFound = False
-
-        if len(shotList):
-            firstShotInd = 0
-            while firstShotInd < len(shotList) and not shotFound:
-                if not ignoreDisabled or shotList[firstShotInd].enabled:
-                    shotFound = shotList[firstShotInd].start <= frameIndex and frameIndex <= shotList[firstShotInd].end
-                firstShotInd += 1
-
-        if shotFound:
-            firstShotInd = firstShotInd - 1
-        else:
-            firstShotInd = -1
+        shotsIndex = self.getShotsIndex()
+        if shotsIndex is None:
+            return -1
 
-        return firstShotInd
+        return shotsIndex.getFirstShotIndexContainingFrame(frameIndex, ignoreDisabled=ignoreDisabled)
 
     # works only on current take
     # TODO make this function work for any take
@@ -3770,24 +3803,11 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
         """Return the first shot before the specifed frame (supposing thanks to getFirstShotIndexContainingFrame than
         frameIndex is not in a shot), -1 if not found
         """
-        firstShotInd = -1
-
-        shotList = self.get_shots()
-        shotFound = False
-
-        if len(shotList):
-            firstShotInd = len(shotList) - 1
-            while 0 <= firstShotInd and not shotFound:
-                if not ignoreDisabled or shotList[firstShotInd].enabled:
-                    shotFound = shotList[firstShotInd].end < frameIndex
-                firstShotInd -= 1
+        shotsIndex = self.getShotsIndex()
+        if shotsIndex is None:
+            return -1
 
-        if shotFound:
-            firstShotInd = firstShotInd + 1
-        else:
-            firstShotInd = -1
-
-        return firstShotInd
+        return shotsIndex.getFirstShotIndexBeforeFrame(frameIndex, ignoreDisabled=ignoreDisabled)
 
     # works only on current take
     # TODO make this function work for any take
@@ -3795,24 +3815,21 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
         """Return the first shot after the specifed frame (supposing thanks to getFirstShotIndexContainingFrame than
         frameIndex is not in a shot), -1 if not found
         """
-        firstShotInd = -1
-
-        shotList = self.get_shots()
-        shotFound = False
+        shotsIndex = self.getShotsIndex()
+        if shotsIndex is None:
+            return -1
 
-        if len(shotList):
-            firstShotInd = 0
-            while firstShotInd < len(shotList) and not shotFound:
-                if not ignoreDisabled or shotList[firstShotInd].enabled:
-                    shotFound = frameIndex < shotList[firstShotInd].start
-                firstShotInd += 1
+        return shotsIndex.getFirstShotIndexAfterFrame(frameIndex, ignoreDisabled=ignoreDisabled)
 
-        if shotFound:
-            firstShotInd = firstShotInd - 1
-        else:
-            firstShotInd = -1
+    def getShotsIndicesOverlappingRange(self, rangeStart, rangeEnd, ignoreDisabled=False, takeIndex=-1):
+        """Return the indices of the shots overlapping the specified frame range, limits included,
+        sorted by their order in the take
+        """
+        shotsIndex = self.getShotsIndex(takeIndex=takeIndex)
+        if shotsIndex is None:
+            return []
 
-        return firstShotInd
+        return shotsIndex.getShotsIndicesOverlappingRange(rangeStart, rangeEnd, ignoreDisabled=ignoreDisabled)
 
     #############################################
     # shot cameras
@@ -3858,7 +3875,7 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
         if -1 == takeInd:
             return shotList
 
-        return self.takes[takeInd].getShotsUsingCamera(cam, ignoreDisabled=ignoreDisabled)
+        return getCamerasIndex(self.takes[takeInd]).getShotsUsingCamera(cam, ignoreDisabled=ignoreDisabled)
 
     def getShotsSharingCamera(self, cam, ignoreDisabled=False, takeIndex=-1, inAllTakes=True):
         """Return a dictionary with all the shots using the specified camera in the specified takes
@@ -4170,9 +4187,13 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
         """
         # print(" ** -- ** goToPreviousShotBoundary")
 
-        if not len(self.get_shots()):
+        shotList = self.get_shots()
+        if not len(shotList):
             return ()
 
+        # bounds and enabled states are read from the take interval index instead of the shots
+        shotsIndex = self.getShotsIndex()
+
         previousShotInd = -1
         newFrame = currentFrame
 
@@ -4181,14 +4202,14 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
         if "ANY" == boundaryMode:
             # get current shot in the WHOLE list (= even disabled)
             currentShotInd = self.getCurrentShotIndex()
-            currentShot = self.getShotByIndex(currentShotInd)
+            currentShot = shotList[currentShotInd]
             # _logger.debug_ext(f"    current Shot: {currentShotInd}")
             if not currentShot.enabled:
                 print("    current Shot is disabled")
                 previousShotInd = self.getPreviousEnabledShotIndex(currentShotInd)
                 if -1 < previousShotInd:
                     #        print("    previous Shot ind is ", previousShotInd)
-                    newFrame = self.getShotByIndex(previousShotInd).end
+                    newFrame = shotsIndex.ends[previousShotInd]
             else:
                 #    print("    current Shot is ENabled")
                 if currentFrame == currentShot.start:
@@ -4196,7 +4217,7 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
                     previousShotInd = self.getPreviousEnabledShotIndex(currentShotInd)
                     if -1 < previousShotInd:
                         #            print("      previous Shot ind is ", previousShotInd)
-                        newFrame = self.getShotByIndex(previousShotInd).end
+                        newFrame = shotsIndex.ends[previousShotInd]
                     else:  # case of the very first shot
                         previousShotInd = currentShotInd
                         newFrame = currentFrame
@@ -4210,21 +4231,21 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
         elif "START" == boundaryMode:
             # get current shot in the WHOLE list (= even disabled)
             currentShotInd = self.getCurrentShotIndex()
-            currentShot = self.getShotByIndex(currentShotInd)
+            currentShot = shotList[currentShotInd]
             # print("    current Shot: ", currentShotInd)
             if not currentShot.enabled:
                 # print("    current Shot is disabled")
                 previousShotInd = self.getPreviousEnabledShotIndex(currentShotInd)
                 if -1 < previousShotInd:
                     #     print("    previous Shot ind is ", previousShotInd)
-                    newFrame = self.getShotByIndex(previousShotInd).start
+                    newFrame = shotsIndex.starts[previousShotInd]
             else:
                 # print("    current Shot is ENabled")
 
                 previousShotInd = self.getPreviousEnabledShotIndex(currentShotInd)
                 if -1 < previousShotInd:
                     #   print("      previous Shot ind is ", previousShotInd)
-                    newFrame = self.getShotByIndex(previousShotInd).start
+                    newFrame = shotsIndex.starts[previousShotInd]
                 else:  # case of the very first shot
                     previousShotInd = currentShotInd
                     newFrame = currentFrame
@@ -4232,14 +4253,14 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
         elif "END" == boundaryMode:
             # get current shot in the WHOLE list (= even disabled)
             currentShotInd = self.getCurrentShotIndex()
-            currentShot = self.getShotByIndex(currentShotInd)
+            currentShot = shotList[currentShotInd]
             #  print("    current Shot: ", currentShotInd)
             if not currentShot.enabled:
                 #     print("    current Shot is disabled")
                 previousShotInd = self.getPreviousEnabledShotIndex(currentShotInd)
                 if -1 < previousShotInd:
                     #        print("    previous Shot ind is ", previousShotInd)
-                    newFrame = self.getShotByIndex(previousShotInd).end
+                    newFrame = shotsIndex.ends[previousShotInd]
             else:
                 #   print("    current Shot is ENabled")
                 # if currentFrame == currentShot.start:
@@ -4247,7 +4268,7 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
                 previousShotInd = self.getPreviousEnabledShotIndex(currentShotInd)
                 if -1 < previousShotInd:
                     #     print("      previous Shot ind is ", previousShotInd)
-                    newFrame = self.getShotByIndex(previousShotInd).end
+                    newFrame = shotsIndex.ends[previousShotInd]
                 else:  # case of the very first shot
                     previousShotInd = currentShotInd
                     newFrame = currentFrame
@@ -4267,9 +4288,13 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
     # works only on current take
     def goToNextShotBoundary(self, currentFrame, ignoreDisabled=False, boundaryMode="ANY"):
         # print(" ** -- ** goToNextShotBoundary")
-        if not len(self.get_shots()):
+        shotList = self.get_shots()
+        if not len(shotList):
             return ()
 
+        # bounds and enabled states are read from the take interval index instead of the shots
+        shotsIndex = self.getShotsIndex()
+
         #   nextShot = None
         nextShotInd = -1
         newFrame = currentFrame
@@ -4280,14 +4305,14 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
         if "ANY" == boundaryMode:
             # get current shot in the WHOLE list (= even disabled)
             currentShotInd = self.getCurrentShotIndex()
-            currentShot = self.getShotByIndex(currentShotInd)
+            currentShot = shotList[currentShotInd]
             #    print("    current Shot: ", currentShotInd)
             if not currentShot.enabled:
                 #       print("    current Shot is disabled")
                 nextShotInd = self.getNextEnabledShotIndex(currentShotInd)
                 if -1 < nextShotInd:
                     #          print("    next Shot ind is ", nextShotInd)
-                    newFrame = self.getShotByIndex(nextShotInd).start
+                    newFrame = shotsIndex.starts[nextShotInd]
             else:
                 #     print("    current Shot is ENabled")
                 if currentFrame == currentShot.end:
@@ -4295,7 +4320,7 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
                     nextShotInd = self.getNextEnabledShotIndex(currentShotInd)
                     if -1 < nextShotInd:
                         #         print("      next Shot ind is ", nextShotInd)
-                        newFrame = self.getShotByIndex(nextShotInd).start
+                        newFrame = shotsIndex.starts[nextShotInd]
                     else:  # case of the very last shot
                         nextShotInd = currentShotInd
                         newFrame = currentFrame
@@ -4309,14 +4334,14 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
         elif "START" == boundaryMode:
             # get current shot in the WHOLE list (= even disabled)
             currentShotInd = self.getCurrentShotIndex()
-            currentShot = self.getShotByIndex(currentShotInd)
+            currentShot = shotList[currentShotInd]
             #    print("    current Shot: ", currentShotInd)
             if not currentShot.enabled:
                 #        print("    current Shot is disabled")
                 nextShotInd = self.getNextEnabledShotIndex(currentShotInd)
                 if -1 < nextShotInd:
                     #           print("    next Shot ind is ", nextShotInd)
-                    newFrame = self.getShotByIndex(nextShotInd).start
+                    newFrame = shotsIndex.starts[nextShotInd]
             else:
                 #      print("    current Shot is ENabled")
                 # if currentFrame == currentShot.end:
@@ -4324,7 +4349,7 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
                 nextShotInd = self.getNextEnabledShotIndex(currentShotInd)
                 if -1 < nextShotInd:
                     #         print("      next Shot ind is ", nextShotInd)
-                    newFrame = self.getShotByIndex(nextShotInd).start
+                    newFrame = shotsIndex.starts[nextShotInd]
                 else:  # case of the very last shot
                     nextShotInd = currentShotInd
                     newFrame = currentFrame
@@ -4332,14 +4357,14 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
         elif "END" == boundaryMode:
             # get current shot in the WHOLE list (= even disabled)
             currentShotInd = self.getCurrentShotIndex()
-            currentShot = self.getShotByIndex(currentShotInd)
+            currentShot = shotList[currentShotInd]
             # print("    current Shot: ", currentShotInd)
             if not currentShot.enabled:
                 #    print("    current Shot is disabled")
                 nextShotInd = self.getNextEnabledShotIndex(currentShotInd)
                 if -1 < nextShotInd:
                     #       print("    next Shot ind is ", nextShotInd)
-                    newFrame = self.getShotByIndex(nextShotInd).end
+                    newFrame = shotsIndex.ends[nextShotInd]
             else:
                 #    print("    current Shot is ENabled")
                 if currentFrame == currentShot.end:
@@ -4347,7 +4372,7 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
                     nextShotInd = self.getNextEnabledShotIndex(currentShotInd)
                     if -1 < nextShotInd:
                         #          print("      next Shot ind is ", nextShotInd)
-                        newFrame = self.getShotByIndex(nextShotInd).end
+                        newFrame = shotsIndex.ends[nextShotInd]
                     else:  # case of the very last shot
                         nextShotInd = currentShotInd
                         newFrame = currentFrame
@@ -41,6 +41,8 @@ from shotmanager.features.greasepencil import greasepencil as gp
 from shotmanager.utils import utils
 from shotmanager.utils import utils_greasepencil
 from .montage_interface import ShotInterface
+from .shots_index import invalidateShotsIndices
+from .cameras_index import invalidateCamerasIndices
 
 from shotmanager.config import config
 from shotmanager.config import sm_logging
@@ -162,6 +164,7 @@ class UAS_ShotManager_Shot(ShotInterface, PropertyGroup):
     name: StringProperty(name="Name", get=_get_name, set=_set_name)
 
     def _update_enabled(self, context):
+        invalidateShotsIndices()
         self.selectShotInUI()
 
     enabled: BoolProperty(
@@ -209,6 +212,7 @@ class UAS_ShotManager_Shot(ShotInterface, PropertyGroup):
                 self["start"] = self.end
 
     def _update_start(self, context):
+        invalidateShotsIndices()
         self.selectShotInUI()
         self.updateClipLinkToShotStart()
         config.gRedrawShotStack = True
@@ -245,6 +249,7 @@ class UAS_ShotManager_Shot(ShotInterface, PropertyGroup):
                 self["end"] = self.start
 
     def _update_end(self, context):
+        invalidateShotsIndices()
         self.selectShotInUI()
         config.gRedrawShotStack = True
 
@@ -334,12 +339,16 @@ class UAS_ShotManager_Shot(ShotInterface, PropertyGroup):
         else:
             return False
 
+    def _update_camera(self, context):
+        invalidateCamerasIndices()
+
     camera: PointerProperty(
         name="Camera",
         description="Select a Camera",
         type=bpy.types.Object,
         # poll=lambda self, obj: True if obj.type == "CAMERA" else False,
         poll=_filter_cameras,
+        update=_update_camera,
     )
 
     def setCamera(self, newCamera):
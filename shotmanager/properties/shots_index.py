@@ -0,0 +1,326 @@
+# GPLv3 License
+#
+# Copyright (C) 2021 Ubisoft
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Sorted interval index of the shots of a take, used to answer the frame to shot queries in O(log n)
+
+The index is a plain Python snapshot of the start, end and enabled state of the shots of a take,
+completed by the cumulative durations of the shots used for the edit time conversions.
+It is cached per take and rebuilt only after a call to invalidateShotsIndices(), which is done
+when the range, the enabled state or the order of the shots change, and on undo, redo and file load.
+
+The module also keeps the owner of every shot, as a (take index, shot index) tupple, to find the parent take
+of a shot without scanning all the takes.
+"""
+
+from bisect import bisect_left, bisect_right
+
+from shotmanager.config import sm_logging
+
+_logger = sm_logging.getLogger(__name__)
+
+
+# cached indices, keyed by the pointer of the take
+_shotsIndices = dict()
+
+
+def getShotsIndex(take):
+    """Return the interval index of the shots of the specified take, rebuilt if needed"""
+    key = take.as_pointer()
+    index = _shotsIndices.get(key, None)
+
+    # the shots count is a cheap guard against additions or removals done without invalidation
+    if index is None or index.numShots != len(take.shots):
+        index = ShotsIndex(take.shots)
+        _shotsIndices[key] = index
+    return index
+
+
+def invalidateShotsIndices():
+    """Discard all the cached shots indices. To call every time a shot range, enabled state or order is
+    modified, or when a take is added, moved or removed
+    """
+    _shotsIndices.clear()
+    _shotOwnersIndices.clear()
+
+
+# cached owners of the shots of all the takes, keyed by the pointer of the props.
+# Each value is the tupple (numbers of shots of the takes, owners by shot pointer)
+_shotOwnersIndices = dict()
+
+
+def _getTakesSizes(takes):
+    return tuple(len(take.shots) for take in takes)
+
+
+def _buildShotOwners(takes):
+    owners = dict()
+    for takeInd, take in enumerate(takes):
+        for shotInd, shot in enumerate(take.shots):
+            owners[shot.as_pointer()] = (takeInd, shotInd)
+    return owners
+
+
+def getShotOwner(props, shot):
+    """Return the tupple (take index, shot index in the take) of the specified shot, (-1, -1) if not found
+    The cached owner is checked before being returned so an obsolete cache is rebuilt on the fly.
+    A shot not found in the cache is not searched again as long as the numbers of shots of the takes are
+    the same as when the cache was built
+    """
+    if shot is None:
+        return (-1, -1)
+
+    key = props.as_pointer()
+    shotKey = shot.as_pointer()
+    cached = _shotOwnersIndices.get(key, None)
+
+    if cached is not None:
+        takesSizes, owners = cached
+        owner = owners.get(shotKey, None)
+        if owner is not None:
+            takeInd, shotInd = owner
+            if (
+                takeInd < len(props.takes)
+                and shotInd < len(props.takes[takeInd].shots)
+                and props.takes[takeInd].shots[shotInd] == shot
+            ):
+                return owner
+        elif takesSizes == _getTakesSizes(props.takes):
+            return (-1, -1)
+
+    owners = _buildShotOwners(props.takes)
+    _shotOwnersIndices[key] = (_getTakesSizes(props.takes), owners)
+    return owners.get(shotKey, (-1, -1))
+
+
+class _FrameLookup:
+    """Frame queries over a subset of the shots of a take (either all the shots or only the enabled ones)
+    Indices returned are always the indices of the shots in the WHOLE list of the take
+    """
+
+    def __init__(self, shotIndices, starts, ends):
+        self.shotIndices = shotIndices
+
+        # shots sorted by start, with the suffix minimum of their index in the take
+        byStart = sorted(shotIndices, key=lambda i: starts[i])
+        self.sortedStarts = [starts[i] for i in byStart]
+        self.byStart = byStart
+        self.suffixMinIndex = [-1] * (len(byStart) + 1)
+        for k in range(len(byStart) - 1, -1, -1):
+            nextMin = self.suffixMinIndex[k + 1]
+            self.suffixMinIndex[k] = byStart[k] if -1 == nextMin else min(byStart[k], nextMin)
+
+        # shots sorted by end, with the prefix maximum of their index in the take
+        byEnd = sorted(shotIndices, key=lambda i: ends[i])
+        self.sortedEnds = [ends[i] for i in byEnd]
+        self.prefixMaxIndex = [-1] * len(byEnd)
+        for k, i in enumerate(byEnd):
+            self.prefixMaxIndex[k] = i if 0 == k else max(i, self.prefixMaxIndex[k - 1])
+
+        # elementary segments: the timeline is split at every shot start and every shot end + 1.
+        # For each segment we store the indices of the shots covering it, sorted by take order.
+        # Shots in an edit seldom overlap a lot so the storage stays close to the number of shots.
+        events = dict()
+        for i in shotIndices:
+            events.setdefault(starts[i], ([], []))[0].append(i)
+            events.setdefault(ends[i] + 1, ([], []))[1].append(i)
+
+        self.segmentBounds = sorted(events.keys())
+        self.segmentShots = []
+        active = set()
+        for bound in self.segmentBounds:
+            added, removed = events[bound]
+            active.difference_update(removed)
+            active.update(added)
+            self.segmentShots.append(tuple(sorted(active)))
+
+    def shotsAtFrame(self, frame):
+        """Return the indices of the shots containing the specified frame, sorted by take order"""
+        segInd = bisect_right(self.segmentBounds, frame) - 1
+        if 0 > segInd:
+            return ()
+        return self.segmentShots[segInd]
+
+    def firstShotContainingFrame(self, frame):
+        shots = self.shotsAtFrame(frame)
+        return shots[0] if len(shots) else -1
+
+    def lastShotEndingBeforeFrame(self, frame):
+        """Return the index of the last shot in the take order with an end strictly lower than frame, -1 if none"""
+        numBefore = bisect_left(self.sortedEnds, frame)
+        return self.prefixMaxIndex[numBefore - 1] if 0 < numBefore else -1
+
+    def firstShotStartingAfterFrame(self, frame):
+        """Return the index of the first shot in the take order with a start strictly greater than frame, -1 if none"""
+        numNotAfter = bisect_right(self.sortedStarts, frame)
+        return self.suffixMinIndex[numNotAfter]
+
+    def shotsOverlappingRange(self, rangeStart, rangeEnd):
+        """Return the indices of the shots overlapping [rangeStart, rangeEnd] (included), sorted by take order"""
+        if rangeEnd < rangeStart:
+            return []
+        # shots covering the range start, then the ones starting inside the range
+        shots = set(self.shotsAtFrame(rangeStart))
+        first = bisect_right(self.sortedStarts, rangeStart)
+        last = bisect_right(self.sortedStarts, rangeEnd)
+        shots.update(self.byStart[first:last])
+        return sorted(shots)
+
+
+class ShotsIndex:
+    """Snapshot of the start, end and enabled state of the shots of a take, with sorted lookups
+
+    Do not keep a reference to an instance across operators: use getShotsIndex(take) instead to get
+    an up to date index.
+    """
+
+    def __init__(self, shots):
+        self.numShots = len(shots)
+        self.starts = [0] * self.numShots
+        self.ends = [0] * self.numShots
+        self.enabled = [True] * self.numShots
+        self.shotIndicesByPointer = dict()
+        for i, shot in enumerate(shots):
+            self.starts[i] = shot.start
+            self.ends[i] = shot.end
+            self.enabled[i] = shot.enabled
+            self.shotIndicesByPointer[shot.as_pointer()] = i
+
+        self.allIndices = list(range(self.numShots))
+        self.enabledIndices = [i for i in self.allIndices if self.enabled[i]]
+
+        self._lookups = {
+            False: _FrameLookup(self.allIndices, self.starts, self.ends),
+            True: _FrameLookup(self.enabledIndices, self.starts, self.ends),
+        }
+
+        # edit start of each shot, relative to the start of the edit, and the edit duration as last item.
+        # When disabled shots are ignored they have a null duration in the edit
+        self._editStarts = dict()
+        self._editStartsInEdit = dict()
+        for ignoreDisabled in (False, True):
+            editStarts = [0] * (self.numShots + 1)
+            for i in self.allIndices:
+                duration = self.ends[i] - self.starts[i] + 1
+                editStarts[i + 1] = editStarts[i] + (duration if not ignoreDisabled or self.enabled[i] else 0)
+            self._editStarts[ignoreDisabled] = editStarts
+            # edit starts of the shots belonging to the edit only, strictly increasing
+            self._editStartsInEdit[ignoreDisabled] = [editStarts[i] for i in self._getModeIndices(ignoreDisabled)]
+
+    def _getLookup(self, ignoreDisabled):
+        return self._lookups[bool(ignoreDisabled)]
+
+    def _getModeIndices(self, ignoreDisabled):
+        return self.enabledIndices if ignoreDisabled else self.allIndices
+
+    def getShotIndex(self, shot):
+        """Return the index of the shot in the take, -1 if the shot is not in the take"""
+        return self.shotIndicesByPointer.get(shot.as_pointer(), -1)
+
+    ####################
+    # take order
+    ####################
+
+    def getFirstEnabledShotIndex(self):
+        return self.enabledIndices[0] if len(self.enabledIndices) else -1
+
+    def getLastEnabledShotIndex(self):
+        return self.enabledIndices[-1] if len(self.enabledIndices) else -1
+
+    def getPreviousEnabledShotIndex(self, shotIndex):
+        """Return the index of the previous enabled shot in the WHOLE list, -1 if none"""
+        k = bisect_left(self.enabledIndices, shotIndex)
+        return self.enabledIndices[k - 1] if 0 < k else -1
+
+    def getNextEnabledShotIndex(self, shotIndex):
+        """Return the index of the next enabled shot in the WHOLE list, -1 if none"""
+        k = bisect_right(self.enabledIndices, shotIndex)
+        return self.enabledIndices[k] if k < len(self.enabledIndices) else -1
+
+    ####################
+    # frames
+    ####################
+
+    def getShotsIndicesAtFrame(self, frame, ignoreDisabled=False):
+        """Return the indices of the shots containing the specified frame, sorted by take order"""
+        return list(self._getLookup(ignoreDisabled).shotsAtFrame(frame))
+
+    def getFirstShotIndexContainingFrame(self, frame, ignoreDisabled=False):
+        """Return the index of the first shot containing the specifed frame, -1 if not found"""
+        return self._getLookup(ignoreDisabled).firstShotContainingFrame(frame)
+
+    def getFirstShotIndexBeforeFrame(self, frame, ignoreDisabled=False):
+        """Return the index of the last shot in the take order ending before the specifed frame, -1 if not found"""
+        return self._getLookup(ignoreDisabled).lastShotEndingBeforeFrame(frame)
+
+    def getFirstShotIndexAfterFrame(self, frame, ignoreDisabled=False):
+        """Return the index of the first shot in the take order starting after the specifed frame, -1 if not found"""
+        return self._getLookup(ignoreDisabled).firstShotStartingAfterFrame(frame)
+
+    def getShotsIndicesOverlappingRange(self, rangeStart, rangeEnd, ignoreDisabled=False):
+        """Return the indices of the shots overlapping the specified range, limits included, sorted by take order"""
+        return self._getLookup(ignoreDisabled).shotsOverlappingRange(rangeStart, rangeEnd)
+
+    ####################
+    # edit
+    ####################
+
+    def getEditDuration(self, ignoreDisabled=True):
+        """Return the edit duration in frames, -1 if there is no shots to consider"""
+        if not len(self._getModeIndices(ignoreDisabled)):
+            return -1
+        return self._editStarts[bool(ignoreDisabled)][self.numShots]
+
+    def getShotEditStart(self, shotIndex, ignoreDisabled=True):
+        """Return the edit time of the first frame of the shot, relative to the start of the edit"""
+        return self._editStarts[bool(ignoreDisabled)][shotIndex]
+
+    def getEditTime(self, shotIndex, frameIndexIn3DTime, ignoreDisabled=True):
+        """Return the edit time of the frame of the shot, relative to the start of the edit,
+        -1 if the frame is not in the shot range or if the shot is ignored
+        """
+        if ignoreDisabled and not self.enabled[shotIndex]:
+            return -1
+        if not (self.starts[shotIndex] <= frameIndexIn3DTime <= self.ends[shotIndex]):
+            return -1
+        return self._editStarts[bool(ignoreDisabled)][shotIndex] + frameIndexIn3DTime - self.starts[shotIndex]
+
+    def getEditTimes(self, shotIndex, frameStart, frameEnd, ignoreDisabled=True):
+        """Return the list of the edit times of the frames in [frameStart, frameEnd], limits included,
+        relative to the start of the edit. Frames that are not in the shot range get -1
+        """
+        if ignoreDisabled and not self.enabled[shotIndex]:
+            return [-1] * max(0, frameEnd - frameStart + 1)
+
+        shotStart = self.starts[shotIndex]
+        shotEnd = self.ends[shotIndex]
+        offset = self._editStarts[bool(ignoreDisabled)][shotIndex] - shotStart
+        return [f + offset if shotStart <= f <= shotEnd else -1 for f in range(frameStart, frameEnd + 1)]
+
+    def getShotIndexAndFrameAtEditTime(self, editTime, ignoreDisabled=True):
+        """Return the tupple (shot index, frame in 3D time) corresponding to the edit time, relative to the start
+        of the edit. Return (-1, -1) if the edit time is out of the edit
+        """
+        modeIndices = self._getModeIndices(ignoreDisabled)
+        editStarts = self._editStarts[bool(ignoreDisabled)]
+        if not len(modeIndices) or editTime < 0 or editStarts[self.numShots] <= editTime:
+            return (-1, -1)
+
+        # only the shots in the edit are searched since the ignored ones have no duration
+        k = bisect_right(self._editStartsInEdit[bool(ignoreDisabled)], editTime) - 1
+        shotInd = modeIndices[k]
+        return (shotInd, self.starts[shotInd] + editTime - editStarts[shotInd])
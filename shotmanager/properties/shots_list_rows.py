@@ -0,0 +1,101 @@
+# GPLv3 License
+#
+# Copyright (C) 2021 Ubisoft
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Row model of the shots list, used by the draw_item() functions of the shots UI lists
+
+The values of the rows that depend on the other shots, such as the number of shots sharing the camera of
+a shot in all the takes or the edit times of the shots, are computed for all the shots of the take when the
+first row is drawn. The model is reused by the other rows and by the next redraws as long as its generation
+is the current one. The generation is made of the cameras indices of all the takes, which are new instances
+each time the shots ranges, order, enabled states or cameras change, and of the edit start frame.
+"""
+
+from .cameras_index import getCamerasIndex
+
+from shotmanager.config import sm_logging
+
+_logger = sm_logging.getLogger(__name__)
+
+
+# cached row models, keyed by the pointer of the take
+_shotsListRows = dict()
+
+
+def getShotsListRows(props, take):
+    """Return the row model of the shots list of the specified take, rebuilt if needed"""
+    key = take.as_pointer()
+    camerasIndices = [getCamerasIndex(t) for t in props.takes]
+    rows = _shotsListRows.get(key, None)
+
+    if rows is None or not rows.isCurrentGeneration(camerasIndices, props.editStartFrame):
+        rows = ShotsListRows(take, camerasIndices, props.editStartFrame)
+        _shotsListRows[key] = rows
+    return rows
+
+
+class ShotsListRows:
+    """Values displayed in the rows of the shots list of a take, by shot index
+
+    Do not keep a reference to an instance across redraws: use getShotsListRows(props, take) instead to get
+    an up to date model.
+    """
+
+    def __init__(self, take, camerasIndices, editStartFrame):
+        self.camerasIndices = camerasIndices
+        self.editStartFrame = editStartFrame
+
+        # the cached index of the take, also in camerasIndices
+        camerasIndex = getCamerasIndex(take)
+
+        # number of shots using each camera, in all the takes
+        camerasUsage = dict()
+        for camIndex in camerasIndices:
+            for cam in camIndex.cameras:
+                camKey = cam.as_pointer()
+                camerasUsage[camKey] = camerasUsage.get(camKey, 0) + len(camIndex.getShotsUsingCamera(cam))
+
+        shots = take.shots
+        shotsIndex = camerasIndex.shotsIndex
+        numShots = len(shots)
+        self.numSharedCameras = [0] * numShots
+        self.editStarts = [-1] * numShots
+        self.editEnds = [-1] * numShots
+        self.greasePencilChildren = [None] * numShots
+        self.takeContainsSharedCameras = False
+
+        for i, shot in enumerate(shots):
+            cam = shot.camera
+            if cam is not None:
+                self.numSharedCameras[i] = camerasUsage.get(cam.as_pointer(), 0)
+                self.greasePencilChildren[i] = camerasIndex.getGreasePencilChild(cam)
+                if shot.enabled and 1 < self.numSharedCameras[i]:
+                    self.takeContainsSharedCameras = True
+
+            # same as shot.getEditStart() and shot.getEditEnd()
+            editStart = shotsIndex.getEditTime(i, shotsIndex.starts[i])
+            self.editStarts[i] = editStart + editStartFrame if -1 != editStart else -1
+            editEnd = shotsIndex.getEditTime(i, shotsIndex.ends[i])
+            self.editEnds[i] = editEnd + editStartFrame if -1 != editEnd else -1
+
+    def isCurrentGeneration(self, camerasIndices, editStartFrame):
+        if editStartFrame != self.editStartFrame or len(camerasIndices) != len(self.camerasIndices):
+            return False
+        for camIndex, rowsCamIndex in zip(camerasIndices, self.camerasIndices):
+            if camIndex is not rowsCamIndex:
+                return False
+        return True
@@ -30,6 +30,8 @@ import time
 import bpy
 
 from shotmanager.rendering.rendering_stampinfo import setStampInfoSettings, renderStampedInfoForShot
+from shotmanager.rendering.rendering_manifest import RenderManifest, ShotFingerprinter
+from shotmanager.rendering.rendering_paths import OutputPathsSession
 from shotmanager.rendering import rendering_functions
 
 from shotmanager.utils import utils
@@ -51,6 +53,7 @@ def launchRenderWithVSEComposite(
     filePath="",
     stampInfoCustomSettingsDict=None,
     rerenderExistingShotVideos=True,
+    rerenderChangedShotsOnly=False,
     generateSequenceVideo=True,
     generateShotVideos=True,
     specificShotList=None,
@@ -69,7 +72,10 @@ def launchRenderWithVSEComposite(
 
     Args:
         filesDict (dict)= {"rendered_files": newMediaFiles, "failed_files": failedFiles}
+                            "output_files_manifest" is the path of the json file listing the produced files
         specificFrame (int): When specified, only this frame is rendered. Handles are ignored and the resulting media in an image, not a video
+        rerenderChangedShotsOnly (bool): When set to True, the existing shot videos are re-rendered only if the shot
+                                changed since their rendering. Not used with specificFrame
         fileListOnly (bool):    When set to True, no rendering nor change in the scene are done, the function just
                                 returns the list of the files to generate
     """
@@ -196,6 +202,11 @@ def launchRenderWithVSEComposite(
         renderFrameByFrame = False  # wkip crash a la génération du son si mode framebyframe...
         renderWithOpengl = True
 
+    # OpenGL rendering requires a window, the render engine is used instead in background mode
+    if renderWithOpengl and bpy.app.background:
+        _logger.warning_ext("OpenGL rendering is not available in background mode, the render engine is used instead")
+        renderWithOpengl = False
+
     #######################
     # store current scene settings
     #######################
@@ -203,7 +214,7 @@ def launchRenderWithVSEComposite(
     # NOTE: The opengl render function renders only overlays from the viewport from where the render was called.
     # It is currently not possible to specify the source viewport. SM cannot then use its target viewport.
     # renderViewport = props.getValidTargetViewport(context)
-    renderViewport = utils.getCurrentViewport(context)
+    renderViewport = utils.getCurrentViewport(context) if context.screen is not None else None
     userRenderSettings = utilsStore.storeUserRenderSettings(context, userRenderSettings, renderViewport)
 
     #######################
@@ -388,6 +399,16 @@ def launchRenderWithVSEComposite(
     startFrameInEdit = -1
     startShot = None
 
+    # the fingerprints of the shots are computed once all the render settings are applied
+    renderManifest = None
+    shotFingerprinter = None
+    if rerenderChangedShotsOnly and generateShotVideos and specificFrame is None and not fileListOnly:
+        renderManifest = RenderManifest(rootPath)
+        shotFingerprinter = ShotFingerprinter(scene, props, renderPreset, stampInfoSettings=stampInfoSettings)
+
+    # output paths of the frames compiled once per shot, and list of the produced files
+    pathsSession = OutputPathsSession(props, take, rootPath)
+
     for i, shot in enumerate(shotList):
         if 0 == i:
             startFrameIn3D = shot.start
@@ -409,6 +430,7 @@ def launchRenderWithVSEComposite(
         )
 
         newMediaFiles.append(compositedMediaPath)
+        pathsSession.addFile("SH_VIDEO", shot, compositedMediaPath)
         if shot.enabled:
             sequenceFiles.append(compositedMediaPath)
 
@@ -417,6 +439,15 @@ def launchRenderWithVSEComposite(
                 print(f" - File {Path(compositedMediaPath).name} already computed")
                 continue
 
+        shotFingerprint = None
+        if shotFingerprinter is not None:
+            shotRenderStart = shot.start - handles if renderHandles else shot.start
+            shotRenderEnd = shot.end + handles if renderHandles else shot.end
+            shotFingerprint = shotFingerprinter.getShotFingerprint(shot, shotRenderStart, shotRenderEnd)
+            if renderManifest.isShotUpToDate(compositedMediaPath, shotFingerprint):
+                print(f" - File {Path(compositedMediaPath).name} is up to date")
+                continue
+
         if not fileListOnly:
             startShotRenderTime = time.monotonic()
             infoStr = "\n----------------------------------------------------"
@@ -454,7 +485,8 @@ def launchRenderWithVSEComposite(
             #  props.enableBGSoundForShot()
 
             # set scene as current
-            context.window.scene = scene
+            if context.window is not None:
+                context.window.scene = scene
 
             # NOTE: inside setCurrentShot there is a call to updateStoryboardFramesDisplay, but not forced
             props.setCurrentShot(shot)
@@ -462,7 +494,10 @@ def launchRenderWithVSEComposite(
             shot.showGreasePencil()
 
             # scene.camera = shot.camera
-            if override_all_viewports:
+            if context.screen is None:
+                # background mode
+                pass
+            elif override_all_viewports:
                 for area in context.screen.areas:
                     utils.setCurrentCameraToViewport2(context, area)
             else:
@@ -499,10 +534,13 @@ def launchRenderWithVSEComposite(
                         # scene.render.filepath = shot.getOutputMediaPath(
                         #     rootPath=rootPath, insertTempFolder=True, specificFrame=scene.frame_current
                         # )
-                        scene.render.filepath = shot.getOutputMediaPath(
-                            "SH_INTERM_IMAGE_SEQ" + playblastSuffix,
-                            rootPath=rootPath,
-                            specificFrame=scene.frame_current,
+                        # scene.render.filepath = shot.getOutputMediaPath(
+                        #     "SH_INTERM_IMAGE_SEQ" + playblastSuffix,
+                        #     rootPath=rootPath,
+                        #     specificFrame=scene.frame_current,
+                        # )
+                        scene.render.filepath = pathsSession.getFramePath(
+                            "SH_INTERM_IMAGE_SEQ" + playblastSuffix, shot, scene.frame_current
                         )
 
                         print("      \n")
@@ -603,6 +641,7 @@ def launchRenderWithVSEComposite(
                     specificFrame=specificFrame,
                     stampInfoCustomSettingsDict=stampInfoCustomSettingsDict,
                     verbose=True,
+                    pathsSession=pathsSession,
                 )
 
             # print render time
@@ -738,20 +777,38 @@ def launchRenderWithVSEComposite(
                     if renderHandles:
                         video_frame_end += 2 * handles
 
-                    vse_render.compositeVideoInVSE(
-                        projectFps,
-                        video_frame_start,
-                        video_frame_end,
-                        compositedMediaPath,
-                        compositedMedia_NameOnly,
-                        compositedImgSeqPath=compositedImgSeqPath,
-                        output_file_prefix=props.getRenderShotPrefix(),
-                        postfixSceneName=shot.getName_PathCompliant(),
-                        output_resolution=infoImgSeq_resolution,
-                        output_media_mode=renderPreset.outputMediaMode,
-                        importAtFrame=video_frame_start,
-                        frame_padding=padding,
-                    )
+                    composited = False
+                    if prefs.stampInfo_useDirectCompositing:
+                        composited = vse_render.compositeVideoDirect(
+                            projectFps,
+                            video_frame_start,
+                            video_frame_end,
+                            compositedMediaPath,
+                            compositedMedia_NameOnly,
+                            compositedImgSeqPath=compositedImgSeqPath,
+                            output_file_prefix=props.getRenderShotPrefix(),
+                            output_resolution=infoImgSeq_resolution,
+                            output_media_mode=renderPreset.outputMediaMode,
+                            importAtFrame=video_frame_start,
+                            frame_padding=padding,
+                            ffmpegFilepath=bpy.path.abspath(prefs.ffmpegFilepath),
+                        )
+
+                    if not composited:
+                        vse_render.compositeVideoInVSE(
+                            projectFps,
+                            video_frame_start,
+                            video_frame_end,
+                            compositedMediaPath,
+                            compositedMedia_NameOnly,
+                            compositedImgSeqPath=compositedImgSeqPath,
+                            output_file_prefix=props.getRenderShotPrefix(),
+                            postfixSceneName=shot.getName_PathCompliant(),
+                            output_resolution=infoImgSeq_resolution,
+                            output_media_mode=renderPreset.outputMediaMode,
+                            importAtFrame=video_frame_start,
+                            frame_padding=padding,
+                        )
                 else:
                     vse_render.compositeVideoInVSE(
                         projectFps,
@@ -767,6 +824,11 @@ def launchRenderWithVSEComposite(
                         frame_padding=padding,
                     )
 
+                # the manifest is saved after each shot so that an interrupted rendering can be resumed
+                if shotFingerprint is not None:
+                    renderManifest.setShotFingerprint(compositedMediaPath, shotFingerprint)
+                    renderManifest.save()
+
                 # bpy.ops.render.render("INVOKE_DEFAULT", animation=False, write_still=True)
                 # bpy.ops.render.render('INVOKE_DEFAULT', animation = True)
                 # bpy.ops.render.opengl ( animation = True )
@@ -865,7 +927,12 @@ def launchRenderWithVSEComposite(
             if not fileListOnly:
                 # print(f"sequenceFiles: {sequenceFiles}")
                 vse_render.buildSequenceVideoFromMedia(
-                    sequenceOutputFullPath, handles, projectFps, mediaFiles=sequenceFiles
+                    sequenceOutputFullPath,
+                    handles,
+                    projectFps,
+                    mediaFiles=sequenceFiles,
+                    streamCopy=prefs.sequenceVideo_useStreamCopy,
+                    ffmpegFilepath=bpy.path.abspath(prefs.ffmpegFilepath),
                 )
 
                 # currentTakeRenderTime = time.monotonic()
@@ -875,6 +942,7 @@ def launchRenderWithVSEComposite(
                 pass
 
             newMediaFiles.append(sequenceOutputFullPath)
+            pathsSession.addFile("TK_VIDEO", take, sequenceOutputFullPath)
 
         else:
             _logger.debug_ext(" --- In else that generateShotVideos")
@@ -892,6 +960,7 @@ def launchRenderWithVSEComposite(
             #     f"{rootPath}{takeName}\\_playblast_{sequenceFileName}.{props.getOutputFileFormat()}"
             # )
             print(f"  Rendered sequence from shot sequences: {sequenceOutputFullPath}")
+            pathsSession.addFile("TK_PLAYBLAST", take, sequenceOutputFullPath)
 
             if len(renderedShotSequencesArr):
                 vse_render.buildSequenceVideoFromMedia(
@@ -950,6 +1019,8 @@ def launchRenderWithVSEComposite(
     if "PLAYBLAST" == renderMode:
         filesDict["playblastInfos"] = renderInfo
 
+    filesDict["output_files_manifest"] = pathsSession.writeManifest()
+
     deltaTime = time.monotonic() - startRenderTime
     allRenderTimes["Sequence and shots"] = deltaTime
 
@@ -1049,7 +1120,6 @@ def launchRender(context, renderMode, rootPath, area=None):
     if preset is not None:
         renderDisplayInfo += f"  Rendering with {_YELLOW}{presetName}{_GREEN}"
 
-    stampInfoSettings = None
     useStampInfo = preset.useStampInfo
     if "PLAYBLAST" == renderMode:
         useStampInfo = useStampInfo and preset.stampRenderInfo
@@ -1063,15 +1133,7 @@ def launchRender(context, renderMode, rootPath, area=None):
         # print(f"Blender file Stats: {stat.st_mode}")
         fileIsReadOnly = S_IMODE(stat.st_mode) & S_IWRITE == 0
 
-    if props.use_project_settings and props.isStampInfoAvailable() and useStampInfo:
-        stampInfoSettings = scene.UAS_SM_StampInfo_Settings
-        #       stampInfoSettings.stampInfoUsed = False
-        stampInfoSettings.activateStampInfo = True
-    elif props.stampInfoUsed() and useStampInfo:
-        stampInfoSettings = scene.UAS_SM_StampInfo_Settings
-        stampInfoSettings.activateStampInfo = True
-    elif props.isStampInfoAvailable():
-        scene.UAS_SM_StampInfo_Settings.activateStampInfo = False
+    activateStampInfoForRendering(scene, preset)
 
     renderDisplayInfo += "  ***"
     renderDisplayInfo += "\n\n*** *** *** *** *** *** *** *** *** *** *** *** *** *** *** *** *** *** *** *** *** *** *** *** *** *** *** *** *** *** *** ***\n\n"
@@ -1175,17 +1237,32 @@ def launchRender(context, renderMode, rootPath, area=None):
                 takesToRender = [currentTakeInd]
 
         for takeInd in takesToRender:
-            renderedFilesDict = launchRenderWithVSEComposite(
-                context,
-                preset,
-                takeIndex=takeInd,
-                filePath=props.renderRootPath,
-                fileListOnly=False,
-                rerenderExistingShotVideos=preset.rerenderExistingShotVideos,
-                generateSequenceVideo=preset.generateEditVideo,
-                renderAlsoDisabled=preset.renderAlsoDisabled,
-                area=area,
-            )
+            if preset.renderInBackgroundJobs:
+                from shotmanager.rendering.rendering_jobs import launchRenderJobs
+
+                renderedFilesDict = launchRenderJobs(
+                    context,
+                    preset,
+                    takeIndex=takeInd,
+                    filePath=props.renderRootPath,
+                    numJobs=preset.numBackgroundJobs,
+                    rerenderExistingShotVideos=preset.rerenderExistingShotVideos,
+                    generateSequenceVideo=preset.generateEditVideo,
+                    renderAlsoDisabled=preset.renderAlsoDisabled,
+                )
+            else:
+                renderedFilesDict = launchRenderWithVSEComposite(
+                    context,
+                    preset,
+                    takeIndex=takeInd,
+                    filePath=props.renderRootPath,
+                    fileListOnly=False,
+                    rerenderExistingShotVideos=preset.rerenderExistingShotVideos,
+                    rerenderChangedShotsOnly=preset.rerenderChangedShotsOnly,
+                    generateSequenceVideo=preset.generateEditVideo,
+                    renderAlsoDisabled=preset.renderAlsoDisabled,
+                    area=area,
+                )
 
             if preset.renderOtioFile:
                 bpy.context.window.scene = scene
@@ -1268,6 +1345,25 @@ def launchRender(context, renderMode, rootPath, area=None):
     _logger.info_ext("Shot Manager rendering done\n", col="GREEN")
 
 
+def activateStampInfoForRendering(scene, renderPreset):
+    """Enable or disable Stamp Info on the scene according to the render preset"""
+    props = config.getAddonProps(scene)
+
+    useStampInfo = renderPreset.useStampInfo
+    if "PLAYBLAST" == renderPreset.renderMode:
+        useStampInfo = useStampInfo and renderPreset.stampRenderInfo
+
+    if props.use_project_settings and props.isStampInfoAvailable() and useStampInfo:
+        stampInfoSettings = scene.UAS_SM_StampInfo_Settings
+        #       stampInfoSettings.stampInfoUsed = False
+        stampInfoSettings.activateStampInfo = True
+    elif props.stampInfoUsed() and useStampInfo:
+        stampInfoSettings = scene.UAS_SM_StampInfo_Settings
+        stampInfoSettings.activateStampInfo = True
+    elif props.isStampInfoAvailable():
+        scene.UAS_SM_StampInfo_Settings.activateStampInfo = False
+
+
 def useStampInfoForRendering(context, renderPreset):
     props = config.getAddonProps(context.scene)
 
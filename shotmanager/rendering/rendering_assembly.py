@@ -0,0 +1,172 @@
+# GPLv3 License
+#
+# Copyright (C) 2021 Ubisoft
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Assembly of the sequence video from the shot videos without re-encoding them
+
+When all the shot videos have the same video format (codec, resolution, pixel format and frame rate), their
+video streams are concatenated by ffmpeg at the container level. Only the sound is decoded, mixed down in a
+single track and encoded again, so that the shot boundaries do not produce audio glitches.
+When the formats differ the videos have to be assembled in the VSE, as before.
+"""
+
+import os
+import json
+import shutil
+import subprocess
+import tempfile
+from fractions import Fraction
+from pathlib import Path
+
+from shotmanager.rendering.rendering_compositor import getFFmpegExecutable
+
+from shotmanager.config import sm_logging
+
+_logger = sm_logging.getLogger(__name__)
+
+
+# properties of the streams that have to be identical in all the videos to be concatenated
+_VIDEO_STREAM_KEYS = ("codec_name", "profile", "width", "height", "pix_fmt", "r_frame_rate")
+_AUDIO_STREAM_KEYS = ("codec_name", "sample_rate", "channels")
+
+
+def getFFprobeExecutable(ffmpegFilepath=""):
+    """Return the path of the ffprobe executable, looked for next to ffmpeg then in the system path.
+    Return None if it cannot be found
+    """
+    ffmpegExecutable = getFFmpegExecutable(ffmpegFilepath)
+    if ffmpegExecutable is not None:
+        ffprobeName = "ffprobe.exe" if ffmpegExecutable.lower().endswith(".exe") else "ffprobe"
+        ffprobeExecutable = os.path.join(os.path.dirname(ffmpegExecutable), ffprobeName)
+        if os.path.isfile(ffprobeExecutable):
+            return ffprobeExecutable
+    return shutil.which("ffprobe")
+
+
+def getMediaStreams(filepath, ffprobeExecutable):
+    """Return a dictionary with the properties of the first video stream and of the first audio stream of the media,
+    the value of a stream being None if there is no stream of this type
+    """
+    args = [ffprobeExecutable, "-v", "error", "-show_entries", "stream", "-of", "json", filepath]
+    result = subprocess.run(args, capture_output=True, check=True)
+    streams = json.loads(result.stdout.decode(errors="replace")).get("streams", [])
+
+    mediaStreams = {"video": None, "audio": None}
+    for stream in streams:
+        streamType = stream.get("codec_type", None)
+        if streamType in mediaStreams and mediaStreams[streamType] is None:
+            mediaStreams[streamType] = stream
+    return mediaStreams
+
+
+def _getStreamFormat(stream, keys):
+    if stream is None:
+        return None
+    return tuple(stream.get(key, None) for key in keys)
+
+
+def checkVideosCanBeConcatenated(mediaFiles, fps, ffprobeExecutable):
+    """Return None if the videos can be concatenated without being re-encoded, the reason why they cannot otherwise"""
+    if not len(mediaFiles):
+        return "No shot videos"
+
+    refVideoFormat = None
+    refAudioFormat = None
+    for i, mediaFile in enumerate(mediaFiles):
+        if not os.path.exists(mediaFile):
+            return f"Shot video not found: {mediaFile}"
+        try:
+            streams = getMediaStreams(mediaFile, ffprobeExecutable)
+        except Exception as e:
+            return f"Shot video cannot be analyzed: {mediaFile}: {e}"
+
+        videoFormat = _getStreamFormat(streams["video"], _VIDEO_STREAM_KEYS)
+        audioFormat = _getStreamFormat(streams["audio"], _AUDIO_STREAM_KEYS)
+        if videoFormat is None:
+            return f"No video stream in {mediaFile}"
+
+        if 0 == i:
+            refVideoFormat = videoFormat
+            refAudioFormat = audioFormat
+            frameRate = Fraction(streams["video"]["r_frame_rate"])
+            if abs(float(frameRate) - fps) > 0.001:
+                return f"Frame rate of {mediaFile} is {float(frameRate):0.3f} instead of {fps}"
+        elif videoFormat != refVideoFormat:
+            return f"Video format of {mediaFile} differs from the one of {mediaFiles[0]}"
+        elif audioFormat != refAudioFormat:
+            return f"Sound format of {mediaFile} differs from the one of {mediaFiles[0]}"
+
+    return None
+
+
+def _getConcatListLine(filepath):
+    # single quotes are escaped as described in the documentation of the ffmpeg concat demuxer
+    escapedPath = filepath.replace("'", "'\\''")
+    return f"file '{escapedPath}'\n"
+
+
+def concatenateVideos(mediaFiles, outputFile, fps, handles=0, ffmpegFilepath=""):
+    """Assemble the shot videos in the sequence video, the video streams being copied without re-encoding.
+    Return True if the sequence video has been written, False if it has to be built in the VSE instead.
+
+    Args:
+        handles: duration of the handles included in the shot videos. Cutting them would require the videos to be
+            decoded, so the stream copy is only possible when there are no handles
+    """
+    if 0 < handles:
+        _logger.info_ext("Sequence video: the shot videos have handles, they are assembled in the VSE")
+        return False
+
+    ffmpegExecutable = getFFmpegExecutable(ffmpegFilepath)
+    ffprobeExecutable = getFFprobeExecutable(ffmpegFilepath)
+    if ffmpegExecutable is None or ffprobeExecutable is None:
+        _logger.warning_ext("Sequence video: FFmpeg or FFprobe not found, the shot videos are assembled in the VSE")
+        return False
+
+    reason = checkVideosCanBeConcatenated(mediaFiles, fps, ffprobeExecutable)
+    if reason is not None:
+        _logger.info_ext(f"Sequence video: {reason}, the shot videos are assembled in the VSE")
+        return False
+
+    withAudio = getMediaStreams(mediaFiles[0], ffprobeExecutable)["audio"] is not None
+
+    Path(outputFile).parent.mkdir(parents=True, exist_ok=True)
+    listFile = tempfile.NamedTemporaryFile("w", suffix=".txt", prefix="ShotManager_Concat_", delete=False)
+    try:
+        with listFile:
+            listFile.write("ffconcat version 1.0\n")
+            for mediaFile in mediaFiles:
+                listFile.write(_getConcatListLine(os.path.abspath(mediaFile)))
+
+        args = [ffmpegExecutable, "-y", "-hide_banner", "-loglevel", "error"]
+        args += ["-f", "concat", "-safe", "0", "-i", listFile.name, "-map", "0:v:0", "-c:v", "copy"]
+        if withAudio:
+            args += ["-map", "0:a:0", "-c:a", "aac"]
+        args += ["-movflags", "+faststart", outputFile]
+        _logger.debug_ext(f"FFmpeg command: {' '.join(args)}")
+
+        result = subprocess.run(args, capture_output=True)
+        if 0 != result.returncode:
+            _logger.error_ext(
+                f"Sequence video: FFmpeg failed, the shot videos are assembled in the VSE: "
+                f"{result.stderr.decode(errors='replace').strip()}"
+            )
+            return False
+    finally:
+        os.remove(listFile.name)
+
+    return True
@@ -0,0 +1,274 @@
+# GPLv3 License
+#
+# Copyright (C) 2021 Ubisoft
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Direct compositing of the rendered images and of the Stamp Info images
+
+The Stamp Info image sequence is alpha-overed on the rendered image sequence frame by frame with NumPy and PIL,
+without creating a temporary VSE scene. Each composited frame is written in the output image sequence and
+streamed as raw RGB data to an ffmpeg process encoding the video, so that both media are produced in one pass.
+Nothing here depends on the Blender context, the functions can be called from a worker process.
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+from shotmanager.config import sm_logging
+
+_logger = sm_logging.getLogger(__name__)
+
+
+# same encoding settings as the VSE rendering: MPEG4 container, H264, perceptually lossless, keyframe every 5 frames
+_FFMPEG_VIDEO_ARGS = ["-c:v", "libx264", "-crf", "17", "-g", "5", "-pix_fmt", "yuv420p"]
+_FFMPEG_AUDIO_ARGS = ["-c:a", "aac"]
+
+
+def getFFmpegExecutable(ffmpegFilepath=""):
+    """Return the path of the ffmpeg executable, either the specified one or the one found in the system path.
+    Return None if ffmpeg cannot be found
+    """
+    if ffmpegFilepath is not None and "" != ffmpegFilepath:
+        if os.path.isfile(ffmpegFilepath):
+            return ffmpegFilepath
+        _logger.warning_ext(f"FFmpeg executable not found: {ffmpegFilepath}, looking in the system path")
+    return shutil.which("ffmpeg")
+
+
+def isDirectCompositingAvailable(withVideo=True, ffmpegFilepath=""):
+    """Return True if NumPy and PIL can be imported and, if withVideo is True, if ffmpeg can be found"""
+    if np is None or Image is None:
+        return False
+    return not withVideo or getFFmpegExecutable(ffmpegFilepath) is not None
+
+
+def getImageSequenceFiles(imagesPath):
+    """Return a dictionary of the files of the specified image sequence, by frame number.
+    imagesPath is the path of the sequence with the frame number replaced by #, eg: "C:\\render\\Sh0010_####.png"
+    """
+    p = Path(imagesPath)
+    folder, name = p.parent, str(p.name)
+    padding_match = re.match(".*?(#+).*", name)
+    if not padding_match:
+        return {0: str(p)} if p.exists() else dict()
+
+    file_re = re.compile(
+        r"^{1}(\d{{{0}}}){2}$".format(
+            len(padding_match[1]),
+            re.escape(name[: padding_match.start(1)]),
+            re.escape(name[padding_match.end(1) :]),
+        )
+    )
+    files = dict()
+    if folder.exists():
+        for f in folder.iterdir():
+            re_match = file_re.match(f.name)
+            if re_match:
+                files[int(re_match[1])] = str(f)
+    return files
+
+
+def formatImageSequencePath(imagesPath, frame):
+    """Return the path of the specified frame of the image sequence, the last group of # being the frame number"""
+    padding_match = re.match("^(.*?)(#+)([^#]*)$", imagesPath)
+    if not padding_match:
+        return imagesPath
+    return padding_match[1] + str(frame).rjust(len(padding_match[2]), "0") + padding_match[3]
+
+
+def _loadImageOnCanvas(filepath, width, height):
+    """Return the image as a RGBA array of the size of the canvas. The image is centered on the canvas, cropped
+    if it is bigger, as the cropped strips of the VSE
+    """
+    with Image.open(filepath) as img:
+        img = img.convert("RGBA")
+        if img.width != width or img.height != height:
+            canvas = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+            canvas.paste(img, ((width - img.width) // 2, (height - img.height) // 2))
+            img = canvas
+        return np.asarray(img, dtype=np.uint8)
+
+
+def alphaOver(bgImage, overImage):
+    """Composite the over RGBA array on the bg RGBA array, like the Alpha Over blending of the VSE.
+    Return a RGB array, the transparent parts of the bg being black
+    """
+    height, width = bgImage.shape[:2] if bgImage is not None else overImage.shape[:2]
+    result = np.zeros((height, width, 3), dtype=np.uint16)
+
+    if bgImage is not None:
+        bgAlpha = bgImage[..., 3:4].astype(np.uint16)
+        result += (bgImage[..., :3] * bgAlpha + 127) // 255
+
+    if overImage is not None:
+        overAlpha = overImage[..., 3:4].astype(np.uint16)
+        result = (overImage[..., :3] * overAlpha + result * (255 - overAlpha) + 127) // 255
+
+    return result.astype(np.uint8)
+
+
+class _VideoEncoder:
+    """FFmpeg process encoding the raw RGB frames written in its standard input"""
+
+    def __init__(self, ffmpegExecutable, outputFilepath, width, height, fps, audioFilepath=None):
+        self.outputFilepath = outputFilepath
+        self.width = width
+        self.height = height
+
+        args = [ffmpegExecutable, "-y", "-hide_banner", "-loglevel", "error"]
+        args += ["-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-framerate", str(fps), "-i", "-"]
+        if audioFilepath is not None:
+            args += ["-i", audioFilepath, "-map", "0:v", "-map", "1:a"]
+        # H264 needs even dimensions, the VSE rendering also rounds them up
+        args += ["-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2"] + _FFMPEG_VIDEO_ARGS
+        if audioFilepath is not None:
+            # the sound is cut or padded with silence to the duration of the video
+            args += _FFMPEG_AUDIO_ARGS + ["-af", "apad", "-shortest"]
+        args.append(outputFilepath)
+
+        Path(outputFilepath).parent.mkdir(parents=True, exist_ok=True)
+        # the errors are written in a temporary file so that a full pipe cannot block ffmpeg
+        self._errorFile = tempfile.TemporaryFile()
+        _logger.debug_ext(f"FFmpeg command: {' '.join(args)}")
+        self._process = subprocess.Popen(args, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=self._errorFile)
+
+    def _getErrors(self):
+        self._errorFile.seek(0)
+        return self._errorFile.read().decode(errors="replace").strip()
+
+    def writeFrame(self, image):
+        try:
+            self._process.stdin.write(image.tobytes())
+        except (BrokenPipeError, OSError):
+            self._process.wait()
+            raise RuntimeError(f"FFmpeg stopped while encoding {self.outputFilepath}: {self._getErrors()}")
+
+    def close(self):
+        """Wait for the end of the encoding. Raise a RuntimeError if ffmpeg failed"""
+        try:
+            self._process.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+        returnCode = self._process.wait()
+        errors = self._getErrors()
+        self._errorFile.close()
+        if 0 != returnCode:
+            raise RuntimeError(f"FFmpeg failed to encode {self.outputFilepath}: {errors}")
+
+    def kill(self):
+        if self._process.poll() is None:
+            self._process.kill()
+            self._process.wait()
+        self._errorFile.close()
+
+
+def compositeImageSequences(
+    frame_start,
+    frame_end,
+    resolution,
+    bgImagesPath=None,
+    overImagesPath=None,
+    outputImagesPath=None,
+    outputVideoPath=None,
+    audioFilepath=None,
+    fps=25,
+    importAtFrame=0,
+    ffmpegFilepath="",
+):
+    """Alpha-over the over image sequence on the bg image sequence and write the result in the output image sequence
+    and in the output video, in one pass
+
+    Args:
+        frame_start, frame_end: range of the output frames, end included
+        resolution: [width, height] of the output media. The input images are centered on it
+        bgImagesPath, overImagesPath: paths of the input image sequences, the frame number being replaced by #.
+            The first image of each sequence is used for the frame importAtFrame, as for the strips of the VSE
+        outputImagesPath: path of the output image sequence, with # for the frame number. None to skip it
+        outputVideoPath: path of the output video. None to skip it
+        audioFilepath: sound muxed in the output video. None for no sound
+
+    Returns:
+        the number of frames written
+    """
+    if not isDirectCompositingAvailable(withVideo=outputVideoPath is not None, ffmpegFilepath=ffmpegFilepath):
+        raise RuntimeError("Direct compositing requires NumPy, PIL and, for the videos, the ffmpeg executable")
+
+    width, height = resolution[0], resolution[1]
+
+    def _getSequence(imagesPath):
+        if imagesPath is None or "" == imagesPath:
+            return dict(), 0
+        files = getImageSequenceFiles(imagesPath)
+        if not len(files):
+            _logger.error_ext(f" *** Rendered shot not found: {imagesPath}")
+            return files, 0
+        return files, min(files.keys())
+
+    bgFiles, bgFirstFrame = _getSequence(bgImagesPath)
+    overFiles, overFirstFrame = _getSequence(overImagesPath)
+
+    if audioFilepath is not None and not os.path.exists(audioFilepath):
+        _logger.error_ext(f" *** Rendered shot not found: {audioFilepath}")
+        audioFilepath = None
+
+    encoder = None
+    if outputVideoPath is not None:
+        encoder = _VideoEncoder(
+            getFFmpegExecutable(ffmpegFilepath), outputVideoPath, width, height, fps, audioFilepath=audioFilepath
+        )
+    if outputImagesPath is not None:
+        Path(outputImagesPath).parent.mkdir(parents=True, exist_ok=True)
+
+    numFrames = 0
+    try:
+        for frame in range(frame_start, frame_end + 1):
+            bgFile = bgFiles.get(bgFirstFrame + frame - importAtFrame, None)
+            overFile = overFiles.get(overFirstFrame + frame - importAtFrame, None)
+            bgImage = _loadImageOnCanvas(bgFile, width, height) if bgFile is not None else None
+            overImage = _loadImageOnCanvas(overFile, width, height) if overFile is not None else None
+            if bgImage is None and overImage is None:
+                image = np.zeros((height, width, 3), dtype=np.uint8)
+            else:
+                image = alphaOver(bgImage, overImage)
+
+            if outputImagesPath is not None:
+                Image.fromarray(image, "RGB").save(formatImageSequencePath(outputImagesPath, frame))
+            if encoder is not None:
+                encoder.writeFrame(image)
+            numFrames += 1
+    except Exception:
+        if encoder is not None:
+            encoder.kill()
+        raise
+
+    if encoder is not None:
+        encoder.close()
+
+    return numFrames
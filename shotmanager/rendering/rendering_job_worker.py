@@ -0,0 +1,53 @@
+# GPLv3 License
+#
+# Copyright (C) 2021 Ubisoft
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Entry point of the background instances of Blender rendering a job of a jobs file
+
+Usage:
+    blender -b <file.blend> --python-exit-code 1 -P rendering_job_worker.py -- --jobs <jobs file> --job <job id>
+
+The jobs file is written by shotmanager.rendering.rendering_jobs.writeRenderJobs(). The Shot Manager add-on
+must be installed, it is enabled if needed.
+"""
+
+import sys
+import argparse
+
+import bpy
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(prog="rendering_job_worker", description="Render a Shot Manager render job")
+    parser.add_argument("--jobs", required=True, help="Path of the jobs file")
+    parser.add_argument("--job", required=True, help="Id of the job to render")
+    args = parser.parse_args(argv)
+
+    if "shotmanager" not in bpy.context.preferences.addons:
+        import addon_utils
+
+        addon_utils.enable("shotmanager", default_set=False)
+
+    from shotmanager.rendering.rendering_jobs import renderJob
+
+    if not renderJob(bpy.context, args.jobs, args.job):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+# GPLv3 License
+#
+# Copyright (C) 2021 Ubisoft
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Rendering of the shots of a take in background instances of Blender
+
+The rendering of a take is split into one job per shot. The jobs are written in a json file in the render
+folder, each one with the command line that renders it:
+    blender -b <file.blend> --python-exit-code 1 -P rendering_job_worker.py -- --jobs <jobs file> --job <job id>
+The jobs are then run by a local scheduler, several at the same time, or dispatched on a render farm.
+Once all the shots are rendered the sequence video is assembled from the shot videos.
+
+The jobs cannot be split into frame ranges smaller than a shot since Stamp Info and the composition in the
+VSE work on whole shots.
+"""
+
+import os
+from pathlib import Path
+import json
+import subprocess
+import time
+
+import bpy
+
+from shotmanager.rendering.rendering import launchRenderWithVSEComposite, activateStampInfoForRendering
+
+from shotmanager.utils import utils
+from shotmanager.utils.utils_os import format_path_for_os
+
+from shotmanager.config import config
+from shotmanager.config import sm_logging
+
+_logger = sm_logging.getLogger(__name__)
+
+
+_JOBS_VERSION = 1
+_JOBS_DIRNAME = "_ShotManager_RenderJobs"
+_WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rendering_job_worker.py")
+
+# time between 2 checks of the state of the running jobs, in seconds
+_JOBS_POLLING_DELAY = 0.5
+
+
+def getRenderJobsDir(rootPath):
+    return os.path.join(rootPath, _JOBS_DIRNAME)
+
+
+def getJobCommand(blendFilepath, jobsFilepath, jobId):
+    """Return the command line rendering the specified job in a background instance of Blender"""
+    return [
+        bpy.app.binary_path,
+        "-b",
+        blendFilepath,
+        "--python-exit-code",
+        "1",
+        "-P",
+        _WORKER_SCRIPT,
+        "--",
+        "--jobs",
+        jobsFilepath,
+        "--job",
+        jobId,
+    ]
+
+
+def writeRenderJobs(
+    scene, renderPreset, takeIndex=-1, filePath="", rerenderExistingShotVideos=True, renderAlsoDisabled=False
+):
+    """Write the file listing the jobs rendering the shots of the specified take, one job per shot.
+    The Blender file must have been saved since the jobs are rendered from the file on disk.
+    Return the path of the jobs file and its content, or (None, None) if the jobs cannot be created
+    """
+    props = config.getAddonProps(scene)
+
+    blendFilepath = bpy.data.filepath
+    if "" == blendFilepath:
+        _logger.error_ext("Render jobs: The file has to be saved to be rendered in background jobs")
+        return (None, None)
+    if bpy.data.is_dirty:
+        _logger.warning_ext("Render jobs: The file has unsaved modifications, they will not be rendered")
+
+    take = props.getCurrentTake() if -1 == takeIndex else props.getTakeByIndex(takeIndex)
+    if take is None:
+        _logger.error_ext("Render jobs: Take not found")
+        return (None, None)
+    takeIndex = props.getTakeIndex(take)
+
+    rootPath = filePath if "" != filePath else os.path.dirname(blendFilepath)
+    rootPath = format_path_for_os(bpy.path.abspath(rootPath))
+
+    jobsDir = getRenderJobsDir(rootPath)
+    Path(jobsDir).mkdir(parents=True, exist_ok=True)
+    jobsFilepath = os.path.join(jobsDir, f"{take.getName_PathCompliant()}.json")
+
+    shots = take.getShotList(ignoreDisabled=not renderAlsoDisabled)
+    jobs = []
+    sequenceFiles = []  # only enabled shots
+    for shot in shots:
+        if shot.get_name().endswith("_removed") and not shot.enabled:
+            continue
+
+        mediaFile = shot.getOutputMediaPath("SH_VIDEO", rootPath=rootPath, insertSeqPrefix=True)
+        if shot.enabled:
+            sequenceFiles.append(mediaFile)
+
+        if not rerenderExistingShotVideos and Path(mediaFile).exists():
+            print(f" - File {Path(mediaFile).name} already computed")
+            continue
+
+        jobId = f"{len(jobs):03d}_{shot.getName_PathCompliant()}"
+        jobs.append(
+            {
+                "job_id": jobId,
+                "shot_name": shot.name,
+                "shot_index": props.getShotIndex(shot),
+                "frame_start": shot.start,
+                "frame_end": shot.end,
+                "media_file": mediaFile,
+                "command": getJobCommand(blendFilepath, jobsFilepath, jobId),
+            }
+        )
+
+    content = {
+        "version": _JOBS_VERSION,
+        "blend_file": blendFilepath,
+        "scene": scene.name,
+        "take_index": takeIndex,
+        "take_name": take.name,
+        "render_root": rootPath,
+        "render_mode": renderPreset.renderMode,
+        "sequence_files": sequenceFiles,
+        "jobs": jobs,
+    }
+
+    with open(jobsFilepath, "w") as f:
+        json.dump(content, f, indent=4)
+
+    _logger.info_ext(f"Render jobs: {len(jobs)} job(s) written in {jobsFilepath}")
+    return (jobsFilepath, content)
+
+
+def readRenderJobs(jobsFilepath):
+    """Return the content of the jobs file, or None if it cannot be read"""
+    try:
+        with open(jobsFilepath, "r") as f:
+            content = json.load(f)
+    except Exception as e:
+        _logger.error_ext(f"Render jobs: Cannot read the jobs file {jobsFilepath}: {e}")
+        return None
+
+    if _JOBS_VERSION != content.get("version", None):
+        _logger.error_ext(f"Render jobs: Unsupported version of the jobs file {jobsFilepath}")
+        return None
+    return content
+
+
+def renderJob(context, jobsFilepath, jobId):
+    """Render the specified job in the current instance of Blender, usually a background one.
+    Return True if the shot video has been rendered
+    """
+    content = readRenderJobs(jobsFilepath)
+    if content is None:
+        return False
+
+    job = next((j for j in content["jobs"] if jobId == j["job_id"]), None)
+    if job is None:
+        _logger.error_ext(f"Render jobs: Job {jobId} not found in {jobsFilepath}")
+        return False
+
+    scene = bpy.data.scenes.get(content["scene"], None)
+    if scene is None or scene != context.scene:
+        # in background mode there is no window to change the current scene
+        _logger.error_ext(f"Render jobs: Scene {content['scene']} is not the current scene of the file")
+        return False
+
+    props = config.getAddonProps(scene)
+    take = props.getTakeByIndex(content["take_index"])
+    shot = None
+    if take is not None and job["shot_index"] < len(take.shots):
+        shot = take.shots[job["shot_index"]]
+    if shot is None or shot.name != job["shot_name"]:
+        _logger.error_ext(f"Render jobs: Shot {job['shot_name']} not found, the file may have been modified")
+        return False
+
+    # the last messages, even the silenced ones, are written next to the jobs file if the job fails
+    _logger.enableRingBuffer()
+
+    renderPreset = props.renderSettingsAll
+    activateStampInfoForRendering(scene, renderPreset)
+
+    _logger.info_ext(f"Render jobs: Rendering job {jobId}, shot {shot.name} [{shot.start}, {shot.end}]")
+    renderedFilesDict = launchRenderWithVSEComposite(
+        context,
+        renderPreset,
+        takeIndex=content["take_index"],
+        filePath=content["render_root"],
+        rerenderExistingShotVideos=True,
+        rerenderChangedShotsOnly=renderPreset.rerenderChangedShotsOnly,
+        generateSequenceVideo=False,
+        specificShotList=[shot],
+        renderAlsoDisabled=True,
+        area=None,
+    )
+
+    jobSucceeded = 0 == len(renderedFilesDict["failed_files"]) and os.path.exists(job["media_file"])
+    if not jobSucceeded:
+        jobsFileName = Path(jobsFilepath).stem
+        _logger.dumpRingBuffer(os.path.join(os.path.dirname(jobsFilepath), f"{jobsFileName}_{jobId}_log.json"))
+    return jobSucceeded
+
+
+def runRenderJobs(jobsFilepath, numJobs=2):
+    """Run the jobs of the jobs file in background instances of Blender, at most numJobs at the same time.
+    The output of each job is written in a log file next to the jobs file.
+    Return the list of the ids of the failed jobs
+    """
+    content = readRenderJobs(jobsFilepath)
+    if content is None:
+        return []
+
+    numJobs = max(1, numJobs)
+    jobsDir = os.path.dirname(jobsFilepath)
+    jobsFileName = Path(jobsFilepath).stem
+
+    pendingJobs = list(content["jobs"])
+    runningJobs = dict()
+    failedJobs = []
+    startTime = time.monotonic()
+
+    while len(pendingJobs) or len(runningJobs):
+        while len(pendingJobs) and len(runningJobs) < numJobs:
+            job = pendingJobs.pop(0)
+            logFilepath = os.path.join(jobsDir, f"{jobsFileName}_{job['job_id']}.log")
+            logFile = open(logFilepath, "w")
+            try:
+                process = subprocess.Popen(job["command"], stdout=logFile, stderr=subprocess.STDOUT)
+            except Exception as e:
+                logFile.close()
+                _logger.error_ext(f"Render jobs: Job {job['job_id']} cannot be started: {e}")
+                failedJobs.append(job["job_id"])
+                continue
+            runningJobs[job["job_id"]] = (process, logFile)
+            _logger.info_ext(f"Render jobs: Job {job['job_id']} started")
+
+        time.sleep(_JOBS_POLLING_DELAY)
+
+        for jobId in list(runningJobs.keys()):
+            process, logFile = runningJobs[jobId]
+            if process.poll() is None:
+                continue
+            logFile.close()
+            del runningJobs[jobId]
+            if 0 == process.returncode:
+                _logger.info_ext(f"Render jobs: Job {jobId} done")
+            else:
+                _logger.error_ext(f"Render jobs: Job {jobId} failed, see {logFile.name}")
+                failedJobs.append(jobId)
+
+    runTime = time.monotonic() - startTime
+    _logger.info_ext(f"Render jobs: {len(content['jobs'])} job(s) run in {runTime:0.2f} sec., {len(failedJobs)} failed")
+    return failedJobs
+
+
+def launchRenderJobs(
+    context,
+    renderPreset,
+    takeIndex=-1,
+    filePath="",
+    numJobs=2,
+    rerenderExistingShotVideos=True,
+    generateSequenceVideo=True,
+    renderAlsoDisabled=False,
+):
+    """Render the shots of the specified take in background jobs and assemble the sequence video
+    Return a dictionary with the same content as launchRenderWithVSEComposite()
+    """
+    scene = context.scene
+    props = config.getAddonProps(scene)
+    prefs = config.getAddonPrefs()
+    vse_render = context.window_manager.UAS_vse_render
+
+    renderedFilesDict = {"rendered_files": [], "failed_files": [], "sequence_video_file": ""}
+
+    jobsFilepath, content = writeRenderJobs(
+        scene,
+        renderPreset,
+        takeIndex=takeIndex,
+        filePath=filePath,
+        rerenderExistingShotVideos=rerenderExistingShotVideos,
+        renderAlsoDisabled=renderAlsoDisabled,
+    )
+    if jobsFilepath is None:
+        return renderedFilesDict
+
+    failedJobs = runRenderJobs(jobsFilepath, numJobs=numJobs)
+    for job in content["jobs"]:
+        if job["job_id"] in failedJobs:
+            renderedFilesDict["failed_files"].append(job["media_file"])
+        else:
+            renderedFilesDict["rendered_files"].append(job["media_file"])
+
+    if generateSequenceVideo:
+        if len(failedJobs):
+            _logger.error_ext("Render jobs: Some shots failed to render, the sequence video is not generated")
+        else:
+            take = props.getTakeByIndex(content["take_index"])
+            projectFps = props.project_fps if props.use_project_settings else utils.getSceneEffectiveFps(scene)
+            sequenceOutputFullPath = props.getOutputMediaPath(
+                "TK_VIDEO", take, rootPath=content["render_root"], insertSeqPrefix=True
+            )
+            _logger.info_ext(f"  Rendered sequence from shot videos: {sequenceOutputFullPath}")
+            vse_render.buildSequenceVideoFromMedia(
+                sequenceOutputFullPath,
+                props.getHandlesDuration(),
+                projectFps,
+                mediaFiles=content["sequence_files"],
+                streamCopy=prefs.sequenceVideo_useStreamCopy,
+                ffmpegFilepath=bpy.path.abspath(prefs.ffmpegFilepath),
+            )
+            renderedFilesDict["rendered_files"].append(sequenceOutputFullPath)
+            renderedFilesDict["sequence_video_file"] = sequenceOutputFullPath
+
+    return renderedFilesDict
@@ -0,0 +1,359 @@
+# GPLv3 License
+#
+# Copyright (C) 2021 Ubisoft
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Render manifest, used to re-render only the shots that changed since their last rendering
+
+The manifest is a json file written in the render root folder. It stores, for each rendered shot video,
+a fingerprint of the data the video depends on:
+    - the shot itself (range, camera, notes, edit position) and its take,
+    - the static state of the objects of the scene and their animation in the range of the shot,
+    - the grease pencil frames in the range of the shot,
+    - the render and output settings, the render preset and the Stamp Info settings.
+The content of the meshes and of the materials is not part of the fingerprint.
+"""
+
+import os
+import json
+import hashlib
+from bisect import bisect_left, bisect_right
+
+import bpy
+
+from shotmanager.config import sm_logging
+
+_logger = sm_logging.getLogger(__name__)
+
+
+_MANIFEST_FILENAME = "_ShotManager_RenderManifest.json"
+
+# to increment when the content of the fingerprint changes so that previous manifests get invalidated
+_FINGERPRINT_VERSION = 1
+
+# properties modified by the rendering process itself, before or during the rendering of each shot
+_RENDER_SETTINGS_EXCLUDED = {"filepath", "stamp_note_text"}
+_STAMPINFO_SETTINGS_EXCLUDED = {
+    "renderRootPath",
+    "shotName",
+    "cameraName",
+    "takeName",
+    "sequenceName",
+    "notesUsed",
+    "notesLine01",
+    "notesLine02",
+    "notesLine03",
+    "cornerNoteUsed",
+    "cornerNote",
+    "bottomNoteUsed",
+    "bottomNote",
+    "shotHandles",
+    "edit3DFrame",
+    "edit3DTotalNumber",
+    "customFileFullPath",
+}
+# render preset properties that don't change the shot videos
+_RENDER_PRESET_EXCLUDED = {
+    "rerenderExistingShotVideos",
+    "rerenderChangedShotsOnly",
+    "renderAllTakes",
+    "renderAllShots",
+    "renderOtioFile",
+    "otioFileType",
+    "generateEditVideo",
+    "openRenderedVideoInPlayer",
+    "updatePlayblastInVSM",
+}
+# object properties changed by the user interaction or derived from other ones
+_OBJECT_EXCLUDED = {"mode", "active_material_index"}
+
+
+def _getRnaValues(struct, excluded=None):
+    """Return the list of the (identifier, value) of the simple properties of the RNA struct"""
+    values = []
+    if struct is None:
+        return values
+    for prop in struct.bl_rna.properties:
+        identifier = prop.identifier
+        if prop.type not in ("BOOLEAN", "INT", "FLOAT", "STRING", "ENUM"):
+            continue
+        if identifier.startswith("matrix_") or (excluded is not None and identifier in excluded):
+            continue
+        try:
+            val = getattr(struct, identifier)
+        except Exception:
+            continue
+        if getattr(prop, "is_array", False):
+            val = tuple(val)
+        elif isinstance(val, set):
+            val = tuple(sorted(val))
+        values.append((identifier, val))
+    return values
+
+
+def _getAnimationData(idBlock):
+    return getattr(idBlock, "animation_data", None) if idBlock is not None else None
+
+
+def _getAnimatedPaths(animData):
+    """Return the set of the first components of the data paths animated or driven in the animation data"""
+    paths = set()
+    if animData is None:
+        return paths
+    fcurves = list(animData.drivers)
+    if animData.action is not None:
+        fcurves.extend(animData.action.fcurves)
+    for fcurve in fcurves:
+        paths.add(fcurve.data_path.split(".")[0].split("[")[0])
+    return paths
+
+
+class RenderManifest:
+    """Fingerprints of the rendered shot videos, stored in the render root folder"""
+
+    def __init__(self, rootPath):
+        self.filepath = os.path.join(rootPath, _MANIFEST_FILENAME)
+        self.shots = dict()
+        # fingerprints set by this rendering, the other ones may have been updated on disk meanwhile
+        # by other processes rendering in the same folder
+        self._updatedShots = dict()
+        self.load()
+
+    def load(self):
+        self.shots = dict()
+        if not os.path.exists(self.filepath):
+            return
+        try:
+            with open(self.filepath, "r") as f:
+                content = json.load(f)
+            if _FINGERPRINT_VERSION == content.get("version", None):
+                self.shots = content.get("shots", dict())
+        except Exception as e:
+            _logger.warning_ext(f"Render manifest cannot be read, all the shots will be rendered: {e}")
+
+    def save(self):
+        self.load()
+        self.shots.update(self._updatedShots)
+        content = {"version": _FINGERPRINT_VERSION, "shots": self.shots}
+        tmpFilepath = f"{self.filepath}.{os.getpid()}.tmp"
+        try:
+            with open(tmpFilepath, "w") as f:
+                json.dump(content, f, indent=4)
+            os.replace(tmpFilepath, self.filepath)
+        except Exception as e:
+            _logger.error_ext(f"Render manifest cannot be written: {self.filepath}: {e}")
+
+    def isShotUpToDate(self, mediaPath, fingerprint):
+        """Return True if the media file exists and has been rendered with the same fingerprint"""
+        return os.path.exists(mediaPath) and fingerprint == self.shots.get(os.path.normpath(mediaPath), None)
+
+    def setShotFingerprint(self, mediaPath, fingerprint):
+        self.shots[os.path.normpath(mediaPath)] = fingerprint
+        self._updatedShots[os.path.normpath(mediaPath)] = fingerprint
+
+
+class ShotFingerprinter:
+    """Compute the fingerprints of the shots of a take for a rendering.
+
+    The fingerprinter must be created once the render settings are applied and used only during the
+    rendering it has been created for: the settings and the static state of the scene are read once
+    and the keyframes of the actions are cached.
+    """
+
+    def __init__(self, scene, props, renderPreset, stampInfoSettings=None):
+        self.scene = scene
+        self.props = props
+
+        settings = [
+            ("render", _getRnaValues(scene.render, _RENDER_SETTINGS_EXCLUDED)),
+            ("image_settings", _getRnaValues(scene.render.image_settings)),
+            ("ffmpeg", _getRnaValues(scene.render.ffmpeg)),
+            ("view_settings", _getRnaValues(scene.view_settings)),
+            ("display_settings", _getRnaValues(scene.display_settings)),
+            ("renderPreset", _getRnaValues(renderPreset, _RENDER_PRESET_EXCLUDED)),
+            ("renderContext", _getRnaValues(props.renderContext)),
+            ("use_project_settings", props.use_project_settings),
+            ("project_output_first_frame", props.project_output_first_frame),
+            ("project_img_name_digits_padding", props.project_img_name_digits_padding),
+            ("sequenceName", props.getSequenceName("FULL")),
+            ("renderShotPrefix", props.getRenderShotPrefix()),
+            ("blenderFile", bpy.data.filepath),
+        ]
+        if stampInfoSettings is not None and stampInfoSettings.stampInfoUsed:
+            settings.append(("stampInfo", _getRnaValues(stampInfoSettings, _STAMPINFO_SETTINGS_EXCLUDED)))
+        self._settingsDigest = self._digest(settings)
+
+        self._objectsDigest = None
+        self._animatedIds = None
+        # per fcurve, the sorted frames of the keys and the values of the keys
+        self._fcurveKeys = dict()
+
+    @staticmethod
+    def _digest(values):
+        return hashlib.sha1(repr(values).encode("utf-8")).hexdigest()
+
+    def _getObjectsDigest(self):
+        """Digest of the properties of the objects of the scene that are not animated"""
+        if self._objectsDigest is None:
+            values = []
+            for obj in sorted(self.scene.objects, key=lambda o: o.name):
+                animatedPaths = _getAnimatedPaths(_getAnimationData(obj))
+                objValues = [
+                    obj.name,
+                    obj.parent.name if obj.parent is not None else "",
+                    obj.data.name if obj.data is not None else "",
+                    _getRnaValues(obj, _OBJECT_EXCLUDED | animatedPaths),
+                    [(m.name, m.type, _getRnaValues(m)) for m in getattr(obj, "modifiers", [])],
+                    [(c.name, c.type, _getRnaValues(c)) for c in getattr(obj, "constraints", [])],
+                ]
+                if obj.data is not None and "CAMERA" == obj.type:
+                    animatedDataPaths = _getAnimatedPaths(_getAnimationData(obj.data))
+                    objValues.append(_getRnaValues(obj.data, animatedDataPaths))
+                values.append(objValues)
+            self._objectsDigest = self._digest(values)
+        return self._objectsDigest
+
+    def _getAnimatedIds(self):
+        """Return the list of the (name, animation data) of the animated datablocks of the scene objects"""
+        if self._animatedIds is None:
+            self._animatedIds = []
+            idBlocks = [self.scene, self.scene.world]
+            for obj in self.scene.objects:
+                idBlocks.append(obj)
+                idBlocks.append(obj.data)
+                idBlocks.append(getattr(obj.data, "shape_keys", None))
+            doneIds = set()
+            for idBlock in idBlocks:
+                animData = _getAnimationData(idBlock)
+                if animData is None or idBlock.as_pointer() in doneIds:
+                    continue
+                doneIds.add(idBlock.as_pointer())
+                self._animatedIds.append((idBlock.name, animData))
+            self._animatedIds.sort(key=lambda item: item[0])
+        return self._animatedIds
+
+    def _getFCurveKeys(self, fcurve):
+        key = fcurve.as_pointer()
+        keys = self._fcurveKeys.get(key, None)
+        if keys is None:
+            frames = []
+            values = []
+            for kp in fcurve.keyframe_points:
+                frames.append(kp.co[0])
+                values.append(
+                    (tuple(kp.co), tuple(kp.handle_left), tuple(kp.handle_right), kp.interpolation, kp.easing)
+                )
+            keys = (frames, values)
+            self._fcurveKeys[key] = keys
+        return keys
+
+    def _getFCurveValues(self, fcurve, frameStart, frameEnd, wholeCurve=False):
+        """Return the keys of the fcurve that have an influence on the range [frameStart, frameEnd]: the keys in the
+        range and the previous and next ones. All the keys are used when the fcurve is cyclic or has modifiers
+        """
+        frames, keyValues = self._getFCurveKeys(fcurve)
+        if wholeCurve or len(fcurve.modifiers):
+            keys = keyValues
+        else:
+            first = max(0, bisect_left(frames, frameStart) - 1)
+            last = bisect_right(frames, frameEnd) + 1
+            keys = keyValues[first:last]
+        return (
+            fcurve.data_path,
+            fcurve.array_index,
+            fcurve.mute,
+            fcurve.extrapolation,
+            [(m.type, _getRnaValues(m)) for m in fcurve.modifiers],
+            keys,
+        )
+
+    def _getAnimationValues(self, frameStart, frameEnd):
+        values = []
+        for name, animData in self._getAnimatedIds():
+            idValues = [name]
+            for driver in animData.drivers:
+                idValues.append((driver.data_path, driver.array_index, driver.driver.expression))
+            if animData.action is not None:
+                for fcurve in animData.action.fcurves:
+                    idValues.append(self._getFCurveValues(fcurve, frameStart, frameEnd))
+            # strips can be moved and scaled in time so their whole actions are used
+            for track in animData.nla_tracks:
+                for strip in track.strips:
+                    idValues.append(_getRnaValues(strip))
+                    if strip.action is not None:
+                        for fcurve in strip.action.fcurves:
+                            idValues.append(self._getFCurveValues(fcurve, frameStart, frameEnd, wholeCurve=True))
+            values.append(idValues)
+        return values
+
+    def _getGreasePencilValues(self, frameStart, frameEnd):
+        """Return the grease pencil frames displayed in the range [frameStart, frameEnd]"""
+        values = []
+        for obj in sorted(self.scene.objects, key=lambda o: o.name):
+            if "GPENCIL" != obj.type or obj.data is None:
+                continue
+            gpValues = [obj.name, _getRnaValues(obj.data)]
+            for layer in obj.data.layers:
+                gpValues.append(_getRnaValues(layer))
+                frames = list(layer.frames)
+                frameNumbers = [f.frame_number for f in frames]
+                # a grease pencil frame is displayed until the next one
+                first = max(0, bisect_right(frameNumbers, frameStart) - 1)
+                last = bisect_right(frameNumbers, frameEnd)
+                for gpFrame in frames[first:last]:
+                    strokes = []
+                    for stroke in gpFrame.strokes:
+                        points = [0.0] * (3 * len(stroke.points))
+                        stroke.points.foreach_get("co", points)
+                        pressures = [0.0] * len(stroke.points)
+                        stroke.points.foreach_get("pressure", pressures)
+                        strokes.append((stroke.material_index, stroke.line_width, points, pressures))
+                    gpValues.append((gpFrame.frame_number, strokes))
+            values.append(gpValues)
+        return values
+
+    def getShotFingerprint(self, shot, frameStart, frameEnd):
+        """Return the fingerprint of the shot rendered in the range [frameStart, frameEnd]"""
+        take = shot.getParentTake()
+        # getParentTake() returns -1 when the take is not found
+        if -1 == take:
+            take = None
+        shotValues = [
+            shot.name,
+            shot.start,
+            shot.end,
+            shot.enabled,
+            shot.camera.name if shot.camera is not None else "",
+            shot.note01,
+            shot.note02,
+            shot.note03,
+            shot.getEditStart(referenceLevel="GLOBAL_EDIT"),
+            frameStart,
+            frameEnd,
+            take.getName_PathCompliant() if take is not None else "",
+            take.note01 if take is not None else "",
+            self.props.getEditDuration(),
+        ]
+
+        values = [
+            _FINGERPRINT_VERSION,
+            self._settingsDigest,
+            self._getObjectsDigest(),
+            shotValues,
+            self._getAnimationValues(frameStart, frameEnd),
+            self._getGreasePencilValues(frameStart, frameEnd),
+        ]
+        return self._digest(values)
@@ -0,0 +1,165 @@
+# GPLv3 License
+#
+# Copyright (C) 2021 Ubisoft
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Output paths of a rendering session
+
+props.getOutputMediaPath() is evaluated once per output media and entity, the paths of the frames are then
+formated from the compiled template by string substitution.
+The session also lists the files produced by the rendering in a json manifest written in the render root
+folder, next to the render manifest, so that other tools can read the paths instead of computing them.
+"""
+
+import os
+import json
+
+import bpy
+
+from shotmanager.config import sm_logging
+
+_logger = sm_logging.getLogger(__name__)
+
+
+_OUTPUT_FILES_VERSION = 1
+_OUTPUT_FILES_PREFIX = "_ShotManager_OutputFiles_"
+
+
+def getOutputFilesManifestPath(rootPath, take):
+    return os.path.join(rootPath, f"{_OUTPUT_FILES_PREFIX}{take.getName_PathCompliant()}.json")
+
+
+class OutputMediaPathTemplate:
+    """Path of an output media of an entity, compiled so that the path of each frame is a string substitution"""
+
+    def __init__(self, props, outputMedia, entity, rootPath=None, insertSeqPrefix=False, providePath=True):
+        self.props = props
+        self.outputMedia = outputMedia
+        self.entity = entity
+        self.rootPath = rootPath
+        self.insertSeqPrefix = insertSeqPrefix
+        self.providePath = providePath
+
+        self.genericPath = self._getPropsPath(genericFrame=True)
+        self.prefix = None
+        self.suffix = None
+        self.padding = 0
+
+        frameHashes = props.getFramePadding()
+        pos = self.genericPath.rfind(frameHashes)
+        if -1 != pos:
+            prefix = self.genericPath[:pos]
+            suffix = self.genericPath[pos + len(frameHashes) :]
+            # the compiled template is used only if it gives the same result as the props
+            if prefix + props.getFramePadding(frame=0) + suffix == self._getPropsPath(specificFrame=0):
+                self.prefix = prefix
+                self.suffix = suffix
+                self.padding = len(frameHashes)
+
+        if self.prefix is None:
+            _logger.debug_ext(f"Output path of {outputMedia} cannot be compiled, props are used: {self.genericPath}")
+
+    def _getPropsPath(self, specificFrame=None, genericFrame=False):
+        return self.props.getOutputMediaPath(
+            self.outputMedia,
+            self.entity,
+            rootPath=self.rootPath,
+            insertSeqPrefix=self.insertSeqPrefix,
+            providePath=self.providePath,
+            specificFrame=specificFrame,
+            genericFrame=genericFrame,
+        )
+
+    def getFramePath(self, frame):
+        """Return the path of the specified frame, same as getOutputMediaPath() with specificFrame=frame"""
+        if self.prefix is None:
+            return self._getPropsPath(specificFrame=frame)
+        return self.prefix + str(frame).rjust(self.padding, "0") + self.suffix
+
+
+class OutputPathsSession:
+    """Output paths of the rendering of a take, and list of the files it produces"""
+
+    def __init__(self, props, take, rootPath):
+        self.props = props
+        self.take = take
+        self.rootPath = rootPath
+        self._templates = dict()
+        # output files, by path
+        self._files = dict()
+
+    def getTemplate(self, outputMedia, entity, insertSeqPrefix=False, providePath=True):
+        key = (outputMedia, entity.as_pointer(), insertSeqPrefix, providePath)
+        template = self._templates.get(key, None)
+        if template is None:
+            template = OutputMediaPathTemplate(
+                self.props,
+                outputMedia,
+                entity,
+                rootPath=self.rootPath if providePath else None,
+                insertSeqPrefix=insertSeqPrefix,
+                providePath=providePath,
+            )
+            self._templates[key] = template
+        return template
+
+    def getFramePath(self, outputMedia, entity, frame, insertSeqPrefix=False, providePath=True):
+        return self.getTemplate(outputMedia, entity, insertSeqPrefix, providePath).getFramePath(frame)
+
+    def addFile(self, outputMedia, entity, filepath):
+        """Add a single file, such as a video or a sound, to the list of the produced files"""
+        self._files[os.path.normpath(filepath)] = {"media": outputMedia, "entity": entity.name}
+
+    def getFiles(self):
+        return [dict(path=path, **info) for path, info in self._files.items()]
+
+    def writeManifest(self, filepath=None):
+        """Write the list of the produced files. The files of a previous rendering of the same take that are
+        not produced by this session are kept, the shots of a take can be rendered by separate processes
+        """
+        if filepath is None:
+            filepath = getOutputFilesManifestPath(self.rootPath, self.take)
+
+        files = dict()
+        if os.path.exists(filepath):
+            try:
+                with open(filepath, "r") as f:
+                    content = json.load(f)
+                if _OUTPUT_FILES_VERSION == content.get("version", None):
+                    files = {item["path"]: item for item in content.get("files", [])}
+            except Exception as e:
+                _logger.warning_ext(f"Output files manifest cannot be read, it will be overwritten: {e}")
+        for item in self.getFiles():
+            files[item["path"]] = item
+
+        content = {
+            "version": _OUTPUT_FILES_VERSION,
+            "blend_file": bpy.data.filepath,
+            "scene": self.props.parentScene.name,
+            "take_name": self.take.name,
+            "render_root": self.rootPath,
+            "files": list(files.values()),
+        }
+        tmpFilepath = f"{filepath}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            with open(tmpFilepath, "w") as f:
+                json.dump(content, f, indent=4)
+            os.replace(tmpFilepath, filepath)
+        except Exception as e:
+            _logger.error_ext(f"Output files manifest cannot be written: {filepath}: {e}")
+            return None
+        return filepath
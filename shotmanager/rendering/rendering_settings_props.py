@@ -105,6 +105,31 @@ class UAS_ShotManager_RenderSettings(PropertyGroup):
 
     rerenderExistingShotVideos: BoolProperty(name="Re-render Exisiting Shot Videos", default=True)
 
+    rerenderChangedShotsOnly: BoolProperty(
+        name="Changed Shots Only",
+        description="Re-render only the shots that changed since their last rendering.\n"
+        "The shot range, the camera, the animation, the grease pencil and the render settings are compared\n"
+        "to the ones stored in a manifest in the render folder.\n"
+        "Warning: Modifications of the meshes and of the materials are not detected",
+        default=False,
+    )
+
+    renderInBackgroundJobs: BoolProperty(
+        name="Render in Background Jobs",
+        description="Render each shot in a separated background instance of Blender, several shots being\n"
+        "rendered at the same time. The file is saved before the rendering.\n"
+        "The list of the jobs is written in the render folder so that they can also be dispatched on a render farm",
+        default=False,
+    )
+
+    numBackgroundJobs: IntProperty(
+        name="Jobs",
+        description="Maximum number of shots rendered at the same time by background instances of Blender",
+        min=1,
+        soft_max=16,
+        default=2,
+    )
+
     bypass_rendering_project_settings: BoolProperty(
         name="Bypass Project Settings",
         description="When Project Settings are used this allows the use of custom rendering settings",
@@ -229,6 +254,9 @@ class UAS_ShotManager_RenderSettings(PropertyGroup):
         self.renderOtioFile = False
         self.useStampInfo = True
         self.rerenderExistingShotVideos = True
+        self.rerenderChangedShotsOnly = False
+        self.renderInBackgroundJobs = False
+        self.numBackgroundJobs = 2
         self.bypass_rendering_project_settings = False
         self.generateImageSequence = False
         self.outputMediaMode = "VIDEO"
@@ -24,6 +24,8 @@ import bpy
 from shotmanager.config import config
 from shotmanager.config import sm_logging
 
+from shotmanager.stampinfo.properties import infoImage, infoImage_renderer
+
 _logger = sm_logging.getLogger(__name__)
 
 
@@ -197,6 +199,7 @@ def renderStampedInfoForShot(
     specificFrame=None,
     stampInfoCustomSettingsDict=None,
     verbose=False,
+    pathsSession=None,
 ):
     """Launch the rendering or the frames of the shot, with Stamp Info
 
@@ -207,6 +210,7 @@ def renderStampedInfoForShot(
 
     Args:
         resolution: array [width, height], resolution of the image rendered in Blender
+        pathsSession: OutputPathsSession of the rendering, used to get the paths of the frames
     """
     if not (newTempRenderPath.endswith("/") or newTempRenderPath.endswith("\\")):
         newTempRenderPath += "\\"
@@ -339,20 +343,38 @@ def renderStampedInfoForShot(
     elif not render_handles:
         render_frame_end = shot.end
 
+    # edit times of all the frames of the shot, computed in one call
+    editFrames = props.getEditTimes(shot, render_frame_start, render_frame_end, referenceLevel="GLOBAL_EDIT")
+
+    # in parallel mode the loop only collects the snapshots of the frames, the images are drawn afterwards
+    # by a pool of processes
+    prefs = config.getAddonPrefs()
+    useParallelRendering = prefs.stampInfo_useParallelRendering and render_frame_start < render_frame_end
+    framesData = []
+    framesFilepaths = []
+
+    # the scene is evaluated only for the frames where the camera data cannot be read directly
+    frameEvaluator = infoImage.StampFrameEvaluator(scene)
+
     for f, currentFrame in enumerate(range(render_frame_start, render_frame_end + 1)):
 
         # TODO
         renderStampedInfoForFrame(scene, currentFrame)
 
-        # scene.frame_current = currentFrame
-        scene.frame_set(currentFrame)
+        frameData = frameEvaluator.getFrameData(currentFrame, editFrames[f])
+        if frameData is None:
+            # scene.frame_current = currentFrame
+            scene.frame_set(currentFrame)
 
         # scene.render.filepath = shot.getOutputMediaPath(
         #     rootPath=rootPath, insertTempFolder=True, specificFrame=scene.frame_current
         # )
-        scene.render.filepath = shot.getOutputMediaPath(
-            "SH_INTERM_STAMPINFO_SEQ", rootPath=rootPath, specificFrame=scene.frame_current
-        )
+        if pathsSession is None:
+            scene.render.filepath = shot.getOutputMediaPath(
+                "SH_INTERM_STAMPINFO_SEQ", rootPath=rootPath, specificFrame=currentFrame
+            )
+        else:
+            scene.render.filepath = pathsSession.getFramePath("SH_INTERM_STAMPINFO_SEQ", shot, currentFrame)
         #    shotFilename = shot.getName_PathCompliant()
 
         stampInfoSettings.renderRootPath = newTempRenderPath
@@ -369,11 +391,18 @@ def renderStampedInfoForShot(
                 stampInfoSettings.bottomNote = ""
 
         stampInfoSettings.cameraName = shot.camera.name
-        stampInfoSettings.edit3DFrame = props.getEditTime(shot, currentFrame, referenceLevel="GLOBAL_EDIT")
-
-        tmpShotFilename = shot.getOutputMediaPath(
-            "SH_INTERM_STAMPINFO_SEQ", providePath=False, specificFrame=currentFrame
-        )
+        stampInfoSettings.edit3DFrame = editFrames[f]
+        if frameData is None:
+            frameData = infoImage.getStampFrameData(scene, currentFrame)
+
+        if pathsSession is None:
+            tmpShotFilename = shot.getOutputMediaPath(
+                "SH_INTERM_STAMPINFO_SEQ", providePath=False, specificFrame=currentFrame
+            )
+        else:
+            tmpShotFilename = pathsSession.getFramePath(
+                "SH_INTERM_STAMPINFO_SEQ", shot, currentFrame, providePath=False
+            )
         if verbose:
             # txt = "      ------------------------------------------"
             txt = f"Stamp Info Frame:  Shot: {shot.name} {currentFrame}   ( {f + 1} / {numFramesInShot} )"
@@ -383,6 +412,11 @@ def renderStampedInfoForShot(
             # txt += f"\n    stampInfoSettings.renderRootPath: {stampInfoSettings.renderRootPath}"
             _logger.info_ext(txt)
 
+        if useParallelRendering:
+            framesData.append(frameData)
+            framesFilepaths.append(newTempRenderPath + tmpShotFilename)
+            continue
+
         stampInfoSettings.renderTmpImageWithStampedInfo(
             scene,
             currentFrame,
@@ -390,9 +424,18 @@ def renderStampedInfoForShot(
             innerHeight=resolution[1],
             renderPath=newTempRenderPath,
             renderFilename=tmpShotFilename,
+            frameData=frameData,
             verbose=False,
         )
 
+    if useParallelRendering:
+        # settings are the same for all the frames of the shot, the snapshot must be done before
+        # the scene state is restored
+        settings = infoImage.getStampSettings(scene, resolutionFramed[0], resolutionFramed[1], resolution[1])
+        infoImage_renderer.renderStampedImagesInPool(
+            settings, framesData, framesFilepaths, numProcesses=prefs.stampInfo_numRenderProcesses
+        )
+
     if verbose:
         txt = "\n------------------------------------------\n"
         _logger.info_ext(txt, col="CYAN")
@@ -728,6 +728,17 @@ def draw3DRenderPanel(self, context):
         col = box.column()
         row = col.row()
         row.prop(props.renderSettingsAll, "rerenderExistingShotVideos")
+        subRow = row.row()
+        subRow.enabled = props.renderSettingsAll.rerenderExistingShotVideos
+        subRow.prop(props.renderSettingsAll, "rerenderChangedShotsOnly")
+
+        row = col.row()
+        row.prop(props.renderSettingsAll, "renderInBackgroundJobs")
+        subRow = row.row()
+        subRow.enabled = props.renderSettingsAll.renderInBackgroundJobs
+        subRow.prop(props.renderSettingsAll, "numBackgroundJobs")
+
+        row = col.row()
         row.prop(props.renderSettingsAll, "generateEditVideo")
 
         row = col.row()
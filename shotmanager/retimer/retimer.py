@@ -21,6 +21,11 @@ Retimer functions
 
 import bpy
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 from shotmanager.utils.utils_markers import sortMarkers
 
 from shotmanager.config import config
@@ -64,6 +69,16 @@ class FCurve:
         self.fcurve.keyframe_points.insert(frame_val, coordinates[1])
 
     def remove_frames(self, start_incl, end_incl, remove_gap=False, roundToNearestFrame=True):
+        if _useVectorizedRetime(self):
+            keys = _FCurveKeysTimes(self)
+            times = keys.co[:, 0]
+            keyframe_points = self.fcurve.keyframe_points
+            for i in reversed(np.flatnonzero((start_incl <= times) & (times <= end_incl))):
+                keyframe_points.remove(keyframe_points[int(i)])
+            if remove_gap:
+                _offset_fCurve_frames(self, end_incl, start_incl - end_incl - 1, roundToNearestFrame)
+            return
+
         to_remove = list()
 
         for k in self.fcurve.keyframe_points:
@@ -266,6 +281,134 @@ def rescale_frame(frame_value, start_incl, end_incl, pivot, factor, roundToNeare
 # fcurve
 ##########################################################################
 
+# fcurves with fewer keys are retimed key per key, converting them to arrays would cost more than it saves
+_VECTORIZED_RETIME_MIN_KEYS = 16
+
+
+def _useVectorizedRetime(fcurve: FCurve):
+    return np is not None and _VECTORIZED_RETIME_MIN_KEYS <= len(fcurve)
+
+
+class _FCurveKeysTimes:
+    """Coordinates of the keys of an fcurve and of their handles, read and written at once with
+    foreach_get() and foreach_set() instead of key per key.
+    The arrays co, handle_left and handle_right have a shape of (number of keys, 2)
+    """
+
+    _ATTRIBUTES = ("co", "handle_left", "handle_right")
+
+    def __init__(self, fcurve: FCurve):
+        self.keyframe_points = fcurve.fcurve.keyframe_points
+        numKeys = len(self.keyframe_points)
+        for attr in self._ATTRIBUTES:
+            buffer = np.empty(numKeys * 2, dtype=np.float32)
+            self.keyframe_points.foreach_get(attr, buffer)
+            # computations are done in double precision, as with the Python floats of the per key path
+            setattr(self, attr, buffer.astype(np.float64).reshape(numKeys, 2))
+
+    def set_times(self, mask, new_times):
+        """Set the time of the masked keys. Their handles are moved by the same offset"""
+        offsets = new_times - self.co[mask, 0]
+        self.co[mask, 0] = new_times
+        self.handle_left[mask, 0] += offsets
+        self.handle_right[mask, 0] += offsets
+
+    def write(self):
+        for attr in self._ATTRIBUTES:
+            self.keyframe_points.foreach_set(attr, getattr(self, attr).astype(np.float32).ravel())
+
+
+def _compute_offsets(frame_values, pivot, factor):
+    """Vectorized version of compute_offset(), without rounding"""
+    duration_to_pivot = pivot - frame_values
+    return duration_to_pivot - duration_to_pivot * factor
+
+
+def _offset_fCurve_frames_vectorized(fcurve: FCurve, start_incl, offset, roundToNearestFrame):
+    keys = _FCurveKeysTimes(fcurve)
+    mask = start_incl <= keys.co[:, 0]
+    if not mask.any():
+        return
+
+    new_times = keys.co[mask, 0] + offset
+    if roundToNearestFrame:
+        new_times = np.round(new_times)
+    keys.set_times(mask, new_times)
+    keys.write()
+
+
+def _rescale_fCurve_frames_vectorized(
+    fcurve: FCurve, start_incl, end_incl, factor, pivot, roundToNearestFrame, keysBeforeRangeMode, keysAfterRangeMode
+):
+    keys = _FCurveKeysTimes(fcurve)
+    times = keys.co[:, 0].copy()
+    before = times < start_incl
+    after = end_incl < times
+
+    rescale_mask = ~(before | after)
+    offset_mask = np.zeros(len(times), dtype=bool)
+    for range_mask, range_mode in ((before, keysBeforeRangeMode), (after, keysAfterRangeMode)):
+        if "RESCALE" == range_mode:
+            rescale_mask |= range_mask
+        elif "OFFSET" == range_mode:
+            offset_mask |= range_mask
+
+    if rescale_mask.any():
+        key_times = times[rescale_mask]
+        new_key_times = key_times + _compute_offsets(key_times, pivot, factor)
+        if roundToNearestFrame:
+            new_key_times = np.round(new_key_times)
+        keys.co[rescale_mask, 0] = new_key_times
+
+        # same as in the per key path: the handles are scaled by the factor corresponding to the final
+        # move of their key, rounding included, except for the keys on the pivot
+        on_pivot = key_times == pivot
+        with np.errstate(divide="ignore", invalid="ignore"):
+            factors = np.where(on_pivot, factor, (new_key_times - pivot) / (key_times - pivot))
+
+        left_handles = keys.handle_left[rescale_mask, 0]
+        right_handles = keys.handle_right[rescale_mask, 0]
+        new_left_handles = left_handles + _compute_offsets(left_handles, pivot, factors)
+        new_right_handles = right_handles + _compute_offsets(right_handles, pivot, factors)
+        keys.handle_left[rescale_mask, 0] = np.where(
+            on_pivot & ~(start_incl < left_handles), left_handles, new_left_handles
+        )
+        keys.handle_right[rescale_mask, 0] = np.where(
+            on_pivot & ~(right_handles < end_incl), right_handles, new_right_handles
+        )
+
+    if offset_mask.any():
+        key_times = times[offset_mask]
+        offsets = np.where(
+            key_times < start_incl,
+            compute_offset(start_incl, pivot, factor, roundToNearestFrame=False),
+            compute_offset(end_incl, pivot, factor, roundToNearestFrame=False),
+        )
+        new_key_times = key_times + offsets
+        if roundToNearestFrame:
+            new_key_times = np.round(new_key_times)
+        keys.set_times(offset_mask, new_key_times)
+
+    keys.write()
+
+
+def _snap_fCurve_frames_vectorized(fcurve: FCurve, start_incl, end_incl, keysBeforeRangeMode, keysAfterRangeMode):
+    keys = _FCurveKeysTimes(fcurve)
+    times = keys.co[:, 0]
+    before = times < start_incl
+    after = end_incl < times
+
+    mask = ~(before | after)
+    if "SNAP" == keysBeforeRangeMode:
+        mask |= before
+    if "SNAP" == keysAfterRangeMode:
+        mask |= after
+    if not mask.any():
+        return
+
+    keys.set_times(mask, np.round(times[mask]))
+    keys.write()
+
 
 def _offset_fCurve_key(key, offset):
     key_time, value = key.co
@@ -284,6 +427,10 @@ def _set_time_fCurve_key(key, new_key_time):
 
 
 def _offset_fCurve_frames(fcurve: FCurve, start_incl, offset, roundToNearestFrame):
+    if _useVectorizedRetime(fcurve):
+        _offset_fCurve_frames_vectorized(fcurve, start_incl, offset, roundToNearestFrame)
+        return
+
     for i in range(len(fcurve)):
         key = fcurve.get_key(i)
         key_time = key.co[0]
@@ -326,6 +473,12 @@ def _rescale_fCurve_frames(
         keysBeforeRangeMode: Action to do on keys located before the specified time range. Can be "DO_NOTHING", "OFFSET", "RESCALE"
         keysAfterRangeMode: Action to do on keys located after the specified time range. Can be "DO_NOTHING", "OFFSET", "RESCALE"
     """
+    if not clamp and _useVectorizedRetime(fcurve):
+        _rescale_fCurve_frames_vectorized(
+            fcurve, start_incl, end_incl, factor, pivot, roundToNearestFrame, keysBeforeRangeMode, keysAfterRangeMode
+        )
+        return
+
     # First pass.
     if clamp:
         remove_pre_start = list()
@@ -444,6 +597,10 @@ def _snap_fCurve_frames(
     """
     # TODO: wkip delete ducplicated keys !!!
 
+    if _useVectorizedRetime(fcurve):
+        _snap_fCurve_frames_vectorized(fcurve, start_incl, end_incl, keysBeforeRangeMode, keysAfterRangeMode)
+        return
+
     # bpy.ops.action.clean(threshold=0.001, channels=False)
     for i in range(len(fcurve)):
         key = fcurve.get_key(i)
@@ -1065,6 +1222,121 @@ def retime_vse(scene, mode, start_frame, end_frame, remove_gap=True):
         remove_time(sed, start_frame, end_frame, remove_gap)
 
 
+class _RetimeTargets:
+    """Unique animated datablocks to retime.
+
+    Actions, materials, node trees and grease pencil data can be used by several objects. They are gathered
+    by pointer before the retiming so that each one is retimed exactly once and the cost of the retiming
+    depends on the amount of unique animation data, not on the number of objects.
+    The fcurves with many keys are retimed in a vectorized way, see retime_fCurve_frames().
+    """
+
+    def __init__(self, retimerApplyToSettings):
+        self.settings = retimerApplyToSettings
+
+        self.actions = dict()
+        self.gpLayers = dict()
+        # datablocks owning the retimed animation, their update is tagged once after the retiming
+        self.animatedIds = dict()
+        self.gpDataIds = dict()
+        self.gpObjectsWithoutAction = dict()
+
+        self._visitedIds = set()
+
+    def _addAnimData(self, idBlock):
+        """Add the action of the datablock. Return False if the datablock has already been visited"""
+        if idBlock is None:
+            return False
+        key = idBlock.as_pointer()
+        if key in self._visitedIds:
+            return False
+        self._visitedIds.add(key)
+
+        animData = idBlock.animation_data
+        if animData is not None and animData.action is not None:
+            self.actions.setdefault(animData.action.as_pointer(), animData.action)
+            self.animatedIds[key] = idBlock
+        return True
+
+    def addObject(self, obj):
+        if obj.type != "GPENCIL":
+            if not self.settings.applyToObjects:
+                return
+
+            self._addAnimData(obj)
+            if obj.data is not None:
+                self._addAnimData(obj.data)
+
+            # shape keys
+            if self.settings.applyToShapeKeys and obj.type == "MESH":
+                self._addAnimData(obj.data.shape_keys)
+
+            # animated materials
+            for matSlot in obj.material_slots:
+                if matSlot is not None and self._addAnimData(matSlot.material):
+                    self._addAnimData(matSlot.material.node_tree)
+
+        elif self.settings.applytToGreasePencil:
+            self._addAnimData(obj)
+
+            # when a stroke has no transform animation it has no action and because of a bug
+            # the stroke frames are not updated. As a turnaround we force an action during the
+            # retiming and remove it afterward
+            if obj.animation_data is None or obj.animation_data.action is None:
+                self.gpObjectsWithoutAction[obj.as_pointer()] = obj
+
+            gpData = obj.data
+            if gpData.as_pointer() not in self.gpDataIds:
+                self.gpDataIds[gpData.as_pointer()] = gpData
+                for layer in gpData.layers:
+                    if not layer.lock or self.settings.includeLockAnim:
+                        self.gpLayers[layer.as_pointer()] = layer
+
+    def addScene(self, scene):
+        """Add the animation of the scene properties, of the compositing nodes and of the world"""
+        self._addAnimData(scene)
+        self._addAnimData(scene.node_tree)
+        if self._addAnimData(scene.world):
+            self._addAnimData(scene.world.node_tree)
+
+    def retime(self, retime_args, roundToNearestFrame, keysBeforeRangeMode, keysAfterRangeMode):
+        includeLockAnim = self.settings.includeLockAnim
+        for action in self.actions.values():
+            for fcurve in action.fcurves:
+                if not fcurve.lock or includeLockAnim:
+                    retime_fCurve_frames(
+                        FCurve(fcurve), *retime_args, roundToNearestFrame, keysBeforeRangeMode, keysAfterRangeMode
+                    )
+
+        if not len(self.gpLayers):
+            return
+
+        action_tmp = None
+        if len(self.gpObjectsWithoutAction):
+            # NOTE: the temporary action should be removed but this returns an error message in the log:
+            # ERROR (bke.lib_id_delete): C:\Users\blender\git\blender-v320\blender.git\source\blender\blenkernel\intern\lib_id_delete.c:344
+            # id_delete: Deleting ACRetimer_TmpAction which still has 1 users (including 0 'extra' shallow users)
+            # bpy.data.actions.remove(action_tmp)
+            action_tmp = bpy.data.actions.new("Retimer_TmpAction")
+            for obj in self.gpObjectsWithoutAction.values():
+                if obj.animation_data is None:
+                    obj.animation_data_create()
+                obj.animation_data.action = action_tmp
+
+        for layer in self.gpLayers.values():
+            retime_GPframes(layer, *retime_args, roundToNearestFrame, keysBeforeRangeMode, keysAfterRangeMode)
+
+        for obj in self.gpObjectsWithoutAction.values():
+            obj.animation_data.action = None
+
+    def tagUpdates(self):
+        """Tag the retimed datablocks for update, once each, instead of re-assigning their actions"""
+        for idBlock in self.animatedIds.values():
+            idBlock.update_tag(refresh={"TIME"})
+        for gpData in self.gpDataIds.values():
+            gpData.update_tag()
+
+
 def retimeScene(
     *,
     context,
@@ -1110,103 +1382,16 @@ def retimeScene(
     retime_args = (mode, start_incl, end_incl, join_gap, factor, pivot)
     #    print("retime_args: ", retime_args)
 
-    # Actions can be linked so we must make sure to only retime them once
-    actions_done = set()
-    action_tmp = bpy.data.actions.new("Retimer_TmpAction")
-
-    def _retimeFcurve(action, addActionToDone=True):
-        if action is not None and action not in actions_done:
-            # wkip can we have animated properties that are not actions?
-            for fcurve in action.fcurves:
-                if not fcurve.lock or retimerApplyToSettings.includeLockAnim:
-                    retime_fCurve_frames(
-                        FCurve(fcurve), *retime_args, roundToNearestFrame, keysBeforeRangeMode, keysAfterRangeMode
-                    )
-            # NOTE: wkip keep the test??
-            if addActionToDone:
-                actions_done.add(action)
-            # _logger.debug_ext(f"_retimerFcurve: actions_done len: {len(actions_done)}")
-
-    sceneMaterials = []
+    # Actions, materials and grease pencil data can be shared by several objects so the unique
+    # animated datablocks are gathered first, then each one is retimed only once
+    retimeTargets = _RetimeTargets(retimerApplyToSettings)
     for obj in objects:
-        # print(f"Retiming object named: {obj.name}")
-
-        # standard object keyframes
-        if retimerApplyToSettings.applyToObjects:
-            if obj.type != "GPENCIL":
-                if obj.animation_data is not None:
-                    _retimeFcurve(obj.animation_data.action)
-
-                # data animation
-                if obj.data is not None and obj.data.animation_data is not None:
-                    _retimeFcurve(obj.data.animation_data.action)
-
-                # shape keys
-                if retimerApplyToSettings.applyToShapeKeys:
-                    if (
-                        obj.type == "MESH"
-                        and obj.data.shape_keys is not None
-                        and obj.data.shape_keys.animation_data is not None
-                    ):
-                        _retimeFcurve(obj.data.shape_keys.animation_data.action)
-
-                # animated materials
-                for matSlot in obj.material_slots:
-                    if matSlot is not None:
-                        mat = matSlot.material
-                        if mat is not None and mat not in sceneMaterials:
-                            sceneMaterials.append(mat)
-                            if mat.animation_data is not None and mat.animation_data.action is not None:
-                                _retimeFcurve(mat.animation_data.action)
-                            if (
-                                mat.node_tree.animation_data is not None
-                                and mat.node_tree.animation_data.action is not None
-                            ):
-                                _retimeFcurve(mat.node_tree.animation_data.action)
-
-        # grease pencil
-        if retimerApplyToSettings.applytToGreasePencil:
-            #    retime_args = (mode, start_incl, end_incl, join_gap, factor, pivot)
-
-            if obj.type == "GPENCIL":
-                action_tmp_added = False
+        retimeTargets.addObject(obj)
+    if retimerApplyToSettings.applyToWorldAndScene:
+        retimeTargets.addScene(scene)
 
-                if obj.animation_data is None:
-                    obj.animation_data_create()
-
-                if obj.animation_data is not None:
-                    # when a stroke has no transform animation it has no action and because of a bug
-                    # the stroke frames are not updated. As a turnaround we force an action and
-                    # remove it afterward
-                    if obj.animation_data.action is None:
-                        obj.animation_data.action = action_tmp
-                        action_tmp_added = True
-
-                    _retimeFcurve(obj.animation_data.action, addActionToDone=not action_tmp_added)
-                    # action = obj.animation_data.action
-                    # if action is not None and action not in actions_done:
-                    #     for fcurve in action.fcurves:
-                    #         if not fcurve.lock or retimerApplyToSettings.includeLockAnim:
-                    #             retime_fCurve_frames(FCurve(fcurve), *retime_args, roundToNearestFrame)
-                    #     if not action_tmp_added:
-                    #         actions_done.add(action)
-
-                for layer in obj.data.layers:
-                    #    print(f"Treating GP object: {obj.name} layer: {layer}")
-                    if not layer.lock or retimerApplyToSettings.includeLockAnim:
-                        retime_GPframes(
-                            layer, *retime_args, roundToNearestFrame, keysBeforeRangeMode, keysAfterRangeMode
-                        )
-
-                if action_tmp_added:
-                    obj.animation_data.action = None
-
-        # force an update on the actions (cause bug. Other approach would be to save the file and reload it)
-        if obj.animation_data is not None:
-            if obj.animation_data.action is not None:
-                action_backup = obj.animation_data.action
-                obj.animation_data.action = None
-                obj.animation_data.action = action_backup
+    retimeTargets.retime(retime_args, roundToNearestFrame, keysBeforeRangeMode, keysAfterRangeMode)
+    retimeTargets.tagUpdates()
 
     # VSE
     # no operation for CLEAR_ANIM
@@ -1313,9 +1498,4 @@ def retimeScene(
         new_current_frame = min(new_current_frame, rangeEnd)
         scene.frame_set(new_current_frame)
 
-    # NOTE: should be kept but returns an error message in the log:
-    # ERROR (bke.lib_id_delete): C:\Users\blender\git\blender-v320\blender.git\source\blender\blenkernel\intern\lib_id_delete.c:344
-    # id_delete: Deleting ACRetimer_TmpAction which still has 1 users (including 0 'extra' shallow users)
-    # bpy.data.actions.remove(action_tmp)
-
     return ()
@@ -71,6 +71,13 @@ class UAS_Retimer_ApplyToSettings(PropertyGroup):
         options=set(),
     )
 
+    applyToWorldAndScene: BoolProperty(
+        name="World and Scene",
+        description="Apply time change to the animation of the world and of the scene properties",
+        default=True,
+        options=set(),
+    )
+
     applyToMarkers: BoolProperty(
         name="Markers",
         description="Apply time change to markers",
@@ -135,6 +142,7 @@ class UAS_Retimer_ApplyToSettings(PropertyGroup):
             self.applyToObjects = True
             self.applyToShapeKeys = True
             self.applytToGreasePencil = True
+            self.applyToWorldAndScene = True
 
             self.applyToMarkers = True
 
@@ -159,6 +167,7 @@ class UAS_Retimer_ApplyToSettings(PropertyGroup):
             self.applyToObjects = True
             self.applyToShapeKeys = True
             self.applytToGreasePencil = True
+            self.applyToWorldAndScene = False
 
             self.applyToMarkers = False
 
@@ -183,6 +192,7 @@ class UAS_Retimer_ApplyToSettings(PropertyGroup):
             self.applyToObjects = True
             self.applyToShapeKeys = True
             self.applytToGreasePencil = True
+            self.applyToWorldAndScene = False
 
             self.applyToMarkers = False
 
@@ -207,6 +217,7 @@ class UAS_Retimer_ApplyToSettings(PropertyGroup):
             self.applyToObjects = True
             self.applyToShapeKeys = True
             self.applytToGreasePencil = True
+            self.applyToWorldAndScene = False
 
             self.applyToMarkers = False
 
@@ -151,6 +151,7 @@ def drawApplyTo(context, retimerProps, layout):
             row.prop(retimerApplyToSettings, "applytToGreasePencil")
 
             row = col.row(align=True)
+            row.prop(retimerApplyToSettings, "applyToWorldAndScene")
             row.prop(retimerApplyToSettings, "applyToMarkers")
 
         row = col.row(align=True)
@@ -0,0 +1,1075 @@
+# GPLv3 License
+#
+# Copyright (C) 2022 Ubisoft
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Drawing of the frame images with PIL
+
+This module depends neither on Blender nor on the add-on: it works on plain snapshots of the Stamp Info
+settings and of the frame data, built by infoImage.py. This allows it to be imported by the worker
+processes used to render the images of a sequence in parallel.
+
+The frame image is made of 2 layers:
+    - a static layer, containing the borders, the logo and all the texts that don't change during a shot.
+      It is cached in memory and rebuilt only when the settings snapshot changes,
+    - a dynamic layer, drawn on a copy of the static one for each frame, with the frame counters,
+      the edit index, the date and time and the camera information.
+"""
+
+import os
+import sys
+import math
+import getpass
+import logging
+import importlib
+import multiprocessing
+from pathlib import Path
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from datetime import datetime
+
+# the add-on logger cannot be used here since this module is also imported out of Blender
+_logger = logging.getLogger(__name__)
+
+
+# static layers are full resolution RGBA images so only a few of them are kept
+_STATIC_LAYERS_CACHE_SIZE = 2
+
+# number of chunks of frames given to each worker process, to balance the load between them
+_CHUNKS_PER_PROCESS = 4
+
+_staticLayersCache = OrderedDict()
+_fontsCache = dict()
+_logosCache = dict()
+
+
+def clearStampedImageCaches():
+    """Release the cached static layers, fonts and logos"""
+    _staticLayersCache.clear()
+    _fontsCache.clear()
+    _logosCache.clear()
+
+
+def _getFont(size):
+    from PIL import ImageFont
+
+    font = _fontsCache.get(size, None)
+    if font is None:
+        font = ImageFont.truetype("arial", size)
+        _fontsCache[size] = font
+    return font
+
+
+def _getSettingsHash(settings):
+    """Return a key identifying the static layer: it changes as soon as one of the values of the snapshot
+    of the settings is modified
+    """
+    return hash(tuple(sorted(vars(settings).items())))
+
+
+class _StampLayout:
+    """Dimensions, fonts and colors of the frame image, computed from the Stamp Info settings"""
+
+    def __init__(self, settings):
+        # Notes
+        #   - Image origine is at TOP LEFT corner
+        #   - Everything is proportionnal to the HEIGHT of the output image
+        renderW = settings.renderW
+        renderH = settings.renderH
+        innerH = settings.innerH
+        self.renderW = renderW
+        self.renderH = renderH
+
+        paddingLeftMetadataTopNorm = 0.0
+        paddingLeftMetadataBottomNorm = 0.0
+
+        # stamp_background
+        # stamp_font_size
+        # stamp_foreground
+        # stamp_note_text
+        # use_stamp
+        # use_stamp_camera
+        # use_stamp_date
+        # use_stamp_filename
+        # use_stamp_frame
+        # use_stamp_frame_range
+        # use_stamp_hostname
+        # use_stamp_labels
+        # use_stamp_lens
+        # use_stamp_marker
+        # use_stamp_memory
+        # use_stamp_note
+        # use_stamp_render_time
+        # use_stamp_scene
+        # use_stamp_sequencer_strip
+        # use_stamp_strip_meta
+        # use_stamp_time
+        # support of metadata from Blender
+
+        # !!! Removed !!! Wkip: to rewrite in a smarter way !!!
+        # if scene.render.use_stamp:
+        # if False:
+        #     if (
+        #         scene.render.use_stamp_filename
+        #         or scene.render.use_stamp_date
+        #         or scene.render.use_stamp_render_time
+        #         or scene.render.use_stamp_hostname
+        #         or scene.render.use_stamp_note
+        #         or scene.render.use_stamp_frame_range
+        #         or scene.render.use_stamp_memory
+        #     ):
+        #         paddingLeftMetadataTopNorm = 0.2
+
+        #     if (
+        #         scene.render.use_stamp_marker
+        #         or scene.render.use_stamp_time
+        #         or scene.render.use_stamp_frame
+        #         or scene.render.use_stamp_camera
+        #         or scene.render.use_stamp_lens
+        #         or scene.render.use_stamp_sequencer_strip
+        #         or scene.render.use_strip_meta
+        #     ):
+        #         paddingLeftMetadataBottomNorm = 0.2
+
+        self.borderTopH = max(
+            int((renderH - innerH) * 0.5), 0
+        )  # border cannot be negative, which happens if render ratio < inner ratio
+        self.borderBottomH = self.borderTopH
+
+        # ---------- framing control settings ----------------
+        paddingTopExtNorm = settings.extPaddingNorm
+        # 0.03      # padding near the exterior of the image on the border rectangle
+        paddingTopIntNorm = 0.04  # not used here # padding near the interior of the image on the border rectangle
+        self.paddingLeftNorm = settings.extPaddingHorizNorm
+
+        textLineNorm = settings.fontScaleHNorm
+        textInterlineNorm = settings.interlineHNorm  # 0.01
+        self.numLinesTop = 3
+        self.numLinesBottom = self.numLinesTop
+
+        if settings.automaticTextSize:
+            borderTopNorm = min(0.5, self.borderTopH / renderH)
+            paddingTopExtNormInBorder = settings.extPaddingNorm * 10.0  # 0.2
+            paddingTopIntNormInBorder = 0.1
+            paddingTopExtNorm = paddingTopExtNormInBorder * borderTopNorm
+            paddingTopIntNorm = paddingTopIntNormInBorder * borderTopNorm
+
+            textInterlineNormInBorder = settings.interlineHNorm  # 0.04
+            textInterlineNorm = textInterlineNormInBorder * borderTopNorm
+
+            textBorderNorm = borderTopNorm - paddingTopExtNorm - paddingTopIntNorm
+            if textBorderNorm <= (self.numLinesTop - 1) * textInterlineNorm:
+                textBorderNorm = 0.0
+                textLineNorm = 0.0
+            else:
+                textLineNorm = min(textLineNorm, (textBorderNorm - (self.numLinesTop - 1) * textInterlineNorm) / 3.0)
+
+        # ---------- framing control settings ----------------
+
+        # All dimensions are normalized as if the image had the size 1.0 * 1.0
+        # fontScaleHNorm      = settings.fontScaleHNorm        #0.03
+        # fontsize            = int(fontScaleHNorm * renderH)
+        # font                = ImageFont.truetype("arial", fontsize)
+        # textLineH           = (font.getsize("Aj"))[1]            # line height
+
+        self.textLineH = int(renderH * textLineNorm)
+        self.textInterlineH = int(renderH * textInterlineNorm)
+
+        # fonts are loaded from disk only once per size
+        fontsize = int(1.0 * textLineNorm * renderH)
+        self.font = _getFont(fontsize)
+        self.fontHeight = (self.font.getsize("Text"))[1]
+        fontLargeFactor = 1.6
+        self.fontLarge = _getFont(int(fontsize * fontLargeFactor))
+        self.fontLargeHeight = (self.fontLarge.getsize("Text"))[1]
+
+        self.paddingLeft = int((self.paddingLeftNorm) * renderW)
+        self.paddingLeftMetadataTop = int((paddingLeftMetadataTopNorm) * renderW)
+        self.paddingLeftMetadataBottom = int((paddingLeftMetadataBottomNorm) * renderW)
+        # paddingLeft         = int((paddingLeftNorm + paddingLeftMetadataTopNorm) * renderW)
+        #    paddingRight = paddingLeft
+
+        self.paddingTopExt = int(paddingTopExtNorm * renderH)
+        self.paddingBottomExt = self.paddingTopExt
+        #    paddingTopInt = int(paddingTopIntNorm * renderH)
+        #    paddingBottomInt = paddingTopInt
+
+        borderColorRGB = settings.borderColor  # (0, 0, 0, 255)
+        self.borderColorRGBA = (
+            int(borderColorRGB[0] * 255),
+            int(borderColorRGB[1] * 255),
+            int(borderColorRGB[2] * 255),
+            int(borderColorRGB[3] * 255),
+        )
+
+        textColorRGB = settings.textColor  # (0, 0, 0, 255)
+        self.textColorRGBA = (
+            int(textColorRGB[0] * 255),
+            int(textColorRGB[1] * 255),
+            int(textColorRGB[2] * 255),
+            int(textColorRGB[3] * 255),
+        )
+
+        # textColorWhite = (235, 235, 235, 255)
+
+        # alertColorRGB = settings.textColor
+        alertColorRGB = (0.7, 0.2, 0.2, 255)
+        self.alertColorRGBA = (
+            int(alertColorRGB[0] * 255),
+            int(alertColorRGB[1] * 255),
+            int(alertColorRGB[2] * 255),
+            int(alertColorRGB[3] * 255),
+        )
+
+        # move the content (border + text) toward center
+        self.offsetToCenterH = int(settings.offsetToCenterHNorm * renderH)
+
+        # ---------- positions shared by the static and the dynamic layers ----------------
+        # top border
+        self.col01Top = self.paddingLeft + self.paddingLeftMetadataTop
+        self.currentTextTopForVideoFrames = (
+            self.offsetToCenterH + self.paddingTopExt + self.textLineH + self.textInterlineH
+        )
+        self.currentTextLeftForVideoFrames = renderW * (1.0 - self.paddingLeftNorm)
+
+        # bottom border
+        self.col01Bottom = self.paddingLeft + self.paddingLeftMetadataBottom
+        self.currentTextTopBottom = (
+            renderH
+            - self.paddingBottomExt
+            - self.numLinesBottom * self.textLineH
+            - (self.numLinesBottom - 1) * self.textInterlineH
+            - self.offsetToCenterH
+        )
+        self.currentTextFromBottom = renderH - self.paddingBottomExt - self.textLineH + self.textInterlineH
+
+
+def _getLogoImage(settings, renderH):
+    """Return the logo image resized for the specified render height. The result is cached per file and size
+    If the logo is not found a red fake logo is returned instead
+    """
+    from PIL import Image
+
+    logoFile = settings.logoFile
+
+    filename, extension = os.path.splitext(logoFile)
+    # print('Selected file:', self.filepath)
+    # print('File name:', filename)
+    # print('File extension:', extension)
+
+    logoFilePathIsValid = False
+
+    if os.path.exists(logoFile):
+        logoFilePathIsValid = True
+    else:
+        if settings.logoUsed:
+            _logger.error(f"Logo path is NOT valid: {logoFile}")
+            # wkip mettre alert rouge
+
+    # logoScaleW = 0.09                                         # logo size is in % of width relatively to the outpur render size. In other words: 1.0 => logo width = renderW
+    # logoScaleH = 0.08                                         # logo size is in % of height relatively to the outpur render size. In other words: 1.0 => logo height = renderH
+    logoScaleH = settings.logoScaleH
+
+    cacheKey = None
+    if logoFilePathIsValid:
+        cacheKey = (logoFile, os.path.getmtime(logoFile), logoScaleH, renderH)
+        if cacheKey in _logosCache:
+            return _logosCache[cacheKey]
+
+    imgLogoSource = None
+    if logoFilePathIsValid:
+        imgLogoSource = Image.open(logoFile).convert("RGBA")
+        if imgLogoSource is None:
+            _logger.warning(f"******* Cannot open specified logo !!! *** File: {logoFile} *********")
+            logoFilePathIsValid = False
+    else:
+        imgLogoSource = Image.new("RGBA", (150, 150), "red")
+
+    #   logoScaleH = logoScaleW * imgLogoSource.size[1] * 1.0 / imgLogoSource.size[0]
+    #   newLogoSize = (int(logoScaleW * renderW), int(logoScaleH * renderW)                                         # preserve logo size on widht
+    logoScaleW = logoScaleH * imgLogoSource.size[0] * 1.0 / imgLogoSource.size[1]
+    newLogoSize = (int(logoScaleW * renderH), int(logoScaleH * renderH))  # preserve logo size on height
+
+    #  newLogoSize = (int(logoScale * imgLogoSource.size[0]), int(logoScale * imgLogoSource.size[1]))             # to get a precise logo size when output res in pixels is known
+    imgLogoSource = imgLogoSource.resize(newLogoSize, Image.ANTIALIAS)  # size in pixels # resamplming mode
+
+    if cacheKey is not None:
+        _logosCache[cacheKey] = imgLogoSource
+    return imgLogoSource
+
+
+def _getStaticLayer(settings, layout):
+    """Return the static layer of the frame image, from the cache if the settings didn't change"""
+    settingsHash = _getSettingsHash(settings)
+
+    imgStatic = _staticLayersCache.get(settingsHash, None)
+    if imgStatic is None:
+        imgStatic = _renderStaticLayer(settings, layout)
+        _staticLayersCache[settingsHash] = imgStatic
+        while _STATIC_LAYERS_CACHE_SIZE < len(_staticLayersCache):
+            _staticLayersCache.popitem(last=False)
+    else:
+        _staticLayersCache.move_to_end(settingsHash)
+
+    return imgStatic
+
+
+def _renderStaticLayer(settings, layout):
+    """Draw the borders, the logo and all the information that doesn't change from a frame to another"""
+    from PIL import Image, ImageDraw
+
+    renderW = layout.renderW
+    renderH = layout.renderH
+    borderTopH = layout.borderTopH
+    borderBottomH = layout.borderBottomH
+    paddingLeft = layout.paddingLeft
+    paddingLeftNorm = layout.paddingLeftNorm
+    paddingLeftMetadataTop = layout.paddingLeftMetadataTop
+    paddingTopExt = layout.paddingTopExt
+    paddingBottomExt = layout.paddingBottomExt
+    textLineH = layout.textLineH
+    textInterlineH = layout.textInterlineH
+    offsetToCenterH = layout.offsetToCenterH
+    font = layout.font
+    fontLarge = layout.fontLarge
+    fontHeight = layout.fontHeight
+    fontLargeHeight = layout.fontLargeHeight
+    textColorRGBA = layout.textColorRGBA
+
+    imgInfo = Image.new("RGBA", (renderW, renderH), (0, 0, 0, 0))
+
+    def _debug_drawPadding(borderInd):
+        myCol = (200, 250, 0, 100)
+        if 0 == borderInd:  # top
+            imgBorderRect = Image.new("RGBA", (renderW - 2 * paddingLeft, borderTopH - 2 * paddingTopExt), myCol)
+            imgInfo.paste(imgBorderRect, (paddingLeft, paddingTopExt))
+        else:  # bottom
+            imgBorderRect = Image.new("RGBA", (renderW - 2 * paddingLeft, borderBottomH - 2 * paddingBottomExt), myCol)
+            imgInfo.paste(imgBorderRect, (paddingLeft, renderH - borderBottomH + paddingTopExt))
+        return
+
+    # -------------------------------- #
+    # stamp borders with PIL
+    # -------------------------------- #
+    if settings.borderUsed:
+        imgBorderRect = Image.new("RGBA", (renderW, borderTopH), layout.borderColorRGBA)
+        imgInfo.paste(imgBorderRect, (0, offsetToCenterH))
+        imgBorderRect = Image.new("RGBA", (renderW, borderBottomH), layout.borderColorRGBA)
+        imgInfo.paste(imgBorderRect, (0, renderH - borderBottomH - offsetToCenterH))
+
+    # -------------------------------- #
+    # Debug - Draw text lines
+    # -------------------------------- #
+    if settings.debug_DrawTextLines:
+        currentTextLeft = paddingLeft + paddingLeftMetadataTop
+        currentTextTop = offsetToCenterH + paddingTopExt
+
+        for borderInd in range(0, 2):
+            if 0 == borderInd:  # top
+                numLines = 6  # numLinesTop
+                currentTextLeft = paddingLeft + paddingLeftMetadataTop
+                currentTextTop = offsetToCenterH + paddingTopExt
+                directionSign = 1
+            else:  # bottom
+                numLines = 6  # numLinesBottom
+                currentTextLeft = paddingLeft + paddingLeftMetadataTop
+                currentTextTop = (
+                    renderH
+                    - paddingBottomExt
+                    # - numLines * textLineH
+                    - textLineH
+                    - offsetToCenterH
+                )
+                directionSign = -1
+
+            _debug_drawPadding(borderInd)
+
+            for lineInd in range(0, numLines):
+                # first line top
+                myCol = (255, 20, 0, 200)
+                imgBorderRect = Image.new("RGBA", (80, textLineH), myCol)
+                imgInfo.paste(imgBorderRect, (currentTextLeft + lineInd * 20, currentTextTop))
+
+                # first interline top
+                myCol = (20, 250, 0, 100)
+                imgBorderRect = Image.new("RGBA", (int(1.0 * renderW), textInterlineH), myCol)
+                if 0 == borderInd:  # top
+                    imgInfo.paste(
+                        imgBorderRect, (currentTextLeft + lineInd * 20, currentTextTop + directionSign * textLineH)
+                    )
+                else:  # bottom
+                    imgInfo.paste(
+                        imgBorderRect, (currentTextLeft + lineInd * 20, currentTextTop + directionSign * textInterlineH)
+                    )
+
+                currentTextTop += directionSign * (textLineH + textInterlineH)
+
+    # -------------------------------- #
+    # stamp logo
+    # if the logo is not found a red fake logo is stamped instead
+    # -------------------------------- #
+
+    if settings.logoUsed:
+        logoPositionNorm = [
+            renderW * settings.logoPosNormX,
+            renderH * settings.logoPosNormY,
+        ]  # normalized in range [0,1]
+
+        imgLogoSource = _getLogoImage(settings, renderH)
+
+        # put logo on image in position (0, 0)
+        imgInfo.paste(
+            imgLogoSource, (int(logoPositionNorm[0]), int(logoPositionNorm[1])), mask=imgLogoSource
+        )  # left align
+    # imgInfo.paste(imgLogoSource, (renderW - newLogoSize[0] - paddingRight, paddingRight), mask = imgLogoSource)      # right align
+
+    # put text on image
+    img_draw = ImageDraw.Draw(imgInfo)
+
+    stampLabel = settings.stampPropertyLabel
+    stampValue = settings.stampPropertyValue
+    textProp = ""
+
+    # ---------------------------------
+    # top border
+    # ---------------------------------
+
+    col01 = layout.col01Top
+    col02 = 0.1 * renderW
+    col028 = 0.69 * renderW
+
+    currentTextTop = offsetToCenterH + paddingTopExt
+
+    # ---------- project -------------
+    if settings.projectUsed:
+        textProp = "Project: " if stampLabel and not stampValue else ""
+        textProp += settings.projectName if stampValue else ""
+        img_draw.text((col02, currentTextTop), textProp, font=fontLarge, fill=textColorRGBA)
+
+    # ---------------------
+    # Code for date and time aligned from bottom:
+    # ---------------------
+    currentTextTop = borderTopH - paddingTopExt - fontHeight
+
+    # ---------- user -------------
+    if settings.userNameUsed:
+        textProp = "By: "  # if stampLabel else ""
+        textProp += getpass.getuser() if stampValue else ""
+
+        img_draw.text((col01, currentTextTop), textProp, font=font, fill=textColorRGBA)
+
+    # ---------- date -------------
+    # date and time are in the dynamic layer
+
+    # ------------ corner note ---------------
+    currentTextTop = offsetToCenterH + paddingTopExt / 2.0
+    currentTextRight = renderW * (1.0 - paddingLeftNorm)
+
+    if settings.cornerNoteUsed:
+        # textProp = "Corner Note: " if stampLabel else ""
+        textProp = settings.cornerNote if stampValue else ""
+        img_draw.text(
+            (currentTextRight - (font.getsize(textProp))[0], currentTextTop),
+            textProp,
+            font=font,
+            fill=layout.alertColorRGBA,
+        )
+
+    # ---------- fps and 3D edit -------------
+    currentTextTop = layout.currentTextTopForVideoFrames + textLineH + textInterlineH
+
+    if settings.framerateUsed:
+        textProp = "Framerate: " if stampLabel else ""
+        textProp += str(settings.fps) + " fps" if stampValue else ""
+        img_draw.text(
+            (layout.currentTextLeftForVideoFrames - (font.getsize(textProp))[0], currentTextTop),
+            textProp,
+            font=font,
+            fill=textColorRGBA,
+        )
+
+    # ---------- video duration -------------
+    # currentTextTop += textLineH + textInterlineH
+    if settings.animDurationUsed:
+        textProp = "Duration: "
+        textProp += str(settings.frameEnd - settings.frameStart + 1) + " fr." if stampValue else ""
+        img_draw.text((col028, currentTextTop), textProp, font=font, fill=textColorRGBA)
+
+    # currentTextTop += textLineH + textInterlineH
+
+    # ---------- notes -------------
+    currentTextTop = offsetToCenterH + paddingTopExt
+
+    if settings.notesUsed:
+        # colNotes = col02
+
+        currentBoxTop = currentTextTop - 0.005 * renderH
+        currentBoxBottom = currentTextTop + 4 * (textLineH + textInterlineH) + 0.005 * renderH
+
+        colBoxLeft = 0.26 * renderW
+        colBoxRight = colBoxLeft + 0.43 * renderW
+        colNotesLabel = colBoxLeft + 0.01 * renderW
+        colNotes = colBoxLeft + 0.02 * renderW
+
+        boxLineThickness = max(1, int(0.002 * renderH))
+        textColorGray = (50, 50, 50, 255)
+
+        textProp = "Notes: " if stampLabel else ""
+        img_draw.text((colNotesLabel, currentTextTop), textProp, font=font, fill=textColorRGBA)
+
+        currentTextTop += textLineH + textInterlineH
+        textProp = settings.notesLine01 if stampValue else ("Notes Line 1" if stampLabel else "")
+        img_draw.text((colNotes, currentTextTop), textProp, font=font, fill=textColorRGBA)
+
+        currentTextTop += textLineH + textInterlineH
+        textProp = settings.notesLine02 if stampValue else ("Notes Line 2" if stampLabel else "")
+        img_draw.text((colNotes, currentTextTop), textProp, font=font, fill=textColorRGBA)
+
+        currentTextTop += textLineH + textInterlineH
+        textProp = settings.notesLine03 if stampValue else ("Notes Line 3" if stampLabel else "")
+        img_draw.text((colNotes, currentTextTop), textProp, font=font, fill=textColorRGBA)
+
+        # draw box
+        img_draw.line(
+            [(colBoxLeft, currentBoxTop), (colBoxRight, currentBoxTop)],
+            fill=textColorGray,
+            width=boxLineThickness,
+        )
+        img_draw.line(
+            [(colBoxLeft, currentBoxBottom), (colBoxRight, currentBoxBottom)],
+            fill=textColorGray,
+            width=boxLineThickness,
+        )
+        img_draw.line(
+            [(colBoxLeft, currentBoxTop), (colBoxLeft, currentBoxBottom)],
+            fill=textColorGray,
+            width=boxLineThickness,
+        )
+        img_draw.line(
+            [(colBoxRight, currentBoxTop), (colBoxRight, currentBoxBottom)],
+            fill=textColorGray,
+            width=boxLineThickness,
+        )
+
+    # ---------------------------------
+    # bottom border
+    # ---------------------------------
+
+    col01 = layout.col01Bottom
+    lineTextXEnd = paddingLeft
+    separatorX = 0.015 * renderW
+    currentTextTop = layout.currentTextTopBottom
+    currentTextFromBottom = layout.currentTextFromBottom
+
+    # ---------- shot -------------
+    stampLabel3D = stampLabel or stampValue
+
+    yPos = currentTextTop + -1.0 * fontLargeHeight + 1.0 * textInterlineH
+    if settings.shotUsed:
+        # textProp = "Shot: " if stampLabel3D else ""
+        textProp = settings.shotName if stampValue else ""
+        img_draw.text((col01, yPos), textProp, font=fontLarge, fill=textColorRGBA)  # textColorRGBA
+        lineTextXEnd += (fontLarge.getsize(textProp))[0] + separatorX
+
+    # ---------- shot duration -------------
+    # currentTextTop += fontHeight * (1.2 / fontLargeFactor)
+    if settings.shotDurationUsed:
+        # textProp = "Shot Duration: "
+        textProp = (
+            str(settings.frameEnd - settings.frameStart + 1 - 2 * settings.shotHandles) + " fr." if stampValue else ""
+        )
+        img_draw.text((lineTextXEnd, yPos), textProp, font=font, fill=textColorRGBA)
+        lineTextXEnd += (font.getsize(textProp))[0] + separatorX
+
+    # ---------- sequence -------------
+    if settings.sequenceUsed:
+        textProp = "Seq: " if stampLabel3D else ""
+        textProp += settings.sequenceName if stampValue else ""
+        yPos = currentTextTop + -1.0 * fontHeight + 1.0 * textInterlineH
+        img_draw.text((lineTextXEnd, yPos), textProp, font=font, fill=textColorRGBA)
+        lineTextXEnd += (font.getsize(textProp))[0] + separatorX
+
+    # ---------- take -------------
+    if settings.takeUsed:
+        textProp = "Take: " if stampLabel3D else ""
+        textProp += settings.takeName if stampValue else ""
+        yPos = currentTextTop + -1.0 * fontHeight + 1.0 * textInterlineH
+        img_draw.text((lineTextXEnd, yPos), textProp, font=font, fill=textColorRGBA)
+        lineTextXEnd += (font.getsize(textProp))[0] + separatorX
+
+    # ---------- 3d frames and range -------------
+    # 3D frames are in the dynamic layer
+
+    currentTextTop += textLineH + 2.0 * textInterlineH
+
+    lineTextXEnd = col01
+    # ---------- scene -------------
+    if settings.sceneUsed:
+        textProp = "Scene: " if stampLabel3D else ""
+        textProp += str(settings.sceneName) if stampValue else ""
+        # yPos = currentTextTop
+        yPos = currentTextFromBottom - textInterlineH - textLineH
+        img_draw.text((lineTextXEnd, yPos), textProp, font=font, fill=textColorRGBA)
+        lineTextXEnd += (font.getsize(textProp))[0] + separatorX
+
+    # ---------- bottom note -------------
+    if settings.bottomNoteUsed:
+        # textProp = "Scene: " if stampLabel3D else ""
+        # yPos = currentTextTop
+        yPos = currentTextFromBottom - textInterlineH - textLineH
+        textProp = settings.bottomNote if stampValue else ""
+        img_draw.text((lineTextXEnd, yPos), textProp, font=font, fill=textColorRGBA)
+
+    # ---------- camera -------------
+    # camera and lens are in the dynamic layer
+
+    # ---------- file -------------
+    # currentTextTop += textLineH + textInterlineH  # * 2
+
+    if settings.filenameUsed or settings.filepathUsed:
+        textProp = "Blender file: " if stampLabel else ""
+        if stampValue:
+            filenameStr = ""
+            if "" != settings.customFileFullPath:
+                filenameStr = settings.customFileFullPath
+                if "" == filenameStr:
+                    textProp += "*** Custom File not specified ***"
+            else:
+                filenameStr = settings.blenderFilePath
+                if "" == filenameStr:
+                    textProp += "*** File not saved ***"
+            if "" != filenameStr:
+                # head, tail = ntpath.split(filenameStr)
+                if settings.filepathUsed:
+                    textProp += str(Path(filenameStr).parent) + "\\"
+                if settings.filenameUsed:
+                    textProp += Path(filenameStr).name
+            # textProp  += str(os.path.basename(bpy.data.filepath))
+        # img_draw.text((col01, currentTextTop), textProp, font=font, fill=textColorRGBA)
+        img_draw.text((col01, currentTextFromBottom), textProp, font=font, fill=textColorRGBA)
+
+    return imgInfo
+
+
+def _drawDynamicLayer(settings, layout, frameData, imgInfo):
+    """Draw on imgInfo the information that changes for every frame"""
+    from PIL import ImageDraw
+
+    renderW = layout.renderW
+    textLineH = layout.textLineH
+    textInterlineH = layout.textInterlineH
+    font = layout.font
+    fontLarge = layout.fontLarge
+    textColorRGBA = layout.textColorRGBA
+
+    img_draw = ImageDraw.Draw(imgInfo)
+
+    stampLabel = settings.stampPropertyLabel
+    stampValue = settings.stampPropertyValue
+    stampLabel3D = stampLabel or stampValue
+    textProp = ""
+
+    # ---------------------------------
+    # top border
+    # ---------------------------------
+
+    col01 = layout.col01Top
+    col035 = 0.84 * renderW
+
+    # ---------- date -------------
+
+    # wkip use pytz to get the right time zone
+    currentTextTop = layout.borderTopH - layout.paddingTopExt - layout.fontHeight
+    currentTextTop -= textLineH + textInterlineH
+
+    now = datetime.now()
+    timeStr = now.strftime("%H:%M:%S")
+    if settings.dateUsed:
+        textProp = "Date: " if stampLabel else ""
+        textProp += now.strftime("%b-%d-%Y") if stampValue else ""  # Month abbreviation, day and year
+        if settings.timeUsed:
+            textProp += "  " + timeStr if stampValue else ""
+    elif settings.timeUsed:
+        textProp = "Time: " if stampLabel else ""
+        textProp += "  " + timeStr if stampValue else ""
+
+    if settings.dateUsed or settings.timeUsed:
+        img_draw.text((col01, currentTextTop), textProp, font=font, fill=textColorRGBA)
+
+    # ---------- image sequence indices in video ref system -------------
+    currentTextTopForVideoFrames = layout.currentTextTopForVideoFrames
+    currentTextLeftForVideoFrames = layout.currentTextLeftForVideoFrames
+
+    if settings.videoFrameUsed:
+        # textProp = "Video: " if stampLabel else ""
+        textProp = "Video Frame: "
+
+        if settings.videoFirstFrameIndexUsed:
+            currentImage = frameData.frameCurrent - settings.frameStart + settings.videoFirstFrameIndex
+            firstFrameInd = settings.videoFirstFrameIndex
+            lastFrameInd = settings.frameEnd - settings.frameStart + settings.videoFirstFrameIndex
+        else:
+            currentImage = frameData.frameCurrent - settings.frameStart
+            firstFrameInd = 0
+            lastFrameInd = settings.frameEnd - settings.frameStart
+
+        # _logger.debug_ext(
+        #     f"drawRangesAndFrame: currentImage: {currentImage}, firstFrameInd: {firstFrameInd}, lastFrameInd: {lastFrameInd}"
+        # )
+        drawRangesAndFrame(
+            settings,
+            img_draw,
+            "VIDEOFRAME",
+            currentImage,
+            firstFrameInd,
+            lastFrameInd,
+            settings.shotHandles,
+            settings.currentFrameUsed,
+            settings.animRangeUsed,
+            settings.handlesUsed,
+            currentTextLeftForVideoFrames,
+            currentTextTopForVideoFrames,
+            font,
+            fontLarge,
+            textColorRGBA,
+            settings.frameDigitsPadding,
+        )
+
+    # ---------- 3D edit -------------
+    currentTextTop = currentTextTopForVideoFrames + textLineH + textInterlineH
+
+    if settings.edit3DFrameUsed:
+        textProp = "Index in 3D Edit: " if stampLabel else ""
+        #  textProp += '{:03d}'.format(scene.render.fps) + " fps" if stampValue else ""
+        currentImage = frameData.edit3DFrame
+        totalImages = settings.edit3DTotalNumber
+        textProp += str(int(currentImage)) if stampValue else ""
+        if settings.edit3DTotalNumberUsed:
+            textProp += " / " + str(int(totalImages)) + " fr." if stampValue else ""
+        img_draw.text((col035, currentTextTop), textProp, font=font, fill=textColorRGBA)
+
+    # ---------------------------------
+    # bottom border
+    # ---------------------------------
+
+    col04 = 0.7 * renderW
+    currentTextTop = layout.currentTextTopBottom
+
+    # ---------- 3d frames and range -------------
+    # currentTextTopFor3DFrames += textLineH + textInterlineH
+
+    if settings.currentFrameUsed:
+        currentTextTopFor3DFrames = currentTextTop  # - fontHeight
+        currentTextLeftFor3DFrames = renderW * (1.0 - layout.paddingLeftNorm)
+        drawRangesAndFrame(
+            settings,
+            img_draw,
+            "3DFRAME",
+            frameData.frame,
+            settings.frameStart,
+            settings.frameEnd,
+            settings.shotHandles,
+            settings.currentFrameUsed,
+            settings.animRangeUsed,
+            settings.handlesUsed,
+            currentTextLeftFor3DFrames,
+            currentTextTopFor3DFrames,
+            font,
+            fontLarge,
+            textColorRGBA,
+            settings.frameDigitsPadding,
+        )
+
+    currentTextTop += textLineH + 2.0 * textInterlineH
+
+    # ---------- camera -------------
+    currentTextRight = renderW * (1.0 - layout.paddingLeftNorm)
+
+    if settings.cameraLensUsed:
+        if settings.cameraUsed:
+            textProp = ""
+        else:
+            textProp = "Lens: " if stampLabel else ""
+        # textProp += f"{(scene.camera.data.lens):05.0f}" + " mm" if stampValue else ""       # :05.2f}
+        textProp += (str(int(frameData.cameraLens))).rjust(3, " ") + " mm" if stampValue else ""  # :05.2f}
+        img_draw.text(
+            (currentTextRight - (font.getsize(textProp))[0], currentTextTop), textProp, font=font, fill=textColorRGBA
+        )
+
+    if settings.cameraUsed:
+        if settings.cameraLensUsed:
+            currentTextRight -= (font.getsize(textProp))[0]
+        textProp = "Cam: " if stampLabel3D else ""
+        textProp += str(frameData.cameraName) if stampValue else ""
+        if settings.cameraLensUsed:
+            textProp += "    "
+        # if settings.cameraLensUsed:
+        #     textProp += "   " + (str(int(frameData.cameraLens))).rjust(3, " ") + " mm" if stampValue else ""
+        # img_draw.text(
+        #     (currentTextRight - (font.getsize(textProp))[0], currentTextTop), textProp, font=font, fill=textColorRGBA,
+        # )
+        img_draw.text(
+            (col04, currentTextTop),
+            textProp,
+            font=font,
+            fill=textColorRGBA,
+        )
+
+
+def renderStampedImageToFile(settings, frameData, filepath):
+    """Draw the frame image and save it to filepath. The parent directory must exist
+    Args:
+        settings: snapshot of the Stamp Info settings, as returned by infoImage.getStampSettings()
+        frameData: snapshot of the frame, as returned by infoImage.getStampFrameData()
+    """
+    layout = _StampLayout(settings)
+
+    # the static layer is shared by all the frames of a shot, the dynamic information is drawn on a copy of it
+    imgInfo = _getStaticLayer(settings, layout).copy()
+    _drawDynamicLayer(settings, layout, frameData, imgInfo)
+
+    try:
+        imgInfo.save(filepath)
+    except BaseException:
+        _logger.error(f"Stamp Info: renderStampedImageToFile Error: Cannot save file: {filepath}")
+        raise
+
+
+def _renderStampedImagesChunk(settings, framesDataAndPaths):
+    """Entry point of the worker processes. Return the number of rendered images"""
+    for frameData, filepath in framesDataAndPaths:
+        renderStampedImageToFile(settings, frameData, filepath)
+    return len(framesDataAndPaths)
+
+
+def _getStandaloneModule():
+    """Return this module imported as a top-level module, so that the worker processes unpickling
+    its functions import only it and not the add-on package, which requires bpy
+    """
+    moduleDir = os.path.dirname(os.path.abspath(__file__))
+    if moduleDir not in sys.path:
+        sys.path.append(moduleDir)
+    return importlib.import_module("infoImage_renderer")
+
+
+def renderStampedImagesInPool(settings, framesData, filepaths, numProcesses=0):
+    """Render the frame images of a sequence in parallel, in a pool of worker processes
+    Args:
+        settings: snapshot of the Stamp Info settings, shared by all the frames
+        framesData: list of the snapshots of the frames to render
+        filepaths: list of the output files, one per frame
+        numProcesses: number of worker processes, 0 to use one process per CPU core
+    Return the number of rendered images
+    """
+    jobs = list(zip(framesData, filepaths))
+    if not len(jobs):
+        return 0
+
+    for dirPath in {os.path.dirname(filepath) for filepath in filepaths}:
+        if "" != dirPath and not os.path.exists(dirPath):
+            try:
+                Path(dirPath).mkdir(parents=True, exist_ok=True)
+            except Exception:
+                print(f"\n*** Creation of the directory failed: {dirPath}\n")
+                raise
+
+    if 0 >= numProcesses:
+        numProcesses = os.cpu_count() or 1
+    numProcesses = min(numProcesses, len(jobs))
+
+    if 1 == numProcesses:
+        return _renderStampedImagesChunk(settings, jobs)
+
+    chunkSize = max(1, math.ceil(len(jobs) / (numProcesses * _CHUNKS_PER_PROCESS)))
+    chunks = [jobs[i : i + chunkSize] for i in range(0, len(jobs), chunkSize)]
+
+    # workers are spawned and not forked since forking the Blender process is not safe.
+    # They are started with the Python interpreter of Blender and inherit its sys.path, hence PIL
+    try:
+        standaloneModule = _getStandaloneModule()
+        numRendered = 0
+        with ProcessPoolExecutor(max_workers=numProcesses, mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = [executor.submit(standaloneModule._renderStampedImagesChunk, settings, c) for c in chunks]
+            for future in futures:
+                numRendered += future.result()
+    except Exception as e:
+        _logger.warning(f"Stamp Info: Parallel rendering failed, images are rendered in the current process: {e}")
+        numRendered = _renderStampedImagesChunk(settings, jobs)
+
+    return numRendered
+
+
+def drawRangesAndFrame(
+    settings,
+    img_draw,
+    framemode,
+    currentFrame,
+    startRange,
+    endRange,
+    handle,
+    frameUsed,
+    rangeUsed,
+    handlesUsed,
+    textRight,
+    textTop,
+    font,
+    fontLarge,
+    color,
+    padding,
+):
+    """
+    framemode can be '3DFRAME' or 'VIDEOFRAME'
+    """
+    #    currentTextTopFor3DFrames += textLineH + textInterlineH
+    #    currentTextLeftFor3DFrames = renderW * (1.0 - 0.05)
+
+    # print(f"currentFrame: {currentFrame}")
+    currentTextTopFor3DFrames = textTop
+    currentTextLeftFor3DFrames = textRight
+    textColorRGBA = color
+    textColorGray = (128, 128, 128, 255)
+    textColorGrayLight = (200, 200, 200, 255)
+    textColorWhite = (235, 235, 235, 255)
+    textColorRed = (200, 100, 100, 255)
+    textColorGreen = (70, 210, 70, 255)
+    textColorOrange = (245, 135, 42, 255)
+
+    # stampLabel = settings.stampPropertyLabel
+    stampValue = settings.stampPropertyValue
+    textProp = ""
+
+    # fontsize            = int(fontScaleHNorm * renderH)
+    # font                = ImageFont.truetype("arial", fontsize)
+    # textLineH           = (font.getsize("Aj"))[1]            # line height
+
+    # text is aligned on the right !!! ###
+
+    if stampValue:
+        if rangeUsed or handlesUsed:
+            textProp = " ]"
+            currentTextLeftFor3DFrames -= (font.getsize(textProp))[0]
+            img_draw.text(
+                (currentTextLeftFor3DFrames, currentTextTopFor3DFrames), textProp, font=font, fill=textColorRGBA
+            )
+
+        if rangeUsed:
+            fmt = f"0{padding}d"
+            textProp = f"{endRange:{fmt}}"
+            currentTextLeftFor3DFrames -= (font.getsize(textProp))[0]
+            textColor = textColorOrange if not handlesUsed and currentFrame == endRange else textColorGray
+            if handlesUsed and (endRange - handle < currentFrame):
+                textColor = textColorRed
+            img_draw.text((currentTextLeftFor3DFrames, currentTextTopFor3DFrames), textProp, font=font, fill=textColor)
+
+        if rangeUsed and handlesUsed:
+            textProp = " / "
+            currentTextLeftFor3DFrames -= (font.getsize(textProp))[0]
+            img_draw.text(
+                (currentTextLeftFor3DFrames, currentTextTopFor3DFrames), textProp, font=font, fill=textColorRGBA
+            )
+
+        if handlesUsed:
+            textProp = f"{(endRange - handle):{fmt}}"
+            currentTextLeftFor3DFrames -= (font.getsize(textProp))[0]
+            textColor = textColorOrange if currentFrame == endRange - handle else textColorGrayLight
+            img_draw.text((currentTextLeftFor3DFrames, currentTextTopFor3DFrames), textProp, font=font, fill=textColor)
+
+        if rangeUsed or handlesUsed:
+            textProp = " / "
+            currentTextLeftFor3DFrames -= (font.getsize(textProp))[0]
+            img_draw.text(
+                (currentTextLeftFor3DFrames, currentTextTopFor3DFrames), textProp, font=font, fill=textColorRGBA
+            )
+
+        if frameUsed:
+            textProp = f"{currentFrame:{fmt}}"
+            currentTextLeftFor3DFrames -= (fontLarge.getsize(textProp))[0]
+            # currentTextHeight = (font.getsize(textProp))[1]
+            textColor = textColorWhite
+            if currentFrame < startRange + handle:
+                textColor = textColorRed
+            elif currentFrame == startRange + handle:
+                textColor = textColorGreen
+            elif currentFrame > endRange - handle:
+                textColor = textColorRed
+            elif currentFrame == endRange - handle:
+                textColor = textColorOrange
+
+            newTextHeight = (fontLarge.getsize(textProp))[1] - (font.getsize(textProp))[1]
+            img_draw.text(
+                (currentTextLeftFor3DFrames, currentTextTopFor3DFrames - newTextHeight),
+                textProp,
+                font=fontLarge,
+                fill=textColor,
+            )
+
+        if (rangeUsed or handlesUsed) and frameUsed:
+            textProp = " /  "
+            currentTextLeftFor3DFrames -= (font.getsize(textProp))[0]
+            img_draw.text(
+                (currentTextLeftFor3DFrames, currentTextTopFor3DFrames), textProp, font=font, fill=textColorRGBA
+            )
+
+        if handlesUsed:
+            textProp = f"{(startRange + handle):{fmt}}"
+            currentTextLeftFor3DFrames -= (font.getsize(textProp))[0]
+            textColor = textColorGreen if currentFrame == startRange + handle else textColorGrayLight
+            img_draw.text((currentTextLeftFor3DFrames, currentTextTopFor3DFrames), textProp, font=font, fill=textColor)
+
+        if rangeUsed and handlesUsed:
+            textProp = " / "
+            currentTextLeftFor3DFrames -= (font.getsize(textProp))[0]
+            img_draw.text(
+                (currentTextLeftFor3DFrames, currentTextTopFor3DFrames), textProp, font=font, fill=textColorRGBA
+            )
+
+        if rangeUsed:
+            textProp = f"{startRange:{fmt}}"
+            currentTextLeftFor3DFrames -= (font.getsize(textProp))[0]
+            textColor = textColorGreen if not handlesUsed and currentFrame == startRange else textColorGray
+            if handlesUsed and (currentFrame < startRange + handle):
+                textColor = textColorRed
+            img_draw.text((currentTextLeftFor3DFrames, currentTextTopFor3DFrames), textProp, font=font, fill=textColor)
+
+        if rangeUsed or handlesUsed:
+            textProp = "[ "
+            currentTextLeftFor3DFrames -= (font.getsize(textProp))[0]
+            img_draw.text(
+                (currentTextLeftFor3DFrames, currentTextTopFor3DFrames), textProp, font=font, fill=textColorRGBA
+            )
+
+    if frameUsed:  # and stampLabel:
+        textProp = ""
+        # textProp += "Handle / " if handlesUsed else ""
+        # textProp += "Range / " if rangeUsed else ""
+        if "3DFRAME" == framemode:
+            textProp += "3D Frame: " if frameUsed else ""
+        else:
+            textProp += "Video Frame: " if frameUsed else ""
+        currentTextLeftFor3DFrames -= (font.getsize(textProp))[0]
+        img_draw.text((currentTextLeftFor3DFrames, currentTextTopFor3DFrames), textProp, font=font, fill=textColorRGBA)
+
+        # if siSettings.sceneFrameHandlesUsed:
+        #     textProp += " / " + '{:03d}'.format(scene.frame_end - siSettings.shotHandles) + " / " if stampValue else ""
+        # if siSettings.sceneFrameRangeUsed:
+        #     textProp += '{:03d}'.format(scene.frame_end) + "]" if stampValue else ""
+        # img_draw.text((currentTextLeftFor3DFrames, currentTextTop ), textProp, font=font, fill=textColorRGBA )
+
+    # if siSettings.sceneFrameRangeUsed:
+    #     textProp = "Range: " if stampLabel else ""
+    #     textProp += "[" + str(scene.frame_start) + " / " + str(scene.frame_end) + "]" if stampValue else ""
+    #     img_draw.text((col03, currentTextTop), textProp, font=font, fill=textColorRGBA )
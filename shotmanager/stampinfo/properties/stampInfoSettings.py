@@ -592,10 +592,12 @@ class UAS_SMStampInfoSettings(bpy.types.PropertyGroup):
         innerHeight=None,
         renderPath=None,
         renderFilename=None,
+        frameData=None,
         verbose=False,
     ):
         """Args:
-        resolution: the resolution frame"""
+        resolution: the resolution frame
+        frameData: snapshot of the frame, read from the scene if None"""
 
         if resolution is None or innerHeight is None:
             renderW = getRenderResolutionForStampInfo(scene, forceMultiplesOf2=True)[0]
@@ -614,6 +616,7 @@ class UAS_SMStampInfoSettings(bpy.types.PropertyGroup):
             innerH,
             renderPath=renderPath,
             renderFilename=renderFilename,
+            frameData=frameData,
             verbose=verbose,
         )
 
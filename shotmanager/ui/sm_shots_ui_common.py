@@ -56,11 +56,17 @@ def drawShotType(scene, layout, props, item, index, current_shot_index, itemHasW
     layout.operator("uas_shot_manager.set_current_shot", icon_value=icon.icon_id, text="").index = index
 
 
-def drawStoryboardRow(layout, props, item, index):
+def drawStoryboardRow(layout, props, item, index, rows=None):
+    """Args:
+    rows: row model of the shots list, as returned by getShotsListRows(). Used to get the grease pencil object
+    """
     row = layout.row(align=True)
     row.scale_x = 1.1
 
-    gp = item.getGreasePencilObject("STORYBOARD")
+    if rows is None:
+        gp = item.getGreasePencilObject("STORYBOARD")
+    else:
+        gp = rows.greasePencilChildren[index] if item.isCameraValid() else None
     if gp is None:
         icon = config.icons_col["ShotManager_CamGPNoShot_32"]
         row.operator("uas_shot_manager.greasepencil_select_and_draw", text="", icon_value=icon.icon_id).index = index
@@ -26,6 +26,8 @@ from shotmanager.utils.utils_os import module_can_be_imported
 
 from . import sm_shots_ui_common
 
+from shotmanager.properties.shots_list_rows import getShotsListRows
+
 from shotmanager.config import config
 from shotmanager.config import sm_logging
 
@@ -53,9 +55,14 @@ class UAS_UL_ShotManager_Items(bpy.types.UIList):
         cameraIsValid = item.isCameraValid()
         itemHasWarnings = not cameraIsValid
 
-        takeContainsSharedCameras = props.isThereSharedCamerasInTake()
+        # values depending on the other shots are computed once for all the rows
+        rows = getShotsListRows(props, data)
+
+        # takeContainsSharedCameras = props.isThereSharedCamerasInTake()
+        takeContainsSharedCameras = rows.takeContainsSharedCameras
         if takeContainsSharedCameras:
-            numSharedCam = props.getNumSharedCamera(item.camera)
+            # numSharedCam = props.getNumSharedCamera(item.camera)
+            numSharedCam = rows.numSharedCameras[index]
         else:
             numSharedCam = 2
 
@@ -106,7 +113,7 @@ class UAS_UL_ShotManager_Items(bpy.types.UIList):
             stbRow.scale_x = 1.0
 
             if props.getCurrentLayout().display_storyboard_in_properties and props.display_greasepencil_in_shotlist:
-                sm_shots_ui_common.drawStoryboardRow(stbRow, props, item, index)
+                sm_shots_ui_common.drawStoryboardRow(stbRow, props, item, index, rows=rows)
 
             if props.getCurrentLayout().display_notes_in_properties and props.display_notes_in_shotlist:
                 sm_shots_ui_common.drawNotesRow(stbRow, props, item, index)
@@ -135,7 +142,8 @@ class UAS_UL_ShotManager_Items(bpy.types.UIList):
             #     ).shotSource = f"[{index},0]"
 
             grid_flow.scale_x = 0.4
-            shotEditStart = item.getEditStart()
+            # shotEditStart = item.getEditStart()
+            shotEditStart = rows.editStarts[index]
             if currentFrame == item.start:
                 if props.highlight_all_shot_frames or current_shot_index == index:
                     grid_flow.alert = True
@@ -190,7 +198,8 @@ class UAS_UL_ShotManager_Items(bpy.types.UIList):
         ###########
         if props.display_edit_times_in_shotlist:
             grid_flow.scale_x = 0.4
-            shotEditEnd = item.getEditEnd()
+            # shotEditEnd = item.getEditEnd()
+            shotEditEnd = rows.editEnds[index]
             if currentFrame == item.end:
                 if props.highlight_all_shot_frames or current_shot_index == index:
                     grid_flow.alert = True
@@ -23,6 +23,8 @@ import bpy
 
 from . import sm_shots_ui_common
 
+from shotmanager.properties.shots_list_rows import getShotsListRows
+
 from shotmanager.config import config
 from shotmanager.config import sm_logging
 
@@ -54,9 +56,14 @@ class UAS_UL_ShotManager_Storyboard_Items(bpy.types.UIList):
         cameraIsValid = item.isCameraValid()
         itemHasWarnings = not cameraIsValid
 
-        takeContainsSharedCameras = props.isThereSharedCamerasInTake()
+        # values depending on the other shots are computed once for all the rows
+        rows = getShotsListRows(props, data)
+
+        # takeContainsSharedCameras = props.isThereSharedCamerasInTake()
+        takeContainsSharedCameras = rows.takeContainsSharedCameras
         if takeContainsSharedCameras:
-            numSharedCam = props.getNumSharedCamera(item.camera)
+            # numSharedCam = props.getNumSharedCamera(item.camera)
+            numSharedCam = rows.numSharedCameras[index]
         else:
             numSharedCam = 2
 
@@ -107,7 +114,7 @@ class UAS_UL_ShotManager_Storyboard_Items(bpy.types.UIList):
             stbRow.scale_x = 1.0
 
             if props.getCurrentLayout().display_storyboard_in_properties and props.display_greasepencil_in_shotlist:
-                sm_shots_ui_common.drawStoryboardRow(stbRow, props, item, index)
+                sm_shots_ui_common.drawStoryboardRow(stbRow, props, item, index, rows=rows)
 
             if props.getCurrentLayout().display_notes_in_properties and props.display_notes_in_shotlist:
                 sm_shots_ui_common.drawNotesRow(stbRow, props, item, index)
@@ -658,9 +658,11 @@ def getSceneVSE(vsm_sceneName, createVseTab=False):
     if not vsm_scene.sequence_editor:
         vsm_scene.sequence_editor_create()
 
-    bpy.context.window.scene = vsm_scene
+    # there is no window in background mode
+    if bpy.context.window is not None:
+        bpy.context.window.scene = vsm_scene
 
-    if createVseTab:
+    if createVseTab and bpy.context.window is not None:
         startup_blend = os.path.join(
             bpy.utils.resource_path("LOCAL"),
             "scripts",
@@ -1004,10 +1006,18 @@ def getMovieClipByPath(filepath):
 
 
 def add_background_video_to_cam(
-    camera: bpy.types.Camera, movie_path, frame_start, alpha=-1, proxyRenderSize="PROXY_50", relative_path=False
+    camera: bpy.types.Camera,
+    movie_path,
+    frame_start,
+    alpha=-1,
+    proxyRenderSize="PROXY_50",
+    relative_path=False,
+    mediaInfo=None,
 ):
     """Camera argument: use camera.data, not the camera object
     proxyRenderSize is PROXY_25, PROXY_50, PROXY_75, PROXY_100, FULL
+    mediaInfo: characteristics of the media returned by utils_media_probe.probeMediaFiles(), if available.
+               Media already known as not readable are not loaded
     Return: the video clip or None if an error occured to read the media or create the clip
     """
     movie_path = Path(movie_path)
@@ -1016,11 +1026,18 @@ def add_background_video_to_cam(
     print(f"   movie_path.name  : {movie_path.name}")
 
     clipIsValid = False
-    if movie_path.is_file():
+    clip = None
+    if mediaInfo is not None and not mediaInfo["valid"]:
+        color = "\033[91m"
+        print(f"{color}\n*** Media cannot be imported: {movie_path} ***{color}")
+        print(f"{color}   {mediaInfo.get('error', '')}{color}")
+    elif movie_path.is_file():
         try:
-            clipIsValid = "FINISHED" in bpy.ops.clip.open(
-                directory=str(movie_path.parent), files=[{"name": movie_path.name}], relative_path=relative_path
-            )
+            # the data API is used instead of the operator to avoid its overhead and the search of the new clip
+            clip = bpy.data.movieclips.load(str(movie_path), check_existing=True)
+            if relative_path and "" != bpy.data.filepath:
+                clip.filepath = bpy.path.relpath(str(movie_path))
+            clipIsValid = True
         except Exception as e:
             # _logger.error("** bpy.context.space_data.lock_camera had an error **")
             color = "\033[91m"
@@ -1033,7 +1050,6 @@ def add_background_video_to_cam(
     if clipIsValid:
         # print("   Finished block")
         # clip = bpy.data.movieclips[movie_path.name]
-        clip = getMovieClipByPath(movie_path)
 
         # required since Blender 3.0 (or earlier?) for the frame_start to be taken into account in the viewport
         clip.use_proxy_custom_directory = True
@@ -21,6 +21,10 @@ Useful functions related to the use of Grease Pencil
 
 # https://towardsdatascience.com/blender-2-8-grease-pencil-scripting-and-generative-art-cbbfd3967590
 
+from array import array
+from bisect import bisect_left, bisect_right
+import heapq
+
 import bpy
 
 import mathutils
@@ -572,38 +576,101 @@ def switchToDrawMode(context, gpencil: bpy.types.GreasePencil):
     return True
 
 
+###################
+# Layer key frames index
+###################
+
+# cached key frames indices, keyed by the pointer of the layer
+_layerFramesIndices = dict()
+
+# cached key frames indices of all the layers, keyed by the pointer of the grease pencil data
+_allLayersFramesIndices = dict()
+
+
+class _LayerFramesIndex:
+    """Frame numbers of the key frames of a layer, sorted, with the index of each key frame in layer.frames"""
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.sortedIndices = sorted(range(len(frames)), key=lambda i: frames[i])
+        self.sortedFrames = [frames[i] for i in self.sortedIndices]
+
+    def getPreviousFrame(self, frame):
+        """Return the frame of the last key before the specified frame, None if there is none"""
+        k = bisect_left(self.sortedFrames, frame)
+        return self.sortedFrames[k - 1] if 0 < k else None
+
+    def getNextFrame(self, frame):
+        """Return the frame of the first key after the specified frame, None if there is none"""
+        k = bisect_right(self.sortedFrames, frame)
+        return self.sortedFrames[k] if k < len(self.sortedFrames) else None
+
+    def getKeyFrameIndex(self, frame):
+        """Return the index in layer.frames of the key at the specified frame, -1 if there is none"""
+        k = bisect_left(self.sortedFrames, frame)
+        if k < len(self.sortedFrames) and frame == self.sortedFrames[k]:
+            return self.sortedIndices[k]
+        return -1
+
+
+def _getLayerFramesIndex(gpLayer):
+    """Return the sorted key frames index of the layer, rebuilt if its key frames have changed.
+    The frame numbers are read with foreach_get so the check stays cheap
+    """
+    frames = array("i", [0]) * len(gpLayer.frames)
+    gpLayer.frames.foreach_get("frame_number", frames)
+
+    key = gpLayer.as_pointer()
+    index = _layerFramesIndices.get(key, None)
+    if index is None or index.frames != frames:
+        index = _LayerFramesIndex(frames)
+        _layerFramesIndices[key] = index
+    return index
+
+
+def _getAllLayersFramesIndex(gpencil: bpy.types.GreasePencil):
+    """Return a frames index merging the key frames of all the layers of the grease pencil, without duplicates.
+    Only the frame queries are valid on it, not the key frame indices
+    """
+    layersIndices = [_getLayerFramesIndex(layer) for layer in gpencil.data.layers]
+
+    key = gpencil.data.as_pointer()
+    cached = _allLayersFramesIndices.get(key, None)
+    if (
+        cached is not None
+        and len(cached[0]) == len(layersIndices)
+        and all(a is b for a, b in zip(cached[0], layersIndices))
+    ):
+        return cached[1]
+
+    mergedFrames = array("i")
+    for f in heapq.merge(*[ind.sortedFrames for ind in layersIndices]):
+        if not len(mergedFrames) or mergedFrames[-1] != f:
+            mergedFrames.append(f)
+    index = _LayerFramesIndex(mergedFrames)
+    _allLayersFramesIndices[key] = (layersIndices, index)
+    return index
+
+
+def _getLayersModeFramesIndex(gpencil: bpy.types.GreasePencil, layerMode):
+    """Return the frames index corresponding to the layer mode, None for "NOLAYER" or if the layer is not found"""
+    if "ALL" == layerMode:
+        return _getAllLayersFramesIndex(gpencil)
+    gpLayer = _getLayerFromMode(gpencil, layerMode)
+    return None if gpLayer is None else _getLayerFramesIndex(gpLayer)
+
+
 def getLayerPreviousFrame(gpencil: bpy.types.GreasePencil, currentFrame, layerMode):
     """Return the time frame value of the previous key of the specified layer
     Args:
         layerMode: Can be "NOLAYER", "ACTIVE", "ALL" or the name of the layer
         Usually comes from props.greasePencil_layersMode
     """
-
-    def _getPrevFrame(gpLayer, frame):
-        for kf in reversed(gpLayer.frames):
-            if kf.frame_number < frame:
-                return kf.frame_number
-        return frame
-
-    previousFrame = currentFrame
-    if "NOLAYER" == layerMode:
-        pass
-    elif "ALL" == layerMode:
-        mins = list()
-        for layer in gpencil.data.layers:
-            prevKeyFrame = _getPrevFrame(layer, currentFrame)
-            if prevKeyFrame < currentFrame:
-                mins.append(prevKeyFrame)
-        if len(mins):
-            previousFrame = max(mins)
-    elif "ACTIVE" == layerMode:
-        gpLayer = gpencil.data.layers.active
-        previousFrame = _getPrevFrame(gpLayer, currentFrame)
-    else:
-        gpLayer = gpencil.data.layers[layerMode]
-        previousFrame = _getPrevFrame(gpLayer, currentFrame)
-
-    return previousFrame
+    index = _getLayersModeFramesIndex(gpencil, layerMode)
+    if index is None:
+        return currentFrame
+    previousFrame = index.getPreviousFrame(currentFrame)
+    return currentFrame if previousFrame is None else previousFrame
 
 
 def getLayerNextFrame(gpencil: bpy.types.GreasePencil, currentFrame, layerMode):
@@ -612,39 +679,16 @@ def getLayerNextFrame(gpencil: bpy.types.GreasePencil, currentFrame, layerMode):
         layerMode: Can be "NOLAYER", "ACTIVE", "ALL" or the name of the layer
         Usually comes from props.greasePencil_layersMode
     """
-
-    def _getNextFrame(gpLayer, frame):
-        for kf in gpLayer.frames:
-            if kf.frame_number > frame:
-                return kf.frame_number
-        return frame
-
-    nextFrame = currentFrame
-    if "NOLAYER" == layerMode:
-        pass
-    elif "ALL" == layerMode:
-        maxs = list()
-        for layer in gpencil.data.layers:
-            nextKeyFrame = _getNextFrame(layer, currentFrame)
-            if currentFrame < nextKeyFrame:
-                maxs.append(nextKeyFrame)
-        if len(maxs):
-            nextFrame = min(maxs)
-    elif "ACTIVE" == layerMode:
-        gpLayer = gpencil.data.layers.active
-        nextFrame = _getNextFrame(gpLayer, currentFrame)
-    else:
-        gpLayer = gpencil.data.layers[layerMode]
-        nextFrame = _getNextFrame(gpLayer, currentFrame)
-
-    return nextFrame
+    index = _getLayersModeFramesIndex(gpencil, layerMode)
+    if index is None:
+        return currentFrame
+    nextFrame = index.getNextFrame(currentFrame)
+    return currentFrame if nextFrame is None else nextFrame
 
 
 def getLayerKeyFrameAtTime(gpLayer, frame):
-    for kf in gpLayer.frames:
-        if kf.frame_number == frame:
-            return kf
-    return None
+    frameInd = _getLayerFramesIndex(gpLayer).getKeyFrameIndex(frame)
+    return gpLayer.frames[frameInd] if -1 != frameInd else None
 
 
 def addLayerKeyFrameAtTime(gpLayer, frame):
@@ -666,30 +710,19 @@ def isCurrentFrameOnLayerKeyFrame(gpencil: bpy.types.GreasePencil, currentFrame,
         layerMode: Can be "NOLAYER", "ACTIVE", "ALL" or the name of the layer
         Usually comes from props.greasePencil_layersMode
     """
-
-    def _isCurrentFrameOnFrame(gpLayer, frame):
-        for kf in gpLayer.frames:
-            if kf.frame_number == frame:
-                return True
+    index = _getLayersModeFramesIndex(gpencil, layerMode)
+    if index is None:
         return False
+    return -1 != index.getKeyFrameIndex(currentFrame)
 
-    currentFrameIsOnGPFrame = False
-    if "" == layerMode or "NOLAYER" == layerMode:
-        pass
-    elif "ALL" == layerMode:
-        for layer in gpencil.data.layers:
-            if _isCurrentFrameOnFrame(layer, currentFrame):
-                currentFrameIsOnGPFrame = True
-                continue
-    elif "ACTIVE" == layerMode:
-        gpLayer = gpencil.data.layers.active
-        currentFrameIsOnGPFrame = _isCurrentFrameOnFrame(gpLayer, currentFrame)
-    else:
-        if layerMode in gpencil.data.layers:
-            gpLayer = gpencil.data.layers[layerMode]
-            currentFrameIsOnGPFrame = _isCurrentFrameOnFrame(gpLayer, currentFrame)
 
-    return currentFrameIsOnGPFrame
+def _getLayerFromMode(gpencil: bpy.types.GreasePencil, layerMode):
+    """Return the layer corresponding to the layer mode, None for "NOLAYER", "ALL" or if the layer is not found"""
+    if "" == layerMode or "NOLAYER" == layerMode or "ALL" == layerMode:
+        return None
+    elif "ACTIVE" == layerMode:
+        return gpencil.data.layers.active
+    return gpencil.data.layers.get(layerMode, None)
 
 
 def getLayerKeyFrameAtFrame(gpencil: bpy.types.GreasePencil, currentFrame, layerMode):
@@ -699,24 +732,10 @@ def getLayerKeyFrameAtFrame(gpencil: bpy.types.GreasePencil, currentFrame, layer
         layerMode: Can be "ACTIVE" or the name of the layer
         Usually comes from props.greasePencil_layersMode
     """
-    if "NOLAYER" == layerMode or "ALL" == layerMode:
+    gpLayer = _getLayerFromMode(gpencil, layerMode)
+    if gpLayer is None:
         return None
-
-    def _getKeyFrameAtFrame(gpLayer, frame):
-        for kf in gpLayer.frames:
-            if kf.frame_number == frame:
-                return kf
-        return None
-
-    keyFrame = None
-    if "ACTIVE" == layerMode:
-        gpLayer = gpencil.data.layers.active
-        keyFrame = _getKeyFrameAtFrame(gpLayer, currentFrame)
-    else:
-        gpLayer = gpencil.data.layers[layerMode]
-        keyFrame = _getKeyFrameAtFrame(gpLayer, currentFrame)
-
-    return keyFrame
+    return getLayerKeyFrameAtTime(gpLayer, currentFrame)
 
 
 def getLayerKeyFrameIndexAtFrame(gpencil: bpy.types.GreasePencil, currentFrame, layerMode):
@@ -726,35 +745,11 @@ def getLayerKeyFrameIndexAtFrame(gpencil: bpy.types.GreasePencil, currentFrame,
         layerMode: Can be "NOLAYER", "ACTIVE", "ALL" or the name of the layer
         Usually comes from props.greasePencil_layersMode
     """
-    if not isCurrentFrameOnLayerKeyFrame(gpencil, currentFrame, layerMode):
-        return -1
-
-    def _getLayerFrameIndexAtFrame(layer, currentFrame):
-        for ind, kf in enumerate(layer.frames):
-            if kf.frame_number == currentFrame:
-                return ind
+    # there is no single key frame index for "ALL", -1 is returned as for "NOLAYER"
+    gpLayer = _getLayerFromMode(gpencil, layerMode)
+    if gpLayer is None:
         return -1
-
-    layerFrameInd = -1
-    if "NOLAYER" == layerMode:
-        return -1
-    elif "ALL" == layerMode:
-        # TODO
-        # for layer in gpencil.data.layers:
-        #     if not layer.lock:
-        #         if not isCurrentFrameOnLayerKeyFrame(gpencil, currentFrame, layer.info):
-        #             layer.frames.new(currentFrame)
-        _logger.debug_ext("getLayerKeyFrameIndexAtFrame TODO", col="RED")
-        # not working: it duplicates existing frames
-        # bpy.ops.gpencil.blank_frame_add(all_layers=True)
-        pass
-    elif "ACTIVE" == layerMode:
-        layerFrameInd = _getLayerFrameIndexAtFrame(gpencil.data.layers.active, currentFrame)
-    else:
-        gpLayer = gpencil.data.layers[layerMode]
-        layerFrameInd = _getLayerFrameIndexAtFrame(gpLayer, currentFrame)
-
-    return layerFrameInd
+    return _getLayerFramesIndex(gpLayer).getKeyFrameIndex(currentFrame)
 
 
 def addKeyFrameToLayer(gpencil: bpy.types.GreasePencil, currentFrame, layerMode):
@@ -19,6 +19,9 @@
 Utils markers
 """
 
+from array import array
+from bisect import bisect_left, bisect_right
+
 
 def sceneContainsCameraBinding(scene):
     for m in scene.timeline_markers:
@@ -46,42 +49,81 @@ def sortMarkers(markers, filter=""):
     return sortedMarkers
 
 
+###################
+# markers index
+###################
+
+# cached markers indices, keyed by the pointer of the scene
+_markersIndices = dict()
+
+
+class _MarkersIndex:
+    """Indices of the markers of a scene sorted by frame. The sort is stable so markers at the same frame keep
+    the order of scene.timeline_markers, as with sortMarkers()
+    """
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.sortedIndices = sorted(range(len(frames)), key=lambda i: frames[i])
+        self.sortedFrames = [frames[i] for i in self.sortedIndices]
+
+
+def _getMarkersIndex(scene):
+    """Return the frame sorted index of the markers of the scene, rebuilt if the markers count or frames have
+    changed. The frames are read with foreach_get so the check stays cheap for thousands of markers
+    """
+    markers = scene.timeline_markers
+    frames = array("i", [0]) * len(markers)
+    markers.foreach_get("frame", frames)
+
+    key = scene.as_pointer()
+    index = _markersIndices.get(key, None)
+    if index is None or index.frames != frames:
+        index = _MarkersIndex(frames)
+        _markersIndices[key] = index
+    return index
+
+
+def _findMarker(scene, index, sortedInd, step, filter="", frame=None):
+    """Return the first marker containing filter in its name found from the position sortedInd in the sorted
+    markers, going forward if step is 1 and backward if step is -1. If frame is specified the search stops at
+    the first marker with another frame.
+    The filter is tested on the current names so markers renamed since the index was built are supported
+    """
+    markers = scene.timeline_markers
+    while 0 <= sortedInd < len(index.sortedIndices):
+        if frame is not None and frame != index.sortedFrames[sortedInd]:
+            return None
+        m = markers[index.sortedIndices[sortedInd]]
+        if filter in m.name:
+            return m
+        sortedInd += step
+    return None
+
+
 def getFirstMarker(scene, frame, filter=""):
-    markers = sortMarkers(scene.timeline_markers, filter)
-    return markers[0] if len(markers) else None
+    index = _getMarkersIndex(scene)
+    return _findMarker(scene, index, 0, 1, filter=filter)
 
 
 def getMarkerBeforeFrame(scene, frame, filter=""):
-    markers = sortMarkers(scene.timeline_markers, filter)
-    previousMarker = None
-    for m in markers:
-        if frame > m.frame:
-            previousMarker = m
-        else:
-            return previousMarker
-    return previousMarker
+    index = _getMarkersIndex(scene)
+    return _findMarker(scene, index, bisect_left(index.sortedFrames, frame) - 1, -1, filter=filter)
 
 
 def getMarkerAtFrame(scene, frame, filter=""):
-    markers = sortMarkers(scene.timeline_markers, filter)
-    for m in markers:
-        # for m in scene.timeline_markers:
-        if frame == m.frame:
-            return m
-    return None
+    index = _getMarkersIndex(scene)
+    return _findMarker(scene, index, bisect_left(index.sortedFrames, frame), 1, filter=filter, frame=frame)
 
 
 def getMarkerAfterFrame(scene, frame, filter=""):
-    markers = sortMarkers(scene.timeline_markers, filter)
-    for m in markers:
-        if frame < m.frame:
-            return m
-    return None
+    index = _getMarkersIndex(scene)
+    return _findMarker(scene, index, bisect_right(index.sortedFrames, frame), 1, filter=filter)
 
 
 def getLastMarker(scene, frame, filter=""):
-    markers = sortMarkers(scene.timeline_markers, filter)
-    return markers[len(markers) - 1] if len(markers) else None
+    index = _getMarkersIndex(scene)
+    return _findMarker(scene, index, len(index.sortedIndices) - 1, -1, filter=filter)
 
 
 def clearMarkersSelection(markers):
@@ -92,7 +134,6 @@ def clearMarkersSelection(markers):
 def addMarkerAtFrame(scene, frame, name):
     marker = getMarkerAtFrame(scene, frame)
     if marker is not None:
-        marker = getMarkerAtFrame(scene, frame)
         marker.name = name
     else:
         if "" == name:
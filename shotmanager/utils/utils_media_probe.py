@@ -0,0 +1,256 @@
+# GPLv3 License
+#
+# Copyright (C) 2020 Ubisoft
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Media probe: read the characteristics of video files from their headers, without loading them in Blender
+
+The files are probed in a pool of worker threads and the results are cached on disk, keyed by the file path,
+modification time and size, so that the next imports of the same media are immediate.
+The functions of this module do not use bpy and can be run outside of the main thread.
+
+Only the headers of the ISO base media files (.mp4, .mov, .m4v) are parsed. For the other formats the probe
+only checks that the file can be read.
+"""
+
+import os
+from pathlib import Path
+import json
+import struct
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from shotmanager.config import sm_logging
+
+_logger = sm_logging.getLogger(__name__)
+
+
+_CACHE_VERSION = 2
+_ISO_MEDIA_EXTENSIONS = (".mp4", ".mov", ".m4v")
+
+# boxes of the iso base media files containing other boxes that are explored
+_CONTAINER_BOXES = (b"moov", b"trak", b"mdia", b"minf", b"stbl")
+
+
+def getMediaProbeCacheFilepath():
+    return os.path.join(tempfile.gettempdir(), "ShotManager", "media_probe_cache.json")
+
+
+def _iterBoxes(f, start, end):
+    """Yield the (type, data start, data end) of the boxes found in the file between start and end"""
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        size, boxType = struct.unpack(">I4s", header)
+        dataStart = pos + 8
+        if 1 == size:
+            largeSize = f.read(8)
+            if len(largeSize) < 8:
+                return
+            size = struct.unpack(">Q", largeSize)[0]
+            dataStart += 8
+        elif 0 == size:
+            size = end - pos
+        if size < dataStart - pos:
+            return
+        yield (boxType, dataStart, min(pos + size, end))
+        pos += size
+
+
+def _readFullBox(f, dataStart, dataEnd, numBytes):
+    """Return the version of the full box and at most numBytes of its data after the version and flags.
+    The data is never read past the end of the box, its length has to be checked by the caller
+    """
+    f.seek(dataStart)
+    data = f.read(max(0, min(4 + numBytes, dataEnd - dataStart)))
+    if len(data) < 4:
+        return (0, b"")
+    return (data[0], data[4:])
+
+
+def _probeIsoMedia(f, fileSize):
+    """Return the characteristics read in the headers of an iso base media file (mp4, mov)"""
+    info = dict()
+
+    def _parseTrack(trakStart, trakEnd):
+        track = dict()
+
+        def _explore(start, end):
+            for boxType, dataStart, dataEnd in _iterBoxes(f, start, end):
+                if boxType in _CONTAINER_BOXES:
+                    _explore(dataStart, dataEnd)
+                elif b"tkhd" == boxType:
+                    version, data = _readFullBox(f, dataStart, dataEnd, 92)
+                    offset = 72 if 0 == version else 84
+                    if len(data) >= offset + 8:
+                        width, height = struct.unpack(">II", data[offset : offset + 8])
+                        track["width"] = width >> 16
+                        track["height"] = height >> 16
+                elif b"hdlr" == boxType:
+                    _version, data = _readFullBox(f, dataStart, dataEnd, 8)
+                    if len(data) >= 8:
+                        track["handler"] = data[4:8]
+                elif b"mdhd" == boxType:
+                    version, data = _readFullBox(f, dataStart, dataEnd, 28)
+                    if 0 == version and len(data) >= 16:
+                        track["timescale"], track["duration"] = struct.unpack(">II", data[8:16])
+                    elif 0 != version and len(data) >= 28:
+                        track["timescale"], track["duration"] = struct.unpack(">IQ", data[16:28])
+                elif b"stts" == boxType:
+                    _version, data = _readFullBox(f, dataStart, dataEnd, 12)
+                    # an empty stts box has no first entry
+                    if len(data) >= 12:
+                        numEntries, _sampleCount, sampleDelta = struct.unpack(">III", data[0:12])
+                        if numEntries:
+                            track["sample_delta"] = sampleDelta
+
+        _explore(trakStart, trakEnd)
+        return track
+
+    for boxType, dataStart, dataEnd in _iterBoxes(f, 0, fileSize):
+        if b"moov" != boxType:
+            continue
+        for subType, subStart, subEnd in _iterBoxes(f, dataStart, dataEnd):
+            if b"trak" != subType:
+                continue
+            track = _parseTrack(subStart, subEnd)
+            if b"vide" != track.get("handler", None) or "timescale" not in track:
+                continue
+            timescale = track["timescale"]
+            if track.get("sample_delta", 0) and timescale:
+                info["fps"] = timescale / track["sample_delta"]
+                info["duration"] = int(round(track["duration"] / track["sample_delta"]))
+            info["width"] = track.get("width", 0)
+            info["height"] = track.get("height", 0)
+            return info
+        break
+
+    return info
+
+
+def probeMediaFile(filepath):
+    """Return a dictionary with the characteristics of the media file:
+        "valid": True if the file can be read
+        "width", "height": resolution of the video, if found
+        "fps": frame rate of the video, if found
+        "duration": duration of the video in frames, if found
+        "error": the reason why the file is not valid
+    The validity only depends on the file being readable. The headers are parsed on a best-effort basis, the
+    characteristics that cannot be read are just missing
+    """
+    info = {"valid": False}
+    try:
+        fileSize = os.path.getsize(filepath)
+        with open(filepath, "rb") as f:
+            f.read(8)
+            info["valid"] = True
+            if Path(filepath).suffix.lower() in _ISO_MEDIA_EXTENSIONS:
+                try:
+                    info.update(_probeIsoMedia(f, fileSize))
+                except Exception as e:
+                    _logger.debug_ext(f"Media probe: Cannot parse the headers of {filepath}: {e}")
+    except Exception as e:
+        info["error"] = str(e)
+    return info
+
+
+class MediaProbe:
+    """Probe of media files in worker threads, with a disk cache of the results"""
+
+    def __init__(self, cacheFilepath=None, numWorkers=8):
+        self.cacheFilepath = getMediaProbeCacheFilepath() if cacheFilepath is None else cacheFilepath
+        self.numWorkers = max(1, numWorkers)
+        self._cache = None
+        self._lock = threading.Lock()
+
+    def _loadCache(self):
+        if self._cache is not None:
+            return
+        self._cache = dict()
+        try:
+            with open(self.cacheFilepath, "r") as f:
+                content = json.load(f)
+            if _CACHE_VERSION == content.get("version", None):
+                self._cache = content["media"]
+        except Exception:
+            pass
+
+    def _saveCache(self):
+        try:
+            Path(self.cacheFilepath).parent.mkdir(parents=True, exist_ok=True)
+            tmpFilepath = f"{self.cacheFilepath}.{os.getpid()}.tmp"
+            with open(tmpFilepath, "w") as f:
+                json.dump({"version": _CACHE_VERSION, "media": self._cache}, f)
+            os.replace(tmpFilepath, self.cacheFilepath)
+        except Exception as e:
+            _logger.warning_ext(f"Media probe: Cannot write the cache file {self.cacheFilepath}: {e}")
+
+    def _probe(self, filepath):
+        """Return the characteristics of the file, from the cache if it has not been modified since"""
+        try:
+            stat = os.stat(filepath)
+        except OSError as e:
+            return ({"valid": False, "error": str(e)}, False)
+
+        key = os.path.abspath(filepath)
+        with self._lock:
+            cached = self._cache.get(key, None)
+        if cached is not None and cached["mtime"] == stat.st_mtime and cached["size"] == stat.st_size:
+            return (cached["info"], False)
+
+        info = probeMediaFile(filepath)
+        with self._lock:
+            self._cache[key] = {"mtime": stat.st_mtime, "size": stat.st_size, "info": info}
+        return (info, True)
+
+    def probeFiles(self, filepaths):
+        """Probe the specified files in the worker threads and return a dictionary {file path: characteristics}
+        The function waits for all the files to be probed
+        """
+        filepaths = list(dict.fromkeys(str(p) for p in filepaths))
+        self._loadCache()
+
+        results = dict()
+        cacheModified = False
+        numWorkers = min(self.numWorkers, max(1, len(filepaths)))
+        with ThreadPoolExecutor(max_workers=numWorkers) as executor:
+            for filepath, (info, modified) in zip(filepaths, executor.map(self._probe, filepaths)):
+                results[filepath] = info
+                cacheModified = cacheModified or modified
+
+        if cacheModified:
+            self._saveCache()
+        return results
+
+
+_mediaProbe = None
+
+
+def getMediaProbe():
+    """Return the media probe shared by the add-on"""
+    global _mediaProbe
+    if _mediaProbe is None:
+        _mediaProbe = MediaProbe()
+    return _mediaProbe
+
+
+def probeMediaFiles(filepaths):
+    """Probe the specified media files in worker threads, see MediaProbe.probeFiles()"""
+    return getMediaProbe().probeFiles(filepaths)
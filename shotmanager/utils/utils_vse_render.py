@@ -40,6 +40,32 @@ from shotmanager.config import sm_logging
 _logger = sm_logging.getLogger(__name__)
 
 
+def _setWindowScene(scene):
+    """Set the scene of the current window. There is no window in background mode"""
+    if bpy.context.window is not None:
+        bpy.context.window.scene = scene
+
+
+def _renderSequencer(vseScene, animation=True, write_still=False):
+    """Render the strips of the sequencer of vseScene, which has to be the scene of the current window if any.
+    OpenGL rendering requires a window, in background mode the render engine is used instead: it only
+    processes the strips since the scene has no camera
+    """
+    if bpy.app.background:
+        vseScene.render.use_sequencer = True
+        bpy.ops.render.render(animation=animation, write_still=write_still, scene=vseScene.name)
+    else:
+        bpy.ops.render.opengl(animation=animation, sequencer=True, write_still=write_still)
+
+
+def _deleteVSEScene(vseScene):
+    """Delete the temporary scene, which has to be the scene of the current window if any"""
+    if bpy.context.window is not None:
+        bpy.ops.scene.delete()
+    else:
+        bpy.data.scenes.remove(vseScene, do_unlink=True)
+
+
 # # ------------------------------------------------------------------------#
 # #                                VSE tool Panel                             #
 # # ------------------------------------------------------------------------#
@@ -742,15 +768,25 @@ class ShotManager_Vse_Render(PropertyGroup):
 
     # NOTE: This function has 2 different behaviors depending if we use mediaDictArr or mediaFiles
     # FIXME: wkipwkipwkip this has to be fixed to harmonize the behavior
-    def buildSequenceVideoFromMedia(self, outputFile, handles, fps, mediaDictArr=None, mediaFiles=None):
+    def buildSequenceVideoFromMedia(
+        self, outputFile, handles, fps, mediaDictArr=None, mediaFiles=None, streamCopy=False, ffmpegFilepath=""
+    ):
         """Create a composited output (image sequence or video according to the extension of outputFile) from
         the bg, fg and audio media provided either by mediaDictArr or mediaFiles
 
         Args:
             mediaDictArr: dictionary specifying the source media and their resolution
             mediaFiles: list of 2 media and an audio
+            streamCopy: if True and if the videos of mediaFiles have the same format, they are concatenated
+                by ffmpeg without being re-encoded. The VSE is used otherwise
         """
-        previousScene = bpy.context.window.scene
+        if streamCopy and mediaDictArr is None and mediaFiles is not None:
+            from shotmanager.rendering.rendering_assembly import concatenateVideos
+
+            if concatenateVideos(mediaFiles, outputFile, fps, handles=handles, ffmpegFilepath=ffmpegFilepath):
+                return
+
+        previousScene = bpy.context.scene
 
         sequenceScene = None
         if "VSE_SequenceRenderScene" in bpy.data.scenes:
@@ -760,9 +796,9 @@ class ShotManager_Vse_Render(PropertyGroup):
 
         createVseTab = False  # config.devDebug
         sequenceScene = utils.getSceneVSE(sequenceScene.name, createVseTab=createVseTab)  # config.devDebug)
-        bpy.context.window.scene = sequenceScene
+        _setWindowScene(sequenceScene)
 
-        if createVseTab:
+        if createVseTab and bpy.context.window is not None:
             bpy.context.window.workspace = bpy.data.workspaces["Video Editing"]
 
         #     for area in bpy.context.screen.areas:
@@ -941,17 +977,17 @@ class ShotManager_Vse_Render(PropertyGroup):
 
             sequenceScene.frame_end = self.get_frame_end_from_content(sequenceScene) - 1
 
-        bpy.ops.render.opengl(animation=True, sequencer=True, write_still=False)
+        _renderSequencer(sequenceScene, animation=True, write_still=False)
 
         # cleaning current file from temp scenes
         if not config.devDebug_keepVSEContent:
             # current scene is sequenceScene
-            bpy.ops.scene.delete()
+            _deleteVSEScene(sequenceScene)
             pass
 
         # wkip changer ca fait que le time range n'est pas pris en compte...
         # if not config.devDebug:
-        bpy.context.window.scene = previousScene
+        _setWindowScene(previousScene)
         # if config.devDebug:
         #     bpy.context.window.scene = sequenceScene
 
@@ -1026,7 +1062,7 @@ class ShotManager_Vse_Render(PropertyGroup):
 
                 vse_scene.render.use_file_extension = False
                 # bpy.ops.render.render(write_still=True)
-                bpy.ops.render.opengl(animation=False, sequencer=True, write_still=True)
+                _renderSequencer(vse_scene, animation=False, write_still=True)
 
             elif "IMAGE_SEQ" == output_media_type:
                 if compositedImgSeqPath is not None:
@@ -1062,7 +1098,7 @@ class ShotManager_Vse_Render(PropertyGroup):
                 # since Blender starts the render indices at 1 and not 0 we have to rename the sequence
                 # another approach than renaming is to render still images
                 vse_scene.render.use_file_extension = False
-                bpy.ops.render.opengl(animation=True, sequencer=True)
+                _renderSequencer(vse_scene, animation=True)
 
                 # importAtFrame
                 # if props.editStartFrame
@@ -1080,7 +1116,7 @@ class ShotManager_Vse_Render(PropertyGroup):
                 vse_scene.render.filepath = self.outputMediaPath
 
                 vse_scene.render.use_file_extension = False
-                bpy.ops.render.opengl(animation=True, sequencer=True)
+                _renderSequencer(vse_scene, animation=True)
 
             return
 
@@ -1098,15 +1134,20 @@ class ShotManager_Vse_Render(PropertyGroup):
             specificFrame = frame_start
             # specificFrame = importAtFrame
 
-        previousScene = bpy.context.window.scene
-        previousWorkspace = bpy.context.workspace.name
-        # print(f"Previous Workspace: {previousWorkspace}")
-        previousScreen = bpy.context.window.screen.name
-        # print(f"Previous Screen: {previousScreen}")
+        previousScene = bpy.context.scene
+        previousWorkspace = None
+        previousScreen = None
         previousRenderView = None
-        region = next(
-            iter([area.spaces[0].region_3d for area in bpy.context.screen.areas if area.type == "VIEW_3D"]), None
-        )
+        region = None
+        # there is no window in background mode
+        if bpy.context.window is not None:
+            previousWorkspace = bpy.context.workspace.name
+            # print(f"Previous Workspace: {previousWorkspace}")
+            previousScreen = bpy.context.window.screen.name
+            # print(f"Previous Screen: {previousScreen}")
+            region = next(
+                iter([area.spaces[0].region_3d for area in bpy.context.screen.areas if area.type == "VIEW_3D"]), None
+            )
         if region:
             # print(f"current view: {region.view_perspective}")
             previousRenderView = region.view_perspective
@@ -1215,7 +1256,7 @@ class ShotManager_Vse_Render(PropertyGroup):
         # ne marche que sur vidéos
 
         # Make "My New Scene" the active one
-        bpy.context.window.scene = vse_scene
+        _setWindowScene(vse_scene)
 
         ### render
         ##################
@@ -1232,19 +1273,20 @@ class ShotManager_Vse_Render(PropertyGroup):
             self.printMedia()
 
         if not config.devDebug_keepVSEContent:
-            bpy.ops.scene.delete()
+            _deleteVSEScene(vse_scene)
             pass
 
-        bpy.context.window.scene = previousScene
+        _setWindowScene(previousScene)
 
-        # print(f" *** Current Workspace: {bpy.context.workspace.name}")
+        if bpy.context.window is not None:
+            # print(f" *** Current Workspace: {bpy.context.workspace.name}")
 
-        # bpy.context.window.screen.name = previousScreen
-        bpy.context.window.workspace = bpy.data.workspaces[previousWorkspace]
-        # print(f" *** Current Workspace: {bpy.context.workspace.name}")
+            # bpy.context.window.screen.name = previousScreen
+            bpy.context.window.workspace = bpy.data.workspaces[previousWorkspace]
+            # print(f" *** Current Workspace: {bpy.context.workspace.name}")
 
-        bpy.context.window.screen = bpy.context.window_manager.windows[0].screen
-        bpy.context.window.screen = bpy.data.screens[previousScreen]
+            bpy.context.window.screen = bpy.context.window_manager.windows[0].screen
+            bpy.context.window.screen = bpy.data.screens[previousScreen]
         # bpy.context.window_manager.windows[1].screen = bpy.data.screens[previousScreen]
 
         if region and previousRenderView is not None:
@@ -1265,6 +1307,89 @@ class ShotManager_Vse_Render(PropertyGroup):
         if specificFrame is not None:
             utils.openMedia(output_filepath, inExternalPlayer=False)
 
+    def compositeVideoDirect(
+        self,
+        fps,
+        frame_start,
+        frame_end,
+        output_filepath,
+        output_filename=None,
+        compositedImgSeqPath=None,
+        output_file_prefix="",
+        output_resolution=None,
+        output_media_mode="VIDEO",
+        importAtFrame=0,
+        frame_padding=-1,
+        ffmpegFilepath="",
+    ):
+        """Same as compositeVideoInVSE() but without any temporary VSE scene: the bg and fg image sequences held by
+        this vse_render class are composited with NumPy and PIL, and the image sequence and the video are written
+        in one pass. Only image sequences are supported, not single frames.
+        Return True if the media have been generated, False if compositeVideoInVSE() has to be used instead
+        """
+        from shotmanager.rendering import rendering_compositor
+
+        if frame_start == frame_end:
+            return False
+
+        withVideo = "VIDEO" in output_media_mode
+        if not rendering_compositor.isDirectCompositingAvailable(withVideo=withVideo, ffmpegFilepath=ffmpegFilepath):
+            _logger.warning_ext("Direct compositing not available, the VSE is used")
+            return False
+
+        # same output paths as _setOutputMediaAndRender() in compositeVideoInVSE()
+        fileExt = str(Path(output_filepath).suffix).lower()
+        fileNoExt = str(Path(output_filepath).stem) if output_filename is None else output_filename
+        filePathOnly = str(Path(output_filepath).parent) + "\\"
+        frameIndStr = "_" + "".rjust(frame_padding, "#")
+
+        imgSeqPath = None
+        if "IMAGE_SEQ" in output_media_mode:
+            if compositedImgSeqPath is not None:
+                ext = str(Path(compositedImgSeqPath).suffix).lower()
+            elif len(fileExt):
+                ext = fileExt
+            else:
+                ext = ".png"
+            imgSeqPath = filePathOnly + fileNoExt + "\\" + output_file_prefix + fileNoExt + frameIndStr + ext
+
+        videoPath = None
+        if withVideo:
+            videoPath = filePathOnly + output_file_prefix + fileNoExt + ".mp4"
+
+        # resolution
+        if output_resolution is not None:
+            output_res = list(output_resolution)
+        elif "" != self.inputBGMediaPath:
+            output_res = list(self.inputBGResolution)
+        else:
+            output_res = list(self.inputOverResolution)
+
+        audioPath = None
+        if self.inputAudioMediaPath is not None and "" != self.inputAudioMediaPath:
+            audioPath = self.inputAudioMediaPath
+
+        try:
+            rendering_compositor.compositeImageSequences(
+                frame_start,
+                frame_end,
+                output_res,
+                bgImagesPath=self.inputBGMediaPath,
+                overImagesPath=self.inputOverMediaPath,
+                outputImagesPath=imgSeqPath,
+                outputVideoPath=videoPath,
+                audioFilepath=audioPath,
+                fps=fps,
+                importAtFrame=importAtFrame,
+                ffmpegFilepath=ffmpegFilepath,
+            )
+        except Exception as e:
+            _logger.error_ext(f"Direct compositing failed, the VSE is used: {e}")
+            return False
+
+        self.outputMediaPath = videoPath if videoPath is not None else imgSeqPath
+        return True
+
 
 _classes = (
     # UAS_PT_VSERender,
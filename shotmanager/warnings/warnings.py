@@ -17,6 +17,13 @@
 
 """
 Functions specific to Shot Manager props
+
+The warnings are evaluated by the panels at every redraw so they are cached per scene. The cache is discarded
+by invalidateWarnings(), called on depsgraph updates of the scenes (render settings and Shot Manager properties),
+on file save, load, undo and redo. It is also discarded when the file path or the shots of the current take
+change.
+The checks done on the file system - read-only state of the file and validity of the render path - are
+re-evaluated by a timer every few seconds instead of at every evaluation of the warnings.
 """
 
 from stat import S_IMODE, S_IWRITE
@@ -27,10 +34,76 @@ from shotmanager.config import config
 from shotmanager.utils import utils
 from shotmanager.utils.utils_markers import sceneContainsCameraBinding
 
+# cached warnings, keyed by the pointer of the scene
+_warningsCache = dict()
+
+# results of the file system checks, keyed by the pointer of the scene
+_fileSystemChecks = dict()
+
+# delay between 2 checks of the file system by the timer, in seconds
+_FILE_SYSTEM_CHECK_DELAY = 3.0
+
+
+def invalidateWarnings():
+    """Discard all the cached warnings. To call every time the scene settings or the Shot Manager properties
+    are modified
+    """
+    _warningsCache.clear()
+
+
+def _getFileSystemChecks(props):
+    """Return the tupple (file is read only, render root path is valid)"""
+    fileIsReadOnly = False
+    currentFilePath = bpy.path.abspath(bpy.data.filepath)
+    if "" != currentFilePath:
+        try:
+            stat = Path(currentFilePath).stat()
+            # print(f"Blender file Stats: {stat.st_mode}")
+            fileIsReadOnly = S_IMODE(stat.st_mode) & S_IWRITE == 0
+        except OSError:
+            pass
+
+    renderRootPathIsValid = "" != props.renderRootPath and props.isRenderRootPathValid()
+    return (bpy.data.filepath, props.renderRootPath, fileIsReadOnly, renderRootPathIsValid)
+
+
+def _checkFileSystem():
+    """Timer function re-evaluating the file system checks of the scenes whose warnings have been evaluated"""
+    changed = False
+    for scene in bpy.data.scenes:
+        key = scene.as_pointer()
+        checks = _fileSystemChecks.get(key, None)
+        if checks is None:
+            continue
+        props = config.getAddonProps(scene)
+        if props is None:
+            continue
+        newChecks = _getFileSystemChecks(props)
+        if newChecks != checks:
+            _fileSystemChecks[key] = newChecks
+            _warningsCache.pop(key, None)
+            changed = True
+
+    if changed and bpy.context.window_manager is not None:
+        for window in bpy.context.window_manager.windows:
+            for area in window.screen.areas:
+                if area.type in ("VIEW_3D", "PROPERTIES"):
+                    area.tag_redraw()
+
+    return _FILE_SYSTEM_CHECK_DELAY
+
+
+def unregisterFileSystemCheck():
+    if bpy.app.timers.is_registered(_checkFileSystem):
+        bpy.app.timers.unregister(_checkFileSystem)
+    _fileSystemChecks.clear()
+    _warningsCache.clear()
+
 
 def getWarnings(props, scene):
     """Check if some warnings are to be mentioned to the user/
     A warning message can be on several lines when the separator \n is used.
+    The warnings are cached, see the module description.
 
     Return:
         An array of tupples made of:
@@ -39,21 +112,44 @@ def getWarnings(props, scene):
             - the panel type, which can be 'ALL', 'MAIN' or 'RENDER'
         eg: [("Current file in Read-Only", 1, 'ALL'), ("Current scene fps and project fps are different !!", 2, 'MAIN')]
     """
-    prefs = config.getAddonPrefs()
+    key = scene.as_pointer()
+    cacheKey = (bpy.data.filepath, config.devDebug, props.getShotsIndex())
+    cached = _warningsCache.get(key, None)
+    if cached is not None and cached[0] == cacheKey:
+        return list(cached[1])
+
+    checks = _fileSystemChecks.get(key, None)
+    if checks is None or checks[0] != bpy.data.filepath or checks[1] != props.renderRootPath:
+        checks = _getFileSystemChecks(props)
+        _fileSystemChecks[key] = checks
+    if not bpy.app.timers.is_registered(_checkFileSystem):
+        bpy.app.timers.register(_checkFileSystem, first_interval=_FILE_SYSTEM_CHECK_DELAY, persistent=True)
+
+    warningList = _evaluateWarnings(props, scene, checks)
+    _warningsCache[key] = (cacheKey, warningList)
+    return list(warningList)
+
+
+def _evaluateWarnings(props, scene, fileSystemChecks):
+    """Evaluate the warnings of the scene. fileSystemChecks is the result of _getFileSystemChecks()"""
+    # prefs = config.getAddonPrefs()
     warningList = []
+    _filePath, _renderRootPath, fileIsReadOnly, renderRootPathIsValid = fileSystemChecks
 
     # check if the current file is saved and not read only
     ###########
-    currentFilePath = bpy.path.abspath(bpy.data.filepath)
-    if "" == currentFilePath:
-        # warningList.append("Current file has to be saved")
-        # wkip to remove ones warning mecanics are integrated in the settings
-        pass
-    else:
-        stat = Path(currentFilePath).stat()
-        # print(f"Blender file Stats: {stat.st_mode}")
-        if S_IMODE(stat.st_mode) & S_IWRITE == 0:
-            warningList.append(("Current file in Read-Only", 10, "ALL"))
+    # currentFilePath = bpy.path.abspath(bpy.data.filepath)
+    # if "" == currentFilePath:
+    #     # warningList.append("Current file has to be saved")
+    #     # wkip to remove ones warning mecanics are integrated in the settings
+    #     pass
+    # else:
+    #     stat = Path(currentFilePath).stat()
+    #     # print(f"Blender file Stats: {stat.st_mode}")
+    #     if S_IMODE(stat.st_mode) & S_IWRITE == 0:
+    #         warningList.append(("Current file in Read-Only", 10, "ALL"))
+    if fileIsReadOnly:
+        warningList.append(("Current file in Read-Only", 10, "ALL"))
 
     # check is the data version is compatible with the current version
     # wkip obsolete code due to post register data version check
@@ -109,7 +205,8 @@ def getWarnings(props, scene):
     if "" == props.renderRootPath:
         warningList.append(("Rendering path is not defined", 120, "RENDER"))
 
-    elif not props.isRenderRootPathValid():
+    # elif not props.isRenderRootPathValid():
+    elif not renderRootPathIsValid:
         warningList.append(("Rendering path is invalid", 121, "RENDER"))
 
     # check if the resolution render percentage is at 100%